@@ -0,0 +1,4 @@
+import sys
+from benchmarks.harness import main
+
+sys.exit(main())
@@ -0,0 +1,188 @@
+import datetime
+import json
+import logging
+import os
+import requests
+from requests.adapters import BaseAdapter
+from benchmarks.harness import benchmark
+from db.columnar import ColumnarTable
+from db.sqlite_client import SQLiteClient
+from src.api.base_client import BaseClient
+from src.mock_server import FIXTURE_DIR
+from src.models.photo import Photo
+from src.models.post import Post
+from src.utils.email_validator import is_valid_email
+from src.utils.retry_decorator import retry
+from src.utils.timing import Timings
+from src.utils.schema_validator import validate_many, validate_schema
+
+BENCH_URL = "http://bench.invalid"
+ROW_COUNTS = (100, 1000, 10000)
+
+def _fixture(name):
+    with open(os.path.join(FIXTURE_DIR, f"{name}.json")) as f:
+        return json.load(f)
+
+class CannedAdapter(BaseAdapter):
+    """Answers every request in-process with a fixed JSON body, so only the client's own work is timed."""
+
+    def __init__(self, body: bytes, status: int = 200):
+        super().__init__()
+        self.body = body
+        self.status = status
+
+    def send(self, request, **kwargs):
+        response = requests.Response()
+        response.status_code = self.status
+        response.headers["Content-Type"] = "application/json; charset=utf-8"
+        response._content = self.body
+        response.encoding = "utf-8"
+        response.url = request.url
+        response.request = request
+        response.elapsed = datetime.timedelta(microseconds=50)
+        return response
+
+    def close(self):
+        pass
+
+def _client(level=logging.INFO):
+    client = BaseClient(BENCH_URL)
+    # Otherwise requests rescans os.environ for proxy settings on every call, which swings these by up to 2x
+    client.session.trust_env = False
+    client.session.mount(BENCH_URL, CannedAdapter(json.dumps(_fixture("posts")[0]).encode()))
+    # Timing is still recorded, just not into the run's report
+    client.timings = Timings()
+    # Same formatting work as the console handler, written nowhere
+    logger = logging.getLogger("api_framework.bench")
+    if not logger.handlers:
+        handler = logging.StreamHandler(open(os.devnull, "w"))
+        handler.setFormatter(logging.Formatter('[%(asctime)s] %(levelname)s %(name)s: %(message)s'))
+        logger.addHandler(handler)
+        logger.propagate = False
+    logger.setLevel(level)
+    client.logger = logger
+    return client
+
+@benchmark("client.get")
+def client_get():
+    client = _client()
+    return lambda: client.get("/posts/1")
+
+@benchmark("client.get.info_disabled")
+def client_get_quiet():
+    client = _client(logging.WARNING)
+    return lambda: client.get("/posts/1")
+
+@benchmark("client.post")
+def client_post():
+    client = _client()
+    return lambda: client.post("/posts", json={"userId": 1, "title": "title", "body": "body"})
+
+@benchmark("client.put")
+def client_put():
+    client = _client()
+    return lambda: client.put("/posts/1", json={"id": 1, "userId": 1, "title": "title", "body": "body"})
+
+@benchmark("client.patch")
+def client_patch():
+    client = _client()
+    return lambda: client.patch("/posts/1", json={"title": "title"})
+
+@benchmark("client.delete")
+def client_delete():
+    client = _client()
+    return lambda: client.delete("/posts/1")
+
+@benchmark("schema.validate_schema.item")
+def schema_item():
+    post = _fixture("posts")[0]
+    return lambda: validate_schema(post, "post")
+
+@benchmark("schema.validate_many.100_items", per=100)
+def schema_batch():
+    posts = _fixture("posts")
+    return lambda: validate_many(posts, "post")
+
+def _private_db():
+    # Not the process-wide instance, so benchmarks never share rows with anything else; the caller closes it
+    db = object.__new__(SQLiteClient)
+    db._connect({"mode": "memory"})
+    return db
+
+def _posts(count):
+    return [{"id": i, "userId": i % 10 + 1, "title": f"title {i}", "body": "body"} for i in range(1, count + 1)]
+
+def _register_db(count):
+    @benchmark(f"sqlite.insert.{count}_rows", per=count)
+    def insert():
+        db, rows = _private_db(), _posts(count)
+
+        def run():
+            for row in rows:
+                db.insert("posts", row)
+        try:
+            yield run, lambda: db._db.write("DELETE FROM posts")
+        finally:
+            db.close()
+
+    @benchmark(f"sqlite.insert_many.{count}_rows", per=count)
+    def insert_many():
+        db, rows = _private_db(), _posts(count)
+        try:
+            yield lambda: db.insert_many("posts", rows), lambda: db._db.write("DELETE FROM posts")
+        finally:
+            db.close()
+
+    @benchmark(f"sqlite.insert_many.models.{count}_rows", per=count)
+    def insert_many_models():
+        db, rows = _private_db(), [Post.from_json(post) for post in _posts(count)]
+        try:
+            yield lambda: db.insert_many("posts", rows), lambda: db._db.write("DELETE FROM posts")
+        finally:
+            db.close()
+
+    @benchmark(f"sqlite.fetchall.{count}_rows", per=count)
+    def fetchall():
+        db = _private_db()
+        try:
+            db.insert_many("posts", _posts(count))
+            yield lambda: db.fetchall("posts")
+        finally:
+            db.close()
+
+for _count in ROW_COUNTS:
+    _register_db(_count)
+
+@benchmark("models.photo.from_json", per=5000)
+def photo_from_json():
+    photos = _fixture("photos")
+    return lambda: [Photo.from_json(photo) for photo in photos]
+
+@benchmark("columnar.from_items.photos", per=5000)
+def columnar_build():
+    photos = _fixture("photos")
+    return lambda: ColumnarTable.from_items("photos", photos)
+
+@benchmark("columnar.count_by.photos", per=5000)
+def columnar_count():
+    photos = ColumnarTable.from_items("photos", _fixture("photos"))
+    return lambda: photos.count_by("albumId")
+
+@benchmark("columnar.anti_join.photos", per=5000)
+def columnar_anti_join():
+    photos = ColumnarTable.from_items("photos", _fixture("photos"))
+    albums = ColumnarTable.from_items("albums", _fixture("albums"))
+    return lambda: photos.anti_join(albums, "albumId")
+
+@benchmark("email.is_valid_email", per=500)
+def email():
+    emails = [comment["email"] for comment in _fixture("comments")]
+
+    def run():
+        for address in emails:
+            is_valid_email(address)
+    return run
+
+@benchmark("retry.wrapped_call")
+def retry_wrapped():
+    return retry()(lambda: None)
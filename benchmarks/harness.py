@@ -0,0 +1,292 @@
+import argparse
+import gc
+import importlib
+import inspect
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from src.utils.config import PROJECT_ROOT
+
+BASELINES_PATH = os.path.join(PROJECT_ROOT, "benchmarks", "baselines.json")
+# Smallest slowdown that can fail a benchmark (0.25 = +25%), however quiet it was when recorded
+MIN_THRESHOLD = 0.25
+# Largest recorded threshold, however noisy the recording machine: past +50% the gate would catch nothing
+MAX_THRESHOLD = 0.5
+# The recorded threshold is this multiple of the spread seen between separate recording processes
+NOISE_FACTOR = 2
+RECORD_RUNS = 5
+CONFIRM_RUNS = 2
+
+# name -> (factory, per), see ``benchmark``
+BENCHMARKS = {}
+
+def benchmark(name: str, per: int = 1):
+    """Register a benchmark factory under ``name``.
+
+    The factory does the one-off preparation and returns ``func`` or
+    ``(func, setup)``; only ``func()`` is timed. With ``setup`` each call is
+    timed on its own after ``setup()`` ran. A factory that holds resources
+    yields instead of returning and releases them after the ``yield``.
+    ``per`` is how many operations one call performs, so results are
+    reported per operation.
+    """
+    def decorator(factory):
+        BENCHMARKS[name] = (factory, per)
+        return factory
+    return decorator
+
+def measure(func, setup=None, per: int = 1, rounds: int = 7, min_time: float = 0.05) -> dict:
+    """Per-operation timings in seconds over ``rounds`` rounds of at least ``min_time`` each.
+
+    Without ``setup`` the loop count per round is calibrated so timer
+    resolution and loop overhead stay negligible. ``median`` is the figure
+    that is gated.
+    """
+    perf_counter = time.perf_counter
+    func()  # warm caches, lazy imports and compiled statements
+    # As timeit does: a collection landing in one round and not another is noise, not the code under test
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        return _measure(func, setup, per, rounds, min_time, perf_counter)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+def _measure(func, setup, per, rounds, min_time, perf_counter):
+    if setup is None:
+        loops = 1
+        while True:
+            start = perf_counter()
+            for _ in range(loops):
+                func()
+            if perf_counter() - start >= min_time:
+                break
+            loops *= 2
+    else:
+        loops = 1
+    samples = []
+    for _ in range(rounds):
+        if setup is not None:
+            setup()
+        start = perf_counter()
+        for _ in range(loops):
+            func()
+        samples.append((perf_counter() - start) / (loops * per))
+    return {"min": min(samples), "median": statistics.median(samples), "loops": loops, "rounds": rounds}
+
+@contextmanager
+def prepared(name: str):
+    """``(func, setup)`` of a registered benchmark; a yielding factory is finished on exit."""
+    made = BENCHMARKS[name][0]()
+    factory = made if inspect.isgenerator(made) else None
+    if factory is not None:
+        made = next(factory)
+    try:
+        yield made if isinstance(made, tuple) else (made, None)
+    finally:
+        if factory is not None:
+            factory.close()
+
+def _reference_work():
+    rows = [{"id": i, "title": str(i * 7919)} for i in range(200)]
+    return sorted(rows, key=lambda row: row["title"])
+
+def reference() -> float:
+    """Median time of a fixed pure-Python workload: how fast this machine is running right now."""
+    return measure(_reference_work, rounds=5, min_time=0.01)["median"]
+
+def run(names=None, rounds: int = 7, min_time: float = 0.05) -> dict:
+    """Each result also carries ``reference``, timed just before and after the benchmark.
+
+    Shared and throttled machines slow down in episodes that hit every
+    benchmark alike; dividing by the reference taken alongside cancels them,
+    while a slowdown in the code under test does not cancel.
+    """
+    results = {}
+    for name in names or BENCHMARKS:
+        before = reference()
+        with prepared(name) as (func, setup):
+            result = measure(func, setup, BENCHMARKS[name][1], rounds, min_time)
+        result["reference"] = (before + reference()) / 2
+        results[name] = result
+    return results
+
+def run_isolated(names, rounds: int = 7, min_time: float = 0.05) -> dict:
+    """``run`` in a fresh interpreter.
+
+    Memory layout and allocator state differ from one process to the next and
+    move some benchmarks more than anything within a process does, so
+    recording and confirming use separate processes.
+    """
+    command = [sys.executable, "-m", "benchmarks", "--emit", "--names", ",".join(names),
+               "--rounds", str(rounds), "--min-time", str(min_time)]
+    output = subprocess.run(command, cwd=PROJECT_ROOT, check=True, capture_output=True, text=True).stdout
+    return json.loads(output)
+
+def record(names, runs: int = RECORD_RUNS, rounds: int = 7, min_time: float = 0.05,
+           min_threshold: float = MIN_THRESHOLD, max_threshold: float = MAX_THRESHOLD) -> dict:
+    """Baseline entries from ``runs`` separate processes.
+
+    The baseline is the median of the per-process medians, both absolute and
+    ``relative`` to the reference; the threshold is ``NOISE_FACTOR`` times the
+    spread of the relative figures, clamped to
+    ``[min_threshold, max_threshold]``. From five runs on, the fastest and
+    slowest process are left out of the spread, so one process that caught a
+    burst of machine load does not widen every threshold. A spread that
+    still hits the cap means the machine was too noisy to record on; ``main``
+    warns about those.
+    """
+    runs = [run_isolated(names, rounds, min_time) for _ in range(max(runs, 2))]
+    entries = {}
+    for name in names:
+        medians = [result[name]["median"] for result in runs]
+        relative = sorted(result[name]["median"] / result[name]["reference"] for result in runs)
+        kept = relative[1:-1] if len(relative) >= 5 else relative
+        spread = kept[-1] / kept[0] - 1
+        entries[name] = {
+            "median_us": round(statistics.median(medians) * 1e6, 4),
+            "relative": round(statistics.median(relative), 6),
+            "min_us": round(min(result[name]["min"] for result in runs) * 1e6, 4),
+            "spread": round(spread, 4),
+            "threshold": round(min(max(min_threshold, NOISE_FACTOR * spread), max_threshold), 4),
+        }
+    return entries
+
+def machine() -> dict:
+    return {"python": platform.python_version(), "implementation": platform.python_implementation(),
+            "platform": platform.platform(), "processor": platform.machine()}
+
+def load_baselines(path: str = BASELINES_PATH) -> dict:
+    if not os.path.exists(path):
+        return {"machine": None, "benchmarks": {}}
+    with open(path) as f:
+        return json.load(f)
+
+def save_baselines(entries: dict, path: str = BASELINES_PATH) -> dict:
+    """Store ``record`` entries as the new baselines, keeping entries this run did not cover."""
+    baselines = load_baselines(path)
+    baselines["machine"] = machine()
+    baselines["benchmarks"].update(entries)
+    baselines["benchmarks"] = dict(sorted(baselines["benchmarks"].items()))
+    with open(path, "w") as f:
+        json.dump(baselines, f, indent=1)
+        f.write("\n")
+    return baselines
+
+def compare(results: dict, baselines: dict, min_threshold: float = MIN_THRESHOLD) -> dict:
+    """``{name: (baseline_us or None, change, status)}``; status is ok, faster, REGRESSED or new.
+
+    The median, relative to the reference measured with it, is compared with
+    the baseline's relative median (absolute medians when either side lacks
+    a reference), against the threshold recorded for that benchmark (at
+    least ``min_threshold``, at most ``MAX_THRESHOLD`` unless
+    ``min_threshold`` asks for more).
+    """
+    known = baselines.get("benchmarks") or {}
+    verdicts = {}
+    for name, result in results.items():
+        baseline = known.get(name)
+        if baseline is None:
+            verdicts[name] = (None, None, "new")
+            continue
+        allowed = max(min_threshold, min(baseline.get("threshold", 0), MAX_THRESHOLD))
+        if "reference" in result and "relative" in baseline:
+            change = result["median"] / result["reference"] / baseline["relative"] - 1
+        else:
+            change = result["median"] * 1e6 / baseline["median_us"] - 1
+        status = "REGRESSED" if change > allowed else "faster" if change < -allowed / 2 else "ok"
+        verdicts[name] = (baseline["median_us"], change, status)
+    return verdicts
+
+def regressions(verdicts: dict) -> list:
+    return [name for name, (_, _, status) in verdicts.items() if status == "REGRESSED"]
+
+def format_results(results: dict, verdicts: dict, baselines: dict = None) -> str:
+    known = (baselines or {}).get("benchmarks") or {}
+    lines = [f"{'benchmark':<40}{'median us':>12}{'min us':>12}{'baseline':>12}{'change':>9}{'allowed':>9}  status"]
+    for name, result in results.items():
+        baseline, change, status = verdicts[name]
+        allowed = known.get(name, {}).get("threshold")
+        lines.append(f"{name:<40}{result['median'] * 1e6:>12.3f}{result['min'] * 1e6:>12.3f}"
+                     + (f"{baseline:>12.3f}{change:>+9.0%}" if baseline is not None else f"{'-':>12}{'-':>9}")
+                     + (f"{allowed:>+9.0%}" if allowed is not None else f"{'-':>9}") + f"  {status}")
+    return "\n".join(lines)
+
+def load_cases() -> dict:
+    """Import the benchmark definitions (registering them) and return the registry."""
+    importlib.import_module("benchmarks.cases")
+    return BENCHMARKS
+
+def main(argv=None):
+    load_cases()
+    parser = argparse.ArgumentParser(description="Micro-benchmarks of the framework's hot paths, gated on baselines.")
+    parser.add_argument("-k", dest="match", help="only run benchmarks whose name contains this text")
+    parser.add_argument("--min-threshold", type=float, default=MIN_THRESHOLD,
+                        help="smallest slowdown that fails a benchmark (default 0.25 = +25%%); "
+                             "noisier benchmarks use the threshold recorded with their baseline")
+    parser.add_argument("--max-threshold", type=float, default=MAX_THRESHOLD,
+                        help="cap on the threshold --save records (default 0.5 = +50%%)")
+    parser.add_argument("--rounds", type=int, default=7)
+    parser.add_argument("--min-time", type=float, default=0.05, help="seconds per round for calibrated benchmarks")
+    parser.add_argument("--baselines", default=BASELINES_PATH)
+    parser.add_argument("--save", action="store_true", help="record new baselines from --record-runs processes")
+    parser.add_argument("--record-runs", type=int, default=RECORD_RUNS)
+    parser.add_argument("--confirm-runs", type=int, default=CONFIRM_RUNS,
+                        help="fresh-process re-runs a regression must reproduce in before the run fails")
+    parser.add_argument("--list", action="store_true", help="list the benchmarks and exit")
+    # Internal: how run_isolated drives a child process
+    parser.add_argument("--names", help=argparse.SUPPRESS)
+    parser.add_argument("--emit", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.names:
+        names = args.names.split(",")
+    else:
+        names = [name for name in BENCHMARKS if not args.match or args.match in name]
+    if args.emit:
+        print(json.dumps(run(names, args.rounds, args.min_time)))
+        return 0
+    if args.list:
+        print("\n".join(names))
+        return 0
+    if not names:
+        parser.error(f"no benchmark matches {args.match!r}")
+    if args.save:
+        entries = record(names, args.record_runs, args.rounds, args.min_time, args.min_threshold,
+                         args.max_threshold)
+        baselines = save_baselines(entries, args.baselines)
+        results = {name: {"median": e["median_us"] / 1e6, "min": e["min_us"] / 1e6} for name, e in entries.items()}
+        print(format_results(results, compare(results, baselines, args.min_threshold), baselines))
+        print(f"Baselines from {max(args.record_runs, 2)} runs written to {args.baselines}")
+        capped = [name for name, e in entries.items() if NOISE_FACTOR * e["spread"] > args.max_threshold]
+        if capped:
+            print(f"Warning: {len(capped)} benchmark(s) varied more between runs than --max-threshold allows "
+                  f"({', '.join(capped)}); re-record on a quieter machine.")
+        return 0
+
+    baselines = load_baselines(args.baselines)
+    results = run(names, args.rounds, args.min_time)
+    verdicts = compare(results, baselines, args.min_threshold)
+    print(format_results(results, verdicts, baselines))
+    if baselines.get("machine") and baselines["machine"] != machine():
+        print(f"Note: baselines were recorded on {baselines['machine']['platform']} "
+              f"(Python {baselines['machine']['python']}); re-record them with --save on this machine.")
+    regressed = regressions(verdicts)
+    for attempt in range(1, args.confirm_runs + 1):
+        if not regressed:
+            break
+        print(f"Re-running {len(regressed)} regressed benchmark(s) in a fresh process ({attempt}/{args.confirm_runs})")
+        rerun = run_isolated(regressed, args.rounds, args.min_time)
+        verdicts.update(compare(rerun, baselines, args.min_threshold))
+        print(format_results(rerun, verdicts, baselines))
+        regressed = regressions(compare(rerun, baselines, args.min_threshold))
+    if regressed:
+        print(f"{len(regressed)} benchmark(s) regressed beyond their threshold on every run: {', '.join(regressed)}")
+        return 1
+    return 0
@@ -0,0 +1,250 @@
+from array import array
+from collections import Counter
+from functools import partial
+from itertools import compress
+from operator import and_, eq
+from src.utils.config import load_config
+
+class ArrayBackend:
+    """Stdlib columns: ``array('q')`` for ints, ``array('b')`` for bools, plain lists otherwise.
+
+    Element-wise work runs through ``map``/``compress``/``Counter``, so the
+    per-row loops stay in C.
+    """
+
+    name = "array"
+
+    @staticmethod
+    def column(values, kind):
+        if kind == "int":
+            return array("q", values)
+        if kind == "bool":
+            return array("b", values)
+        return values
+
+    @staticmethod
+    def equals(column, value):
+        return list(map(partial(eq, value), column))
+
+    @staticmethod
+    def isin(column, values):
+        return list(map(set(values).__contains__, column))
+
+    @staticmethod
+    def both(left, right):
+        return list(map(and_, left, right))
+
+    @staticmethod
+    def invert(mask):
+        return [not flag for flag in mask]
+
+    @staticmethod
+    def indices(mask):
+        return list(compress(range(len(mask)), mask))
+
+    @staticmethod
+    def take(column, indices):
+        picked = map(column.__getitem__, indices)
+        return array(column.typecode, picked) if isinstance(column, array) else list(picked)
+
+    @staticmethod
+    def counts(column):
+        return dict(Counter(column))
+
+    @staticmethod
+    def tolist(column):
+        return list(column)
+
+class NumpyBackend:
+    """NumPy columns: int64/bool arrays, boolean masks and ``np.unique`` group counts."""
+
+    name = "numpy"
+
+    def __init__(self):
+        import numpy
+        self.np = numpy
+
+    def column(self, values, kind):
+        if kind == "int":
+            return self.np.fromiter(values, dtype=self.np.int64, count=len(values))
+        if kind == "bool":
+            return self.np.fromiter(values, dtype=bool, count=len(values))
+        return values
+
+    def _array(self, column):
+        return column if isinstance(column, self.np.ndarray) else self.np.array(column, dtype=object)
+
+    def equals(self, column, value):
+        return self._array(column) == value
+
+    def isin(self, column, values):
+        return self.np.isin(self._array(column), list(values))
+
+    def both(self, left, right):
+        return self.np.logical_and(left, right)
+
+    def invert(self, mask):
+        return self.np.logical_not(mask)
+
+    def indices(self, mask):
+        return self.np.flatnonzero(mask)
+
+    def take(self, column, indices):
+        if isinstance(column, self.np.ndarray):
+            return column[indices]
+        return [column[i] for i in indices.tolist()]
+
+    def counts(self, column):
+        if not isinstance(column, self.np.ndarray):
+            return dict(Counter(column))
+        values, counts = self.np.unique(column, return_counts=True)
+        return dict(zip(values.tolist(), counts.tolist()))
+
+    @staticmethod
+    def tolist(column):
+        return column.tolist() if hasattr(column, "tolist") else list(column)
+
+_BACKENDS = ("numpy", "array")
+
+def select_backend(preferred: str = "auto"):
+    """The preferred column backend, or numpy when installed and the stdlib arrays otherwise for ``auto``."""
+    candidates = _BACKENDS if preferred == "auto" else (preferred,)
+    for name in candidates:
+        if name == "array":
+            return ArrayBackend()
+        if name != "numpy":
+            raise ValueError(f"Unknown columnar backend: {name}")
+        try:
+            return NumpyBackend()
+        except ImportError:
+            continue
+    raise ImportError(f"columnar backend {preferred!r} is not installed")
+
+_backend = None
+
+def get_backend():
+    global _backend
+    if _backend is None:
+        _backend = select_backend(load_config().get("columnar_backend", "auto"))
+    return _backend
+
+def _kind(values):
+    sample = next((value for value in values if value is not None), None)
+    if isinstance(sample, bool):
+        kind = "bool"
+    elif isinstance(sample, int):
+        kind = "int"
+    elif isinstance(sample, str):
+        kind = "str"
+    else:
+        return "object"
+    # A typed column cannot hold gaps or mixed types; keep those as plain lists
+    if all(type(value) is type(sample) for value in values):
+        return kind
+    return "object"
+
+class ColumnarTable:
+    """A collection stored column by column, for group counts, filters and joins over whole columns.
+
+    Ints and bools are packed arrays and strings are interned, so a large
+    collection takes a fraction of the memory of its list of dicts (on the
+    ``array`` backend bools read back as 0/1). Built from
+    dicts or ``src.models`` records; nested values (a user's address) are
+    skipped unless named in ``columns``.
+    """
+
+    __slots__ = ("name", "columns", "backend", "_length")
+
+    def __init__(self, name: str, columns: dict, length: int, backend=None):
+        self.name = name
+        self.columns = columns
+        self.backend = backend or get_backend()
+        self._length = length
+
+    @classmethod
+    def from_items(cls, name: str, items, columns=None, backend=None):
+        backend = backend or get_backend()
+        items = list(items)
+        if columns is None:
+            first = items[0] if items else {}
+            names = first._fields if isinstance(first, tuple) else tuple(first)
+        else:
+            names = tuple(columns)
+        packed = {}
+        for column in names:
+            values = [getattr(item, column) if isinstance(item, tuple) else item.get(column) for item in items]
+            kind = _kind(values)
+            if kind == "str":
+                # Interned per table: repeated values share one object, and nothing outlives the table
+                pool = {}
+                values = [pool.setdefault(value, value) for value in values]
+            elif kind == "object" and columns is None and any(isinstance(v, (dict, list)) for v in values):
+                continue
+            packed[column] = backend.column(values, kind)
+        return cls(name, packed, len(items), backend)
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, column):
+        return self.columns[column]
+
+    def tolist(self, column) -> list:
+        return self.backend.tolist(self.columns[column])
+
+    def rows(self, *columns):
+        """Tuples of the given columns (all of them by default), row by row."""
+        columns = columns or tuple(self.columns)
+        return list(zip(*(self.tolist(column) for column in columns)))
+
+    def mask(self, **equals):
+        """Row mask for ``column == value`` on every given column."""
+        backend = self.backend
+        result = None
+        for column, value in equals.items():
+            current = backend.equals(self.columns[column], value)
+            result = current if result is None else backend.both(result, current)
+        return result
+
+    def filter(self, mask) -> "ColumnarTable":
+        return self.take(self.backend.indices(mask))
+
+    def take(self, indices) -> "ColumnarTable":
+        take = self.backend.take
+        return ColumnarTable(self.name, {column: take(values, indices) for column, values in self.columns.items()},
+                             len(indices), self.backend)
+
+    def where(self, **equals) -> "ColumnarTable":
+        """Rows where every ``column=value`` holds, e.g. ``todos.where(completed=True)``."""
+        return self.filter(self.mask(**equals)) if equals else self
+
+    def count_by(self, column: str) -> dict:
+        """``{value: row count}`` grouped by one column, e.g. posts per userId."""
+        return self.backend.counts(self.columns[column])
+
+    def semi_join(self, other: "ColumnarTable", on: str, other_on: str = "id") -> "ColumnarTable":
+        """Rows whose ``on`` value appears in ``other[other_on]``."""
+        return self.filter(self.backend.isin(self.columns[on], set(other.tolist(other_on))))
+
+    def anti_join(self, other: "ColumnarTable", on: str, other_on: str = "id") -> "ColumnarTable":
+        """Rows whose ``on`` value is missing from ``other[other_on]``, e.g. orphaned posts."""
+        backend = self.backend
+        return self.filter(backend.invert(backend.isin(self.columns[on], set(other.tolist(other_on)))))
+
+    def join(self, other: "ColumnarTable", on: str, other_on: str = "id") -> "ColumnarTable":
+        """Inner join on ``self[on] == other[other_on]`` (unique in ``other``).
+
+        The other table's columns are added as ``"<other name>.<column>"``.
+        """
+        positions = {key: index for index, key in enumerate(other.tolist(other_on))}
+        keys = self.tolist(on)
+        matched = self.backend.isin(self.columns[on], positions)
+        mine = self.backend.indices(matched)
+        theirs = [positions[keys[index]] for index in self.backend.tolist(mine)]
+        if self.backend.name == "numpy":
+            theirs = self.backend.np.asarray(theirs, dtype=self.backend.np.int64)
+        joined = self.take(mine)
+        take = self.backend.take
+        for column, values in other.columns.items():
+            joined.columns[f"{other.name}.{column}"] = take(values, theirs)
+        return joined
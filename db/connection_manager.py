@@ -0,0 +1,121 @@
+import queue
+import sqlite3
+import threading
+from concurrent.futures import Future
+
+DEFAULT_PRAGMAS = {"synchronous": "NORMAL", "cache_size": -16000, "mmap_size": 268435456}
+
+class ConnectionManager:
+    """Per-thread read connections plus one writer thread that owns all writes.
+
+    Writes from any thread are queued; the writer drains whatever is pending
+    (up to ``group_commit_max`` operations) into a single transaction, so many
+    concurrent small inserts cost one commit. Each operation runs under its own
+    savepoint, so a failing statement only fails its own caller. ``write``
+    blocks until the batch holding it is committed, which keeps
+    read-after-write behaviour for the caller.
+    """
+
+    def __init__(self, database: str, uri: bool = False, wal: bool = True,
+                 pragmas: dict = None, group_commit_max: int = 500, timeout: float = 30, init=None):
+        self.database = database
+        self.uri = uri
+        self.timeout = timeout
+        self.pragmas = {**DEFAULT_PRAGMAS, **(pragmas or {})}
+        self.group_commit_max = group_commit_max
+        self._local = threading.local()
+        self._readers = []
+        self._readers_lock = threading.Lock()
+        self._queue = queue.Queue()
+
+        self._writer = self._open()
+        self._writer.isolation_level = None  # explicit BEGIN/COMMIT in the writer loop
+        if wal:
+            self._writer.execute("PRAGMA journal_mode=WAL")
+        if init:
+            init(self._writer)
+        self._thread = threading.Thread(target=self._run, name="sqlite-writer", daemon=True)
+        self._thread.start()
+
+    def _open(self):
+        conn = sqlite3.connect(self.database, uri=self.uri, timeout=self.timeout, check_same_thread=False)
+        for name, value in self.pragmas.items():
+            conn.execute(f"PRAGMA {name}={value}")
+        return conn
+
+    def reader(self) -> sqlite3.Connection:
+        """The calling thread's read connection, opened on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._open()
+            self._local.conn = conn
+            with self._readers_lock:
+                self._readers.append(conn)
+        return conn
+
+    def submit(self, sql: str, params=(), many: bool = False) -> Future:
+        future = Future()
+        self._queue.put((sql, params, many, future))
+        return future
+
+    def write(self, sql: str, params=(), many: bool = False) -> int:
+        """Queue a write and wait for its group commit; returns the affected row count."""
+        return self.submit(sql, params, many).result()
+
+    def _run(self):
+        while True:
+            op = self._queue.get()
+            if op is None:
+                return
+            batch = [op]
+            stop = False
+            while len(batch) < self.group_commit_max:
+                try:
+                    op = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if op is None:
+                    stop = True
+                    break
+                batch.append(op)
+            self._commit(batch)
+            if stop:
+                return
+
+    def _commit(self, batch):
+        conn = self._writer
+        outcomes = []
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            for sql, params, many, future in batch:
+                conn.execute("SAVEPOINT op")
+                try:
+                    cursor = conn.executemany(sql, params) if many else conn.execute(sql, params)
+                    conn.execute("RELEASE op")
+                    outcomes.append((future, cursor.rowcount, None))
+                except sqlite3.Error as e:
+                    conn.execute("ROLLBACK TO op")
+                    conn.execute("RELEASE op")
+                    outcomes.append((future, None, e))
+            conn.execute("COMMIT")
+        except sqlite3.Error as e:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            for _, _, _, future in batch:
+                future.set_exception(e)
+            return
+        for future, rowcount, error in outcomes:
+            if error is None:
+                future.set_result(rowcount)
+            else:
+                future.set_exception(error)
+
+    def close(self):
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+        self._writer.close()
+        with self._readers_lock:
+            for conn in self._readers:
+                conn.close()
+            self._readers.clear()
@@ -0,0 +1,79 @@
+import sqlite3
+from collections import Counter, namedtuple
+from operator import attrgetter, itemgetter
+
+Relation = namedtuple("Relation", "child fk parent")
+RelationReport = namedtuple("RelationReport", "relation orphans counts")
+
+# Foreign keys between the JSONPlaceholder collections, declared once
+RELATIONS = (
+    Relation("posts", "userId", "users"),
+    Relation("comments", "postId", "posts"),
+    Relation("albums", "userId", "users"),
+    Relation("todos", "userId", "users"),
+    Relation("photos", "albumId", "albums"),
+)
+
+def relation_name(relation):
+    return f"{relation.child}.{relation.fk}"
+
+def _getter(items, *names):
+    # Items are dicts or src.models records
+    return (attrgetter if items and isinstance(items[0], tuple) else itemgetter)(*names)
+
+def collections_for(relations=RELATIONS):
+    return sorted({name for relation in relations for name in (relation.child, relation.parent)})
+
+def check_relations(collections, relations=RELATIONS, engine="python"):
+    """Check every relation in bulk and return ``{"posts.userId": RelationReport, ...}``.
+
+    ``orphans`` lists child ids whose foreign key matches no parent; ``counts``
+    maps every parent id (including childless ones) to its number of children.
+    The ``python`` engine uses set joins over id/fk columns; ``sqlite`` loads
+    the columns into a scratch in-memory database and uses anti-joins.
+    """
+    if engine == "python":
+        return {relation_name(r): _check_python(collections, r) for r in relations}
+    if engine == "sqlite":
+        return _check_sqlite(collections, relations)
+    raise ValueError(f"Unknown integrity engine: {engine}")
+
+def _check_python(collections, relation):
+    children, parents = collections[relation.child], collections[relation.parent]
+    parent_ids = set(map(_getter(parents, "id"), parents))
+    fks = list(map(_getter(children, relation.fk), children))
+    per_parent = Counter(fks)
+    orphans = [child_id for child_id, fk in zip(map(_getter(children, "id"), children), fks) if fk not in parent_ids]
+    counts = {parent_id: per_parent.get(parent_id, 0) for parent_id in sorted(parent_ids)}
+    return RelationReport(relation, orphans, counts)
+
+def _check_sqlite(collections, relations):
+    conn = sqlite3.connect(":memory:")
+    try:
+        columns = {}
+        for r in relations:
+            columns.setdefault(r.parent, set())
+            columns.setdefault(r.child, set()).add(r.fk)
+        for table, fks in columns.items():
+            cols = ("id", *sorted(fks))
+            conn.execute(f"CREATE TABLE {table} ({', '.join(cols)})")
+            rows = collections[table]
+            conn.executemany(
+                f"INSERT INTO {table} VALUES ({', '.join('?' * len(cols))})",
+                map(_getter(rows, *cols), rows) if len(cols) > 1 else ((value,) for value in map(_getter(rows, "id"), rows)),
+            )
+            conn.execute(f"CREATE INDEX idx_{table}_id ON {table} (id)")
+            for fk in fks:
+                conn.execute(f"CREATE INDEX idx_{table}_{fk} ON {table} ({fk})")
+        reports = {}
+        for r in relations:
+            orphans = [row[0] for row in conn.execute(
+                f"SELECT c.id FROM {r.child} c LEFT JOIN {r.parent} p ON c.{r.fk} = p.id "
+                f"WHERE p.id IS NULL ORDER BY c.id")]
+            counts = dict(conn.execute(
+                f"SELECT p.id, COUNT(c.id) FROM {r.parent} p LEFT JOIN {r.child} c ON c.{r.fk} = p.id "
+                f"GROUP BY p.id ORDER BY p.id"))
+            reports[relation_name(r)] = RelationReport(r, orphans, counts)
+        return reports
+    finally:
+        conn.close()
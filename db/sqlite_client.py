@@ -1,7 +1,36 @@
-import sqlite3
+import os
+import tempfile
+from functools import lru_cache
 from threading import Lock
+from db.connection_manager import ConnectionManager
+from src.utils.config import PROJECT_ROOT, load_config
+from src.utils.file_lock import FileLock, prune_stale, run_scoped_path
+
+# Shared databases from earlier runs older than this are removed on startup
+STALE_DB_SECONDS = 6 * 3600
+
+def database_settings():
+    return {"mode": "memory", "dir": ".cache/test_db", **(load_config().get("database") or {})}
+
+@lru_cache(maxsize=None)
+def _insert_sql(table, columns, upsert=False):
+    """Statement text per (table, columns, mode), built once and reused by sqlite's statement cache."""
+    sql = f"INSERT INTO {table} ({','.join(columns)}) VALUES ({','.join(['?'] * len(columns))})"
+    if upsert:
+        updates = ','.join(f"{c}=excluded.{c}" for c in columns if c != "id")
+        sql += f" ON CONFLICT(id) DO UPDATE SET {updates}" if updates else " ON CONFLICT(id) DO NOTHING"
+    return sql
+
+# Foreign-key columns that per-parent lookups and aggregates filter on
+FOREIGN_KEY_INDEXES = {"posts": "userId", "comments": "postId", "albums": "userId", "todos": "userId", "photos": "albumId"}
 
 class SQLiteClient:
+    """Process-wide validation DB.
+
+    Reads use a connection per thread; every write goes through the
+    ConnectionManager writer thread, which group-commits pending writes.
+    """
+
     _instance = None
     _lock = Lock()
 
@@ -9,28 +38,166 @@ class SQLiteClient:
         with cls._lock:
             if not cls._instance:
                 cls._instance = super().__new__(cls)
-                cls._instance.conn = sqlite3.connect(":memory:", check_same_thread=False) # In memory validation
-                # cls._instance.conn = sqlite3.connect("test.db", check_same_thread=False) # For file-based DB
-                cls._instance._create_tables()
+                cls._instance._connect(database_settings())
             return cls._instance
 
-    def _create_tables(self):
-        cursor = self.conn.cursor()
+    def _connect(self, settings):
+        self.mode = settings["mode"]
+        self._columns = {}
+        self._private_path = None
+        options = {
+            "pragmas": {name: settings[name] for name in ("synchronous", "cache_size", "mmap_size") if name in settings},
+            "group_commit_max": settings.get("group_commit_max", 500),
+            "init": self._create_tables,
+        }
+        if self.mode == "memory":
+            # Private WAL temp file: readers see only committed snapshots and never block on the writer,
+            # which a shared-cache memory DB cannot offer without read_uncommitted
+            self.path = None
+            fd, self._private_path = tempfile.mkstemp(prefix=f"sqlite_client_{os.getpid()}_", suffix=".sqlite")
+            os.close(fd)
+            # The file is deleted on close, so skip the fsyncs durability would cost
+            options["pragmas"] = {"synchronous": "OFF", **options["pragmas"]}
+            self._db = ConnectionManager(self._private_path, **options)
+        elif self.mode == "shared":
+            # File-backed WAL database shared by every xdist worker of this run
+            db_dir = os.path.join(PROJECT_ROOT, settings["dir"])
+            os.makedirs(db_dir, exist_ok=True)
+            prune_stale(db_dir, "run", STALE_DB_SECONDS)
+            self.path = run_scoped_path(db_dir, "run", ".sqlite")
+            with FileLock(self.path + ".lock"):
+                self._db = ConnectionManager(self.path, **options)
+        else:
+            raise ValueError(f"Unknown database mode: {self.mode}")
+
+    @property
+    def conn(self):
+        """The calling thread's read connection."""
+        return self._db.reader()
+
+    def close(self):
+        self._db.close()
+        if self._private_path:
+            for suffix in ("", "-wal", "-shm"):
+                try:
+                    os.remove(self._private_path + suffix)
+                except FileNotFoundError:
+                    pass
+            self._private_path = None
+
+    @staticmethod
+    def _create_tables(conn):
+        cursor = conn.cursor()
         cursor.execute('''CREATE TABLE IF NOT EXISTS users (id INTEGER PRIMARY KEY, name TEXT, username TEXT, email TEXT)''')
         cursor.execute('''CREATE TABLE IF NOT EXISTS posts (id INTEGER PRIMARY KEY, userId INTEGER, title TEXT, body TEXT)''')
         cursor.execute('''CREATE TABLE IF NOT EXISTS comments (id INTEGER PRIMARY KEY, postId INTEGER, name TEXT, email TEXT, body TEXT)''')
         cursor.execute('''CREATE TABLE IF NOT EXISTS albums (id INTEGER PRIMARY KEY, userId INTEGER, title TEXT)''')
         cursor.execute('''CREATE TABLE IF NOT EXISTS todos (id INTEGER PRIMARY KEY, userId INTEGER, title TEXT, completed BOOLEAN)''')
-        self.conn.commit()
+        cursor.execute('''CREATE TABLE IF NOT EXISTS photos (id INTEGER PRIMARY KEY, albumId INTEGER, title TEXT, url TEXT, thumbnailUrl TEXT)''')
+        for table, column in FOREIGN_KEY_INDEXES.items():
+            cursor.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_{column} ON {table} ({column})")
+        cursor.execute('''CREATE TABLE IF NOT EXISTS seeded (name TEXT PRIMARY KEY, rows INTEGER)''')
+
+    def columns(self, table):
+        """Column names of a table; also guards the identifiers interpolated into queries."""
+        if table not in self._columns:
+            names = tuple(row[1] for row in self.conn.execute(f"PRAGMA table_info({table})"))
+            if not names:
+                raise ValueError(f"Unknown table: {table}")
+            self._columns[table] = names
+        return self._columns[table]
 
-    def insert(self, table, data):
-        keys = ','.join(data.keys())
-        question_marks = ','.join(['?'] * len(data))
-        values = tuple(data.values())
-        self.conn.execute(f"INSERT INTO {table} ({keys}) VALUES ({question_marks})", values)
-        self.conn.commit()
+    def _check_columns(self, table, columns):
+        unknown = set(columns) - set(self.columns(table))
+        if unknown:
+            raise ValueError(f"Unknown column(s) for {table}: {', '.join(sorted(unknown))}")
+
+    def insert(self, table, data, upsert=False):
+        """Insert one row, a dict or a ``src.models`` record."""
+        if isinstance(data, tuple):
+            self._db.write(_insert_sql(table, data.COLUMNS, upsert), data.as_row())
+        else:
+            self._db.write(_insert_sql(table, tuple(data.keys()), upsert), tuple(data.values()))
+
+    def insert_many(self, table, rows, upsert=False):
+        """Insert all rows with one executemany and one commit.
+
+        Rows are dicts with the same keys, or ``src.models`` records whose
+        ``as_row()`` is passed through as is. ``upsert=True`` updates rows
+        whose id already exists instead of failing.
+        """
+        rows = list(rows)
+        if not rows:
+            return 0
+        if isinstance(rows[0], tuple):
+            columns = rows[0].COLUMNS
+            params = [row.as_row() for row in rows]
+        else:
+            columns = tuple(rows[0].keys())
+            params = [tuple(row[c] for c in columns) for row in rows]
+        self._db.write(_insert_sql(table, columns, upsert), params, many=True)
+        return len(rows)
+
+    def ingest(self, table, items, batch_size=500, upsert=True):
+        """Stream dict items (or model records) into ``table`` in fixed-size batches; returns the row count.
+
+        Only the table's columns are kept and at most ``batch_size`` rows are
+        held at a time, so memory stays flat however long ``items`` is.
+        """
+        columns = self.columns(table)
+        sql = _insert_sql(table, columns, upsert)
+        total = 0
+        batch = []
+        for item in items:
+            batch.append(item.as_row() if isinstance(item, tuple) else tuple(item[c] for c in columns))
+            if len(batch) >= batch_size:
+                total += len(batch)
+                self._db.write(sql, batch, many=True)
+                batch = []
+        if batch:
+            total += len(batch)
+            self._db.write(sql, batch, many=True)
+        return total
+
+    def populate_once(self, table, loader, upsert=True):
+        """Fill ``table`` with ``loader()`` rows once per database, however many workers ask.
+
+        In shared mode a file lock makes one worker fetch and insert while the
+        others wait and then find the table already seeded. Returns True when
+        this call did the seeding.
+        """
+        lock = FileLock(self.path + ".lock") if self.path else None
+        if lock:
+            lock.acquire()
+        try:
+            if self.conn.execute("SELECT 1 FROM seeded WHERE name = ?", (table,)).fetchone():
+                return False
+            rows = list(loader())
+            self.insert_many(table, rows, upsert=upsert)
+            self._db.write("INSERT OR REPLACE INTO seeded VALUES (?, ?)", (table, len(rows)))
+            return True
+        finally:
+            if lock:
+                lock.release()
 
     def fetchall(self, table):
         cursor = self.conn.cursor()
         cursor.execute(f"SELECT * FROM {table}")
         return cursor.fetchall()
+
+    def get_by_id(self, table, row_id):
+        """Primary-key lookup; returns the row tuple or None."""
+        self.columns(table)
+        return self.conn.execute(f"SELECT * FROM {table} WHERE id = ?", (row_id,)).fetchone()
+
+    def fetch_where(self, table, **filters):
+        """Rows matching every ``column=value`` filter (indexed for the foreign-key columns)."""
+        self._check_columns(table, filters)
+        where = " AND ".join(f"{column} = ?" for column in filters)
+        sql = f"SELECT * FROM {table}" + (f" WHERE {where}" if where else "") + " ORDER BY id"
+        return self.conn.execute(sql, tuple(filters.values())).fetchall()
+
+    def count_by(self, table, column):
+        """``{value: row count}`` grouped by one column, e.g. posts per userId."""
+        self._check_columns(table, (column,))
+        return dict(self.conn.execute(f"SELECT {column}, COUNT(*) FROM {table} GROUP BY {column}").fetchall())
@@ -6,3 +6,12 @@ class AlbumsAPI(BaseClient):
 
     def get_albums_by_user(self, user_id):
         return self.get("/albums", params={"userId": user_id})
+
+    def get_albums_by_users(self, user_ids):
+        return self.map_ids(self.get_albums_by_user, user_ids)
+
+    def stream_albums(self):
+        return self.get_stream("/albums")
+
+    def iter_albums(self, page_size=100):
+        return self.iter_items("/albums", page_size=page_size)
@@ -0,0 +1,125 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from .base_client import BaseClient, _split_endpoint, pool_settings
+
+class AsyncBaseClient(BaseClient):
+    """asyncio transport over BaseClient.
+
+    Each verb runs the blocking BaseClient call on a bounded worker pool, so
+    logging, retries and allure attachments behave exactly as on the sync client
+    while many requests are in flight at once.
+    """
+
+    def __init__(self, base_url: str, timeout: int = 10, concurrency: int = None, **kwargs):
+        # cache, cassette, retry_policy and rate_limiter are handled by BaseClient
+        super().__init__(base_url, timeout, **kwargs)
+        # Defaults to the per-host connection pool size so fan-out never waits on the pool
+        self.concurrency = concurrency or pool_settings()["pool_maxsize"]
+        self._executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="async-client")
+
+    async def _run(self, func, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, self, *args, **kwargs))
+
+    async def get(self, endpoint: str, params=None):
+        return await self._run(BaseClient.get, endpoint, params=params)
+
+    async def post(self, endpoint: str, json=None, data=None):
+        return await self._run(BaseClient.post, endpoint, json=json, data=data)
+
+    async def put(self, endpoint: str, json=None, data=None):
+        return await self._run(BaseClient.put, endpoint, json=json, data=data)
+
+    async def patch(self, endpoint: str, json=None, data=None):
+        return await self._run(BaseClient.patch, endpoint, json=json, data=data)
+
+    async def delete(self, endpoint: str):
+        return await self._run(BaseClient.delete, endpoint)
+
+    def _get_page(self, endpoint: str, params: dict):
+        # Pages are fetched from inside a worker already; go straight to the blocking GET
+        return BaseClient.get(self, endpoint, params=params)
+
+    async def _drain(self, iterator, batch: int = 1):
+        """Yield from a blocking iterator, advancing it on the worker pool ``batch`` items per hop."""
+        loop = asyncio.get_running_loop()
+
+        def take():
+            return list(islice(iterator, batch))
+
+        try:
+            while True:
+                items = await loop.run_in_executor(self._executor, take)
+                if not items:
+                    return
+                for item in items:
+                    yield item
+        finally:
+            try:
+                iterator.close()
+            except ValueError:
+                # Cancelled mid-hop: the worker still holds the generator, which closes when collected
+                pass
+
+    def iter_pages(self, endpoint: str, params=None, page_size: int = 100, prefetch: bool = True):
+        """Async iterator over ``BaseClient.iter_pages``, each page fetched off the event loop."""
+        return self._drain(BaseClient.iter_pages(self, endpoint, params, page_size, prefetch))
+
+    async def iter_items(self, endpoint: str, params=None, page_size: int = 100, prefetch: bool = True):
+        async for page in self.iter_pages(endpoint, params, page_size, prefetch):
+            for item in page:
+                yield item
+
+    def get_stream(self, endpoint: str, params=None, chunk_size: int = 65536):
+        """Async iterator over ``BaseClient.get_stream``; the body is read and parsed off the event loop."""
+        return self._drain(BaseClient.get_stream(self, endpoint, params, chunk_size), batch=256)
+
+    async def map_ids(self, func, ids, concurrency: int = None):
+        """Await ``func(id)`` for every id with at most ``concurrency`` calls in flight.
+
+        Results are returned in input order, mirroring ``BaseClient.map_ids``.
+        ``concurrency`` cannot exceed the client's own: its worker pool is
+        that size, so a larger value would be capped silently.
+        """
+        if concurrency is not None and not 1 <= concurrency <= self.concurrency:
+            raise ValueError(f"concurrency must be between 1 and the client's {self.concurrency}, got {concurrency}")
+        semaphore = asyncio.Semaphore(concurrency or self.concurrency)
+
+        async def call(item):
+            async with semaphore:
+                return await func(item)
+
+        return await asyncio.gather(*(call(item) for item in ids))
+
+    async def gather_many(self, endpoints, concurrency: int = None):
+        """GET every endpoint with at most ``concurrency`` requests in flight.
+
+        Items are either an endpoint string or an ``(endpoint, params)`` tuple.
+        Responses are returned in input order.
+        """
+        return await self.map_ids(lambda item: self.get(*_split_endpoint(item)), endpoints, concurrency)
+
+    async def get_many(self, endpoints):
+        return await self.gather_many(endpoints)
+
+    def close(self):
+        # The pooled session is shared process-wide; only the worker pool belongs to this client
+        self._executor.shutdown(wait=True)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.close()
+
+@functools.lru_cache(maxsize=None)
+def async_api(api_cls):
+    """Rebind a resource client onto the async transport, e.g. ``async_api(PostsAPI)(base_url)``.
+
+    The resource methods are inherited unchanged; because they call ``self.get`` and
+    friends, they return coroutines on the async transport (and async iterators
+    for the ``get_stream``/``iter_items`` based ones).
+    """
+    return type(f"Async{api_cls.__name__}", (api_cls, AsyncBaseClient), {})
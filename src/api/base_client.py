@@ -1,101 +1,334 @@
+import logging
+import threading
+import time
 import requests
-from src.utils.logger import get_logger
-from src.utils.retry_decorator import retry
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
+from threading import Lock
+from requests.adapters import HTTPAdapter
+from src.utils.config import load_config
+from src.api.cache import get_cache
+from src.api.cassette import fingerprint, get_cassette
+from src.api.response import ApiResponse
+from src.utils.json_stream import iter_json_array
+from src.utils.logger import BodyLogPolicy, Truncated, get_logger
+from src.utils.rate_limiter import RateLimiter
+from src.utils.retry_policy import RetryPolicy, retry_after_seconds
+from src.utils.timing import endpoint_key, get_timings
 import allure
 
+DEFAULT_POOL = {"pool_connections": 10, "pool_maxsize": 20, "pool_block": False, "keep_alive": True}
+
+def pool_settings():
+    return {**DEFAULT_POOL, **(load_config().get("http_pool") or {})}
+
+# Shared worker pool for batch calls, sized to the per-host connection pool
+EXECUTOR_PREFIX = "api-batch"
+_executor = None
+_executor_lock = Lock()
+
+def get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            workers = pool_settings()["pool_maxsize"]
+            _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=EXECUTOR_PREFIX)
+        return _executor
+
+def _on_pool_worker():
+    # A pool worker waiting on its own pool can starve it; callers run inline there instead
+    return threading.current_thread().name.startswith(EXECUTOR_PREFIX)
+
+# One pooled session per base_url so TCP/TLS connections are reused across client objects
+_sessions = {}
+_sessions_lock = Lock()
+
+def get_session(base_url: str) -> requests.Session:
+    with _sessions_lock:
+        session = _sessions.get(base_url)
+        if session is None:
+            settings = pool_settings()
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=settings["pool_connections"],
+                pool_maxsize=settings["pool_maxsize"],
+                pool_block=settings["pool_block"],
+            )
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            if not settings["keep_alive"]:
+                session.headers["Connection"] = "close"
+            _sessions[base_url] = session
+        return session
+
+def close_sessions():
+    with _sessions_lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
+
+_log_policy = None
+
+def get_log_policy() -> BodyLogPolicy:
+    global _log_policy
+    if _log_policy is None:
+        _log_policy = BodyLogPolicy(load_config().get("http_logging"))
+    return _log_policy
+
+_retry_policy = None
+
+def get_retry_policy() -> RetryPolicy:
+    global _retry_policy
+    if _retry_policy is None:
+        config = load_config()
+        _retry_policy = RetryPolicy({"max_attempts": config.get("retries", 3), **(config.get("retry_policy") or {})})
+    return _retry_policy
+
+_rate_limiter = None
+
+def get_rate_limiter():
+    """Process-wide limiter from the ``rate_limit`` config section, or None when disabled."""
+    global _rate_limiter
+    settings = load_config().get("rate_limit") or {}
+    if not settings.get("enabled"):
+        return None
+    if _rate_limiter is None:
+        _rate_limiter = RateLimiter(settings)
+    return _rate_limiter
+
+def _split_endpoint(item):
+    return (item, None) if isinstance(item, str) else item
+
+def _tee(chunks, sink: list):
+    for chunk in chunks:
+        sink.append(chunk)
+        yield chunk
+
 class BaseClient:
-    def __init__(self, base_url: str, timeout: int = 10):
+    def __init__(self, base_url: str, timeout: int = 10, cache=None, cassette=None, retry_policy=None,
+                 rate_limiter=None):
         self.base_url = base_url
-        self.session = requests.Session()
+        self.session = get_session(base_url)
         self.timeout = timeout
+        # Explicit ResponseCache, else the process-wide one when enabled in config (None = off)
+        self.cache = cache if cache is not None else get_cache()
+        # Record/replay cassette, likewise explicit or from config (None = live traffic only)
+        self.cassette = cassette if cassette is not None else get_cassette()
+        self.retry_policy = retry_policy or get_retry_policy()
+        self.rate_limiter = rate_limiter if rate_limiter is not None else get_rate_limiter()
+        self.timings = get_timings()
         self.logger = get_logger()
+        self.log_policy = get_log_policy()
 
-    @retry(max_retries=3, delay=2)
-    def get(self, endpoint: str, params=None):
+    def map_ids(self, func, ids):
+        """Call ``func(id)`` for every id on the shared pool (inline on a pool worker); results keep input order."""
+        if _on_pool_worker():
+            return list(map(func, ids))
+        return list(get_executor().map(func, ids))
+
+    def get_many(self, endpoints):
+        """GET every endpoint (a string or an ``(endpoint, params)`` tuple) in parallel."""
+        return self.map_ids(lambda item: self.get(*_split_endpoint(item)), endpoints)
+
+    def _send(self, verb: str, endpoint: str, **kwargs):
+        """Single transport path for every verb: retries, lazy request/response logging plus attachment."""
         url = f"{self.base_url}{endpoint}"
-        self.logger.info(f"GET {url} | params={params}")
-        response = self.session.get(url, params=params, timeout=self.timeout)
-        self.logger.info(f"Response: {response.status_code}")
-        try:
-            json_resp = response.json()
-            self.logger.info(f"JSON Response: {json_resp}")
-            allure.attach(
-                str(json_resp),
-                name=f"Response for {url}",
-                attachment_type=allure.attachment_type.JSON
-            )
-        except Exception as e:
-            self.logger.warning(f"Failed to parse JSON response: {e}")
+        policy = self.log_policy.resolve(verb, endpoint)
+        logger = self.logger
+        if logger.isEnabledFor(logging.INFO):
+            fields = {k: v for k, v in kwargs.items() if k in ("params", "json", "data") and v is not None}
+            if fields:
+                logger.info("%s %s | %s", verb, url, Truncated(fields, policy["body_max_chars"]))
+            else:
+                logger.info("%s %s", verb, url)
+        timing = self._timing(verb, endpoint, kwargs.get("params"))
+        if self.cassette is not None and self.cassette.replaying:
+            # Replayed responses never touch the host: no retries, no circuit breaker
+            response = self._request(verb, endpoint, url, timing, **kwargs)
+        else:
+            response = self.retry_policy.call(verb, lambda: self._request(verb, endpoint, url, timing, **kwargs),
+                                              self.base_url)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Response: %s", response.status_code)
+        self._log_body(url, response, policy)
+        return ApiResponse(response, timing)
+
+    def _timing(self, verb: str, endpoint: str, params=None):
+        """``(Timings, histogram key)`` for a request, or None when timing is disabled."""
+        return None if self.timings is None else (self.timings, endpoint_key(verb, endpoint, params))
+
+    def _request(self, verb: str, endpoint: str, url: str, timing=None, **kwargs):
+        cassette = self.cassette
+        if cassette is not None:
+            key = fingerprint(verb, endpoint, kwargs.get("params"), kwargs.get("json"), kwargs.get("data"))
+            if cassette.replaying:
+                return cassette.play(key)
+        limiter = self.rate_limiter
+        buckets = limiter.acquire(self.base_url, endpoint) if limiter is not None else ()
+        start = time.perf_counter()
+        response = self.session.request(verb, url, timeout=self.timeout, **kwargs)
+        if timing is not None:
+            # elapsed stops at the parsed headers (connect + TLS + server time); the rest is the body.
+            # urllib3 keeps no per-phase timestamps, so DNS, connect and TLS stay inside ttfb
+            timings, timing_key = timing
+            total, ttfb = time.perf_counter() - start, response.elapsed.total_seconds()
+            timings.record(timing_key, "ttfb", ttfb)
+            timings.record(timing_key, "download", max(0.0, total - ttfb))
+            timings.record(timing_key, "total", total)
+        if buckets:
+            limiter.observe(buckets, response.status_code, retry_after_seconds(response))
+        # A 304 only makes sense next to the cache entry it revalidated; keep the recorded 200.
+        # A streamed body is not read yet: get_stream records it once consumed
+        if cassette is not None and response.status_code != 304 and not kwargs.get("stream"):
+            cassette.record(key, response)
         return response
 
-    @retry(max_retries=3, delay=2)
-    def post(self, endpoint: str, json=None, data=None):
-        url = f"{self.base_url}{endpoint}"
-        self.logger.info(f"POST {url} | json={json} | data={data}")
-        response = self.session.post(url, json=json, data=data, timeout=self.timeout)
-        self.logger.info(f"Response: {response.status_code}")
-        try:
-            json_resp = response.json()
-            self.logger.info(f"JSON Response: {json_resp}")
+    def _log_body(self, url: str, response, policy: dict):
+        log_body = policy["log_bodies"] and self.logger.isEnabledFor(logging.INFO)
+        if not (log_body or policy["attach_bodies"]) or not response.content:
+            return
+        if not self.log_policy.sampled(policy):
+            return
+        body = Truncated(response.content, policy["body_max_chars"])
+        if log_body:
+            self.logger.info("Response body: %s", body)
+        if policy["attach_bodies"]:
+            # A cut-off JSON body no longer parses; attach it as plain text
+            is_json = not body.truncated and "json" in response.headers.get("Content-Type", "")
             allure.attach(
-                str(json_resp),
+                str(body),
                 name=f"Response for {url}",
-                attachment_type=allure.attachment_type.JSON
+                attachment_type=allure.attachment_type.JSON if is_json else allure.attachment_type.TEXT
             )
-        except Exception as e:
-            self.logger.warning(f"Failed to parse JSON response: {e}")
-        return response
 
-    @retry(max_retries=3, delay=2)
-    def put(self, endpoint: str, json=None, data=None):
+    def get(self, endpoint: str, params=None):
+        if self.cache is None:
+            return self._send("GET", endpoint, params=params)
         url = f"{self.base_url}{endpoint}"
-        self.logger.info(f"PUT {url} | json={json} | data={data}")
-        response = self.session.put(url, json=json, data=data, timeout=self.timeout)
-        self.logger.info(f"Response: {response.status_code}")
-        try:
-            json_resp = response.json()
-            self.logger.info(f"JSON Response: {json_resp}")
-            allure.attach(
-                str(json_resp),
-                name=f"Response for {url}",
-                attachment_type=allure.attachment_type.JSON
-            )
-        except Exception as e:
-            self.logger.warning(f"Failed to parse JSON response: {e}")
+        cached = self.cache.get(url, params)
+        if cached is not None:
+            self.logger.info("GET %s | params=%s | served from cache", url, params)
+            return ApiResponse(cached, self._timing("GET", endpoint, params))
+        # Revalidate a stored copy instead of re-downloading it when the cache has validators
+        headers = self.cache.validators(url, params)
+        response = self._send("GET", endpoint, params=params, headers=headers)
+        if response.status_code == 304 and headers:
+            cached = self.cache.not_modified(url, params, response)
+            if cached is not None:
+                self.logger.info("GET %s | not modified, served stored body", url)
+                return ApiResponse(cached, self._timing("GET", endpoint, params))
+            # Evicted while the revalidation was in flight: nothing to serve the 304 from, fetch the body
+            response = self._send("GET", endpoint, params=params)
+        if response.status_code == 200:
+            self.cache.put(url, params, response)
         return response
 
-    @retry(max_retries=3, delay=2)
-    def patch(self, endpoint: str, json=None, data=None):
+    def get_stream(self, endpoint: str, params=None, chunk_size: int = 65536):
+        """Yield the elements of a JSON array endpoint as they arrive.
+
+        The body is read with ``stream=True`` and parsed incrementally, so the
+        full collection is never held in memory. The request itself goes
+        through the retry policy and rate limiter like any GET; once the body
+        is being consumed it is not retried. Bypasses the response cache and
+        body logging.
+        """
         url = f"{self.base_url}{endpoint}"
-        self.logger.info(f"PATCH {url} | json={json} | data={data}")
-        response = self.session.patch(url, json=json, data=data, timeout=self.timeout)
-        self.logger.info(f"Response: {response.status_code}")
+        self.logger.info("GET %s | params=%s | streaming", url, params)
+        cassette = self.cassette
+        if cassette is not None and cassette.replaying:
+            response = cassette.play(fingerprint("GET", endpoint, params))
+            response.raise_for_status()
+            yield from iter_json_array([response.content])
+            return
+        start = time.perf_counter()
+        response = self.retry_policy.call(
+            "GET", lambda: self._request("GET", endpoint, url, params=params, stream=True), self.base_url)
+        with response:
+            self.logger.info("Response: %s", response.status_code)
+            response.raise_for_status()
+            if cassette is None:
+                yield from iter_json_array(response.iter_content(chunk_size=chunk_size))
+            else:
+                # Record the body as it streams past, once the array has been fully read
+                chunks = []
+                yield from iter_json_array(_tee(response.iter_content(chunk_size=chunk_size), chunks))
+                response._content = b"".join(chunks)
+                cassette.record(fingerprint("GET", endpoint, params), response)
+        if self.timings is not None:
+            # "total" here includes parsing and whatever the consumer did between items
+            key = endpoint_key("GET", endpoint, params) + " [stream]"
+            self.timings.record(key, "ttfb", response.elapsed.total_seconds())
+            self.timings.record(key, "total", time.perf_counter() - start)
+
+    def iter_pages(self, endpoint: str, params=None, page_size: int = 100, prefetch: bool = True):
+        """Yield a JSON array endpoint one page (a list) at a time, fetched as ``_start``/``_limit`` ranges.
+
+        While the caller works through a page, the next one is already being
+        fetched on the shared pool, so I/O overlaps processing and at most two
+        pages are held at once. Ends on a page that is not exactly
+        ``page_size`` long, once ``X-Total-Count`` (when sent) is reached, or
+        on a page identical to the previous one, so a server that ignores the
+        paging parameters cannot keep it going. Closing the generator early
+        cancels the pending fetch.
+        """
+        if page_size < 1:
+            raise ValueError(f"page_size must be at least 1, got {page_size}")
+        return self._pages(endpoint, params or {}, page_size, prefetch)
+
+    def _get_page(self, endpoint: str, params: dict):
+        return self.get(endpoint, params=params)
+
+    def _pages(self, endpoint, params, page_size, prefetch):
+        def fetch(start):
+            response = self._get_page(endpoint, {**params, "_start": start, "_limit": page_size})
+            response.raise_for_status()
+            total = response.headers.get("X-Total-Count")
+            return response.json(), int(total) if total is not None else None
+
+        if prefetch and _on_pool_worker():
+            prefetch = False
+        executor = get_executor() if prefetch else None
+        start = 0
+        previous = None
+        pending = executor.submit(fetch, start) if prefetch else None
         try:
-            json_resp = response.json()
-            self.logger.info(f"JSON Response: {json_resp}")
-            allure.attach(
-                str(json_resp),
-                name=f"Response for {url}",
-                attachment_type=allure.attachment_type.JSON
-            )
-        except Exception as e:
-            self.logger.warning(f"Failed to parse JSON response: {e}")
-        return response
+            while True:
+                page, total = pending.result() if prefetch else fetch(start)
+                pending = None
+                if page == previous:
+                    return
+                start += page_size
+                more = len(page) == page_size and (total is None or start < total)
+                pending = executor.submit(fetch, start) if prefetch and more else None
+                if page:
+                    yield page
+                if not more:
+                    return
+                previous = page
+        finally:
+            if pending is not None:
+                pending.cancel()
 
-    @retry(max_retries=3, delay=2)
-    def delete(self, endpoint: str):
-        url = f"{self.base_url}{endpoint}"
-        self.logger.info(f"DELETE {url}")
-        response = self.session.delete(url, timeout=self.timeout)
-        self.logger.info(f"Response: {response.status_code}")
+    def iter_items(self, endpoint: str, params=None, page_size: int = 100, prefetch: bool = True):
+        """The items of ``iter_pages`` one by one."""
+        return chain.from_iterable(self.iter_pages(endpoint, params, page_size, prefetch))
+
+    def _write(self, verb: str, endpoint: str, **kwargs):
         try:
-            json_resp = response.json()
-            self.logger.info(f"JSON Response: {json_resp}")
-            allure.attach(
-                str(json_resp),
-                name=f"Response for {url}",
-                attachment_type=allure.attachment_type.JSON
-            )
-        except Exception as e:
-            self.logger.warning(f"Failed to parse JSON response: {e}")
-        return response
+            return self._send(verb, endpoint, **kwargs)
+        finally:
+            # Even a failed write may have landed; cached reads of the resource and its collection are suspect
+            if self.cache is not None:
+                self.cache.invalidate(f"{self.base_url}{endpoint}")
+
+    def post(self, endpoint: str, json=None, data=None):
+        return self._write("POST", endpoint, json=json, data=data)
+
+    def put(self, endpoint: str, json=None, data=None):
+        return self._write("PUT", endpoint, json=json, data=data)
+
+    def patch(self, endpoint: str, json=None, data=None):
+        return self._write("PATCH", endpoint, json=json, data=data)
+
+    def delete(self, endpoint: str):
+        return self._write("DELETE", endpoint)
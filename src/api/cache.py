@@ -0,0 +1,267 @@
+import json
+import os
+import sqlite3
+import time
+from collections import OrderedDict, namedtuple
+from datetime import timedelta
+from threading import Lock
+from urllib.parse import urlencode
+import requests
+from requests.structures import CaseInsensitiveDict
+from src.utils.config import PROJECT_ROOT, load_config
+
+# Everything needed to rebuild a requests.Response without touching the network
+CacheEntry = namedtuple("CacheEntry", "status_code headers content url encoding elapsed stored_at")
+
+def cache_key(url: str, params=None) -> str:
+    """URL plus params with keys sorted and ``None`` values dropped."""
+    if not params:
+        return url
+    items = sorted((str(k), str(v)) for k, v in dict(params).items() if v is not None)
+    return f"{url}?{urlencode(items)}" if items else url
+
+def _key_url(key: str) -> str:
+    return key.split("?", 1)[0]
+
+def entry_from_response(response) -> CacheEntry:
+    return CacheEntry(
+        status_code=response.status_code,
+        headers=dict(response.headers),
+        content=response.content,
+        url=response.url,
+        encoding=response.encoding,
+        elapsed=response.elapsed.total_seconds(),
+        stored_at=time.time(),
+    )
+
+def response_from_entry(entry: CacheEntry) -> requests.Response:
+    response = requests.Response()
+    response.status_code = entry.status_code
+    response.headers = CaseInsensitiveDict(entry.headers)
+    response._content = entry.content
+    response.url = entry.url
+    response.encoding = entry.encoding
+    response.elapsed = timedelta(seconds=entry.elapsed)
+    response.reason = "OK"
+    response.from_cache = True
+    return response
+
+class MemoryBackend:
+    """Per-process LRU store."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key, entry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def delete_url(self, url):
+        with self._lock:
+            for key in [key for key in self._entries if _key_url(key) == url]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+class DiskBackend:
+    """SQLite-file LRU store that pytest-xdist workers on one machine can share."""
+
+    def __init__(self, path: str, maxsize: int):
+        self.maxsize = maxsize
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute('''CREATE TABLE IF NOT EXISTS http_cache (
+            key TEXT PRIMARY KEY, status_code INTEGER, headers TEXT, content BLOB, url TEXT,
+            encoding TEXT, elapsed REAL, stored_at REAL, last_used REAL)''')
+        self.conn.commit()
+        self._lock = Lock()
+
+    def get(self, key):
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT status_code, headers, content, url, encoding, elapsed, stored_at FROM http_cache WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            self.conn.execute("UPDATE http_cache SET last_used = ? WHERE key = ?", (time.time(), key))
+            self.conn.commit()
+        status_code, headers, content, url, encoding, elapsed, stored_at = row
+        return CacheEntry(status_code, json.loads(headers), content, url, encoding, elapsed, stored_at)
+
+    def set(self, key, entry):
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO http_cache VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, entry.status_code, json.dumps(entry.headers), entry.content, entry.url,
+                 entry.encoding, entry.elapsed, entry.stored_at, time.time()),
+            )
+            self.conn.execute(
+                "DELETE FROM http_cache WHERE key NOT IN (SELECT key FROM http_cache ORDER BY last_used DESC LIMIT ?)",
+                (self.maxsize,),
+            )
+            self.conn.commit()
+
+    def delete(self, key):
+        with self._lock:
+            self.conn.execute("DELETE FROM http_cache WHERE key = ?", (key,))
+            self.conn.commit()
+
+    def delete_url(self, url):
+        with self._lock:
+            # substr rather than LIKE: URLs may contain % and _
+            self.conn.execute("DELETE FROM http_cache WHERE key = ? OR substr(key, 1, ?) = ?",
+                              (url, len(url) + 1, url + "?"))
+            self.conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self.conn.execute("DELETE FROM http_cache")
+            self.conn.commit()
+
+    def __len__(self):
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM http_cache").fetchone()[0]
+
+class ResponseCache:
+    """TTL + LRU cache for idempotent GET responses, with hit/miss counters.
+
+    With ``conditional`` on, expired entries that carry an ``ETag`` or
+    ``Last-Modified`` validator are kept so the next fetch can be revalidated
+    with ``If-None-Match`` / ``If-Modified-Since`` and a 304 served from the
+    stored body.
+    """
+
+    def __init__(self, backend, ttl: float = 300, conditional: bool = False):
+        self.backend = backend
+        self.ttl = ttl
+        self.conditional = conditional
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self._lock = Lock()
+
+    def _count(self, counter):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def get(self, url: str, params=None):
+        key = cache_key(url, params)
+        entry = self.backend.get(key)
+        if entry is not None and time.time() - entry.stored_at > self.ttl:
+            if not (self.conditional and _validator_headers(entry)):
+                self.backend.delete(key)
+            entry = None
+        self._count("misses" if entry is None else "hits")
+        return None if entry is None else response_from_entry(entry)
+
+    def validators(self, url: str, params=None) -> dict:
+        """Conditional request headers for a stored (possibly stale) entry."""
+        if not self.conditional:
+            return {}
+        entry = self.backend.get(cache_key(url, params))
+        return _validator_headers(entry) if entry is not None else {}
+
+    def not_modified(self, url: str, params, response):
+        """Serve a 304 from the stored body and restart the entry's TTL."""
+        key = cache_key(url, params)
+        entry = self.backend.get(key)
+        if entry is None:
+            return None
+        self.backend.set(key, entry._replace(stored_at=time.time()))
+        self._count("revalidated")
+        cached = response_from_entry(entry)
+        cached.elapsed = response.elapsed
+        return cached
+
+    def put(self, url: str, params, response):
+        entry = entry_from_response(response)
+        # A zero-TTL (validators only) cache has no use for bodies it cannot revalidate
+        if self.ttl <= 0 and not _validator_headers(entry):
+            return
+        self.backend.set(cache_key(url, params), entry)
+
+    def invalidate(self, url: str):
+        """Drop the cached GETs of a written resource and of its collection, whatever their params.
+
+        ``/posts/1`` evicts ``/posts/1`` and ``/posts``, ``/posts?userId=1``...
+        but not ``/posts/10``.
+        """
+        self.backend.delete_url(url)
+        collection = url.rstrip("/").rsplit("/", 1)[0]
+        if "://" in collection and collection.split("://", 1)[1]:
+            self.backend.delete_url(collection)
+
+    def clear(self):
+        self.backend.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidated": self.revalidated,
+            "size": len(self.backend),
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+def _validator_headers(entry: CacheEntry) -> dict:
+    headers = CaseInsensitiveDict(entry.headers)
+    conditional = {}
+    if headers.get("ETag"):
+        conditional["If-None-Match"] = headers["ETag"]
+    if headers.get("Last-Modified"):
+        conditional["If-Modified-Since"] = headers["Last-Modified"]
+    return conditional
+
+DEFAULT_CACHE = {
+    "enabled": False, "conditional": False, "backend": "memory",
+    "ttl": 300, "maxsize": 512, "path": ".cache/http_cache.sqlite",
+}
+
+_cache = None
+_cache_lock = Lock()
+
+def get_cache():
+    """Process-wide cache built from the ``response_cache`` config section, or None when disabled.
+
+    Opt-in: ``conditional`` only takes effect on an enabled cache. A ``ttl``
+    of 0 then keeps validators alone, so every repeat fetch is revalidated
+    instead of served blind.
+    """
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            settings = {**DEFAULT_CACHE, **(load_config().get("response_cache") or {})}
+            if not settings["enabled"]:
+                return None
+            if settings["backend"] == "disk":
+                backend = DiskBackend(os.path.join(PROJECT_ROOT, settings["path"]), settings["maxsize"])
+            elif settings["backend"] == "memory":
+                backend = MemoryBackend(settings["maxsize"])
+            else:
+                raise ValueError(f"Unknown response_cache backend: {settings['backend']}")
+            _cache = ResponseCache(backend, ttl=settings["ttl"], conditional=settings["conditional"])
+        return _cache
@@ -0,0 +1,194 @@
+import base64
+import hashlib
+import json
+import mmap
+import os
+from datetime import timedelta
+from threading import Lock
+import requests
+from requests.structures import CaseInsensitiveDict
+from src.api.cache import cache_key
+from src.utils.config import PROJECT_ROOT, load_config
+from src.utils.file_lock import FileLock
+
+MODES = ("off", "record", "replay")
+
+class CassetteMiss(LookupError):
+    """Replay found no recorded response for a request."""
+
+def fingerprint(verb: str, endpoint: str, params=None, json_body=None, data=None) -> str:
+    """Host-independent request key, e.g. ``GET /comments?postId=1``; bodies add a short hash."""
+    key = f"{verb} {cache_key(endpoint, params)}"
+    if json_body is not None:
+        body = json.dumps(json_body, sort_keys=True, separators=(",", ":")).encode()
+    elif data is not None:
+        body = data if isinstance(data, bytes) else str(data).encode()
+    else:
+        return key
+    return f"{key} #{hashlib.sha1(body).hexdigest()[:16]}"
+
+def _encode(key: str, response) -> bytes:
+    record = {
+        "key": key,
+        "status_code": response.status_code,
+        "headers": dict(response.headers),
+        "url": response.url,
+        "encoding": response.encoding,
+        "elapsed": response.elapsed.total_seconds(),
+    }
+    try:
+        record["body"] = response.content.decode("utf-8")
+    except UnicodeDecodeError:
+        record["body_b64"] = base64.b64encode(response.content).decode("ascii")
+    return json.dumps(record, separators=(",", ":")).encode() + b"\n"
+
+def _decode(line: bytes) -> requests.Response:
+    record = json.loads(line)
+    response = requests.Response()
+    response.status_code = record["status_code"]
+    response.headers = CaseInsensitiveDict(record["headers"])
+    if "body_b64" in record:
+        response._content = base64.b64decode(record["body_b64"])
+    else:
+        response._content = record["body"].encode("utf-8")
+    response.url = record["url"]
+    response.encoding = record["encoding"]
+    response.elapsed = timedelta(seconds=record["elapsed"])
+    response.reason = "Replayed"
+    return response
+
+class Cassette:
+    """Append-only JSONL log of request/response pairs plus a side index.
+
+    ``<path>.jsonl`` holds one response per line; ``<path>.idx.json`` maps each
+    request fingerprint to the ``(offset, length)`` of its latest response, so
+    replay reads a single slice of the memory-mapped log and never parses the
+    rest. A missing or outdated index is rebuilt by scanning the log once.
+    Recording is safe across pytest-xdist workers: appends and index merges
+    happen under a file lock.
+    """
+
+    def __init__(self, path: str, mode: str = "replay"):
+        if mode not in MODES[1:]:
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        self.path = path
+        self.mode = mode
+        self.log_path = f"{path}.jsonl"
+        self.index_path = f"{path}.idx.json"
+        self._lock = Lock()
+        self._file_lock = FileLock(f"{path}.lock")
+        self._index = {}
+        self._log = None
+        self._map = None
+        if mode == "replay":
+            self._open_replay()
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == "replay"
+
+    def _open_replay(self):
+        if not os.path.exists(self.log_path):
+            raise FileNotFoundError(f"No cassette recorded at {self.log_path}")
+        self._log = open(self.log_path, "rb")
+        size = os.fstat(self._log.fileno()).st_size
+        if size:
+            self._map = mmap.mmap(self._log.fileno(), 0, access=mmap.ACCESS_READ)
+        self._index = self._read_index(size)
+
+    def _read_index(self, size: int) -> dict:
+        try:
+            with open(self.index_path) as f:
+                stored = json.load(f)
+            if stored.get("size") == size:
+                return stored["entries"]
+        except (OSError, ValueError):
+            pass
+        return self._scan(size)
+
+    def _scan(self, size: int) -> dict:
+        index, offset = {}, 0
+        while offset < size:
+            end = self._map.find(b"\n", offset)
+            end = size if end == -1 else end + 1
+            index[json.loads(self._map[offset:end])["key"]] = [offset, end - offset]
+            offset = end
+        return index
+
+    def play(self, key: str) -> requests.Response:
+        span = self._index.get(key)
+        if span is None:
+            raise CassetteMiss(f"No recorded response for {key} in {self.log_path}")
+        offset, length = span
+        return _decode(self._map[offset:offset + length])
+
+    def record(self, key: str, response):
+        line = _encode(key, response)
+        with self._lock, self._file_lock:
+            if self._log is None:
+                os.makedirs(os.path.dirname(os.path.abspath(self.log_path)), exist_ok=True)
+                self._log = open(self.log_path, "ab")
+            offset = self._log.seek(0, os.SEEK_END)
+            self._log.write(line)
+            self._log.flush()
+            self._index[key] = [offset, len(line)]
+
+    def keys(self):
+        return list(self._index)
+
+    def __len__(self):
+        return len(self._index)
+
+    def __contains__(self, key):
+        return key in self._index
+
+    def _write_index(self):
+        with self._file_lock:
+            size = os.path.getsize(self.log_path)
+            try:
+                with open(self.index_path) as f:
+                    entries = json.load(f).get("entries", {})
+            except (OSError, ValueError):
+                entries = {}
+            # Other workers' spans stay valid: the log is append-only
+            entries.update(self._index)
+            tmp_path = f"{self.index_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump({"size": size, "entries": entries}, f, separators=(",", ":"))
+            os.replace(tmp_path, self.index_path)
+
+    def close(self):
+        with self._lock:
+            if self.mode == "record" and self._index:
+                self._write_index()
+            if self._map is not None:
+                self._map.close()
+                self._map = None
+            if self._log is not None:
+                self._log.close()
+                self._log = None
+
+DEFAULT_CASSETTE = {"mode": "off", "path": "data/cassettes/jsonplaceholder"}
+
+_cassette = None
+_cassette_lock = Lock()
+
+def get_cassette():
+    """Process-wide cassette from the ``cassette`` config section (or ``set_cassette``), None when off."""
+    global _cassette
+    with _cassette_lock:
+        if _cassette is None:
+            settings = {**DEFAULT_CASSETTE, **(load_config().get("cassette") or {})}
+            mode = settings["mode"] or "off"  # YAML reads a bare off as False
+            if mode == "off":
+                return None
+            _cassette = Cassette(os.path.join(PROJECT_ROOT, settings["path"]), mode)
+        return _cassette
+
+def set_cassette(cassette):
+    """Install ``cassette`` for clients created from now on and close the previous one."""
+    global _cassette
+    with _cassette_lock:
+        previous, _cassette = _cassette, cassette
+    if previous is not None and previous is not cassette:
+        previous.close()
@@ -9,6 +9,16 @@ class CommentsAPI(BaseClient):
     def get_comments_by_post(self, post_id):
         return self.get("/comments", params={"postId": post_id})
 
+    def get_comments_by_posts(self, post_ids):
+        return self.map_ids(self.get_comments_by_post, post_ids)
+
+    def stream_comments(self):
+        return self.get_stream("/comments")
+
+    def iter_comments(self, page_size=100, post_id=None):
+        params = {"postId": post_id} if post_id is not None else None
+        return self.iter_items("/comments", params=params, page_size=page_size)
+
     # OOP Concept: Abstraction - These methods abstract HTTP operations for comments
     # OOP Concept: Polymorphism - Can override BaseClient methods if needed
     def create_comment(self, data):
@@ -0,0 +1,19 @@
+from .base_client import BaseClient
+
+class PhotosAPI(BaseClient):
+    def get_photos(self):
+        return self.get("/photos")
+
+    def get_photos_by_album(self, album_id):
+        return self.get("/photos", params={"albumId": album_id})
+
+    def get_photos_by_albums(self, album_ids):
+        return self.map_ids(self.get_photos_by_album, album_ids)
+
+    def stream_photos(self, album_id=None):
+        params = {"albumId": album_id} if album_id is not None else None
+        return self.get_stream("/photos", params=params)
+
+    def iter_photos(self, page_size=500, album_id=None):
+        params = {"albumId": album_id} if album_id is not None else None
+        return self.iter_items("/photos", params=params, page_size=page_size)
@@ -12,6 +12,21 @@ class PostsAPI(BaseClient):
     def get_posts_by_user(self, user_id):
         return self.get("/posts", params={"userId": user_id})
 
+    # Batch lookups run on the shared pool and keep input order
+    def get_posts_by_ids(self, post_ids):
+        return self.map_ids(self.get_post_by_id, post_ids)
+
+    def get_posts_by_users(self, user_ids):
+        return self.map_ids(self.get_posts_by_user, user_ids)
+
+    # Streaming: elements are parsed as they arrive instead of one json() over the whole body
+    def stream_posts(self):
+        return self.get_stream("/posts")
+
+    # Paged: ``_start``/``_limit`` ranges with the next page prefetched while this one is consumed
+    def iter_posts(self, page_size=100):
+        return self.iter_items("/posts", page_size=page_size)
+
     # OOP Concept: Abstraction - These methods abstract HTTP operations for posts
     # OOP Concept: Polymorphism - Can override BaseClient methods if needed
     def create_post(self, data):
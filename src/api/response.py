@@ -0,0 +1,57 @@
+import time
+import requests
+from src.utils import json_backend
+
+_UNSET = object()
+
+class ApiResponse:
+    """Thin wrapper over ``requests.Response`` that decodes the JSON body at most once.
+
+    Every other attribute (``status_code``, ``elapsed``, ``headers``...) is read
+    from the wrapped response. ``json()`` returns the same object on every call,
+    so callers must copy it before mutating. ``timing`` is an optional
+    ``(Timings, key)`` pair that receives the decode time.
+
+    It wraps rather than subclasses, so ``isinstance(r, requests.Response)`` is
+    False; use ``r.raw`` where a real ``requests.Response`` is required. Special
+    methods bypass ``__getattr__``, so the ones ``requests.Response`` defines are
+    forwarded explicitly: truthiness is ``ok``, iteration yields body chunks,
+    and ``with`` closes the response.
+    """
+
+    __slots__ = ("raw", "_json", "_timing")
+
+    def __init__(self, raw: requests.Response, timing=None):
+        self.raw = raw
+        self._json = _UNSET
+        self._timing = timing
+
+    def json(self):
+        if self._json is _UNSET:
+            start = time.perf_counter()
+            try:
+                self._json = json_backend.loads(self.raw.content)
+            except ValueError as e:
+                raise requests.exceptions.JSONDecodeError(str(e), self.raw.text, 0) from e
+            if self._timing is not None:
+                timings, key = self._timing
+                timings.record(key, "decode", time.perf_counter() - start)
+        return self._json
+
+    def __getattr__(self, name):
+        return getattr(self.raw, name)
+
+    def __bool__(self):
+        return self.raw.ok
+
+    def __iter__(self):
+        return iter(self.raw)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.raw.close()
+
+    def __repr__(self):
+        return f"<ApiResponse [{self.raw.status_code}]>"
@@ -0,0 +1,149 @@
+import json
+import os
+from operator import attrgetter, itemgetter
+from types import MappingProxyType
+from src.api.base_client import BaseClient
+from src.models.album import Album
+from src.models.comment import Comment
+from src.models.photo import Photo
+from src.models.post import Post
+from src.models.todo import Todo
+from src.models.user import User
+from src.utils.config import PROJECT_ROOT
+from src.utils.file_lock import FileLock, prune_stale, run_scoped_path
+from src.utils.schema_validator import validate_many
+
+COLLECTIONS = ("users", "posts", "comments", "albums", "todos")
+SNAPSHOT_DIR = os.path.join(PROJECT_ROOT, ".cache", "snapshots")
+STALE_SNAPSHOT_SECONDS = 6 * 3600
+MODELS = {"users": User, "posts": Post, "comments": Comment, "albums": Album, "todos": Todo, "photos": Photo}
+
+def _freeze(value):
+    """Read-only copy of a JSON value: objects become mappingproxies and arrays tuples, all the way down."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(map(_freeze, value))
+    return value
+
+def _frozen_records(model, items):
+    # Only the fields annotated as dict/list (User.address, User.company) can hold nested JSON
+    nested = [name for name, kind in model.__annotations__.items() if kind in (dict, list)]
+    records = map(model.from_json, items)
+    if not nested:
+        return tuple(records)
+    return tuple(record._replace(**{name: _freeze(getattr(record, name)) for name in nested})
+                 for record in records)
+
+class CollectionView:
+    """Read-only, indexed view of one collection.
+
+    Items are read-only mappings, or ``model`` records (``post.userId``) when a
+    model is given, frozen all the way down (``user.address`` is a mappingproxy
+    too); ``by_id`` and ``group_by(fk)`` are built once and shared, so lookups
+    never rescan the list.
+    """
+
+    __slots__ = ("name", "items", "by_id", "_getter", "_groups")
+
+    def __init__(self, name, items, model=None):
+        self.name = name
+        if model is None:
+            self.items = tuple(map(_freeze, items))
+            self._getter = itemgetter
+        else:
+            self.items = _frozen_records(model, items)
+            self._getter = attrgetter
+        get_id = self._getter("id")
+        self.by_id = MappingProxyType({get_id(item): item for item in self.items})
+        self._groups = {}
+
+    def group_by(self, key):
+        """``{key value: tuple of items}``, e.g. ``snapshot.posts.group_by("userId")``."""
+        groups = self._groups.get(key)
+        if groups is None:
+            grouped = {}
+            get = self._getter(key)
+            for item in self.items:
+                grouped.setdefault(get(item), []).append(item)
+            groups = self._groups[key] = MappingProxyType({k: tuple(v) for k, v in grouped.items()})
+        return groups
+
+    @property
+    def ids(self):
+        return tuple(self.by_id)
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+    def __getitem__(self, index):
+        return self.items[index]
+
+class DataSnapshot:
+    """Every collection fetched and schema-validated once, exposed as CollectionViews.
+
+    ``typed=True`` holds the items as ``src.models`` records instead of dicts:
+    about half the memory per item, and they go straight into ``SQLiteClient``.
+    """
+
+    def __init__(self, collections: dict, typed: bool = False):
+        self._views = {name: CollectionView(name, items, MODELS[name] if typed else None)
+                       for name, items in collections.items()}
+
+    def __getattr__(self, name):
+        try:
+            return self._views[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __getitem__(self, name):
+        return self._views[name]
+
+    @property
+    def collections(self):
+        """``{name: items}`` for consumers that take plain sequences (e.g. the integrity engine)."""
+        return {name: view.items for name, view in self._views.items()}
+
+    @staticmethod
+    def fetch(base_url, names=COLLECTIONS):
+        """GET every collection once, in parallel, and validate each against its schema once."""
+        names = list(names)
+        responses = BaseClient(base_url).get_many([f"/{name}" for name in names])
+        collections = {}
+        for name, resp in zip(names, responses):
+            assert resp.status_code == 200, f"GET /{name} returned {resp.status_code}"
+            items = resp.json()
+            validate_many(items, name[:-1])
+            collections[name] = items
+        return collections
+
+    @classmethod
+    def load(cls, base_url, names=COLLECTIONS, typed=False):
+        return cls(cls.fetch(base_url, names), typed)
+
+    @classmethod
+    def load_shared(cls, base_url, names=COLLECTIONS, directory=SNAPSHOT_DIR, typed=False):
+        """Like ``load``, but xdist workers of one run share a single fetch through a JSON file.
+
+        The first worker to take the lock fetches and writes the file; the rest
+        wait on the lock and read it back without touching the network.
+        """
+        os.makedirs(directory, exist_ok=True)
+        prune_stale(directory, "snapshot", STALE_SNAPSHOT_SECONDS)
+        path = run_scoped_path(directory, "snapshot", ".json")
+        with FileLock(path + ".lock"):
+            collections = {}
+            if os.path.exists(path):
+                with open(path) as f:
+                    collections = json.load(f)
+            missing = [name for name in names if name not in collections]
+            if missing:
+                collections.update(cls.fetch(base_url, missing))
+                tmp_path = f"{path}.{os.getpid()}.tmp"
+                with open(tmp_path, "w") as f:
+                    json.dump(collections, f, separators=(",", ":"))
+                os.replace(tmp_path, path)
+        return cls({name: collections[name] for name in names}, typed)
@@ -6,3 +6,25 @@ class TodosAPI(BaseClient):
 
     def get_todos_by_user(self, user_id):
         return self.get("/todos", params={"userId": user_id})
+
+    def get_todos_by_users(self, user_ids):
+        return self.map_ids(self.get_todos_by_user, user_ids)
+
+    def stream_todos(self):
+        return self.get_stream("/todos")
+
+    def iter_todos(self, page_size=100, user_id=None):
+        params = {"userId": user_id} if user_id is not None else None
+        return self.iter_items("/todos", params=params, page_size=page_size)
+
+    def create_todo(self, data):
+        return self.post("/todos", json=data)
+
+    def update_todo(self, todo_id, data):
+        return self.put(f"/todos/{todo_id}", json=data)
+
+    def patch_todo(self, todo_id, data):
+        return self.patch(f"/todos/{todo_id}", json=data)
+
+    def delete_todo(self, todo_id):
+        return self.delete(f"/todos/{todo_id}")
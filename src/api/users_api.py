@@ -8,14 +8,17 @@ class UsersAPI(BaseClient):
     def get_user_by_id(self, user_id):
         return self.get(f"/users/{user_id}")
 
+    def get_users_by_ids(self, user_ids):
+        return self.map_ids(self.get_user_by_id, user_ids)
+
     def create_user(self, user_data):
-        return self.session.post(f"{self.base_url}/users", json=user_data, timeout=self.timeout)
+        return self.post("/users", json=user_data)
 
     def update_user(self, user_id, user_data):
-        return self.session.put(f"{self.base_url}/users/{user_id}", json=user_data, timeout=self.timeout)
+        return self.put(f"/users/{user_id}", json=user_data)
 
     def patch_user(self, user_id, user_data):
-        return self.session.patch(f"{self.base_url}/users/{user_id}", json=user_data, timeout=self.timeout)
+        return self.patch(f"/users/{user_id}", json=user_data)
 
     def delete_user(self, user_id):
-        return self.session.delete(f"{self.base_url}/users/{user_id}", timeout=self.timeout)
+        return self.delete(f"/users/{user_id}")
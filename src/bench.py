@@ -0,0 +1,235 @@
+import argparse
+import json
+import logging
+import math
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from src.api.albums_api import AlbumsAPI
+from src.api.cassette import Cassette
+from src.api.comments_api import CommentsAPI
+from src.api.photos_api import PhotosAPI
+from src.api.posts_api import PostsAPI
+from src.api.todos_api import TodosAPI
+from src.api.users_api import UsersAPI
+from src.mock_server import MockServer
+from src.utils.config import load_config
+from src.utils.timing import PERCENTILES, LatencyHistogram
+
+# Each operation takes the resource clients and a Random, and returns a response
+OPERATIONS = {
+    "get_users": lambda apis, rng: apis["users"].get_users(),
+    "get_user": lambda apis, rng: apis["users"].get_user_by_id(rng.randint(1, 10)),
+    "get_posts": lambda apis, rng: apis["posts"].get_posts(),
+    "get_post": lambda apis, rng: apis["posts"].get_post_by_id(rng.randint(1, 100)),
+    "get_posts_by_user": lambda apis, rng: apis["posts"].get_posts_by_user(rng.randint(1, 10)),
+    "get_comments": lambda apis, rng: apis["comments"].get_comments(),
+    "get_comments_by_post": lambda apis, rng: apis["comments"].get_comments_by_post(rng.randint(1, 100)),
+    "get_albums_by_user": lambda apis, rng: apis["albums"].get_albums_by_user(rng.randint(1, 10)),
+    "get_todos_by_user": lambda apis, rng: apis["todos"].get_todos_by_user(rng.randint(1, 10)),
+    "get_photos_by_album": lambda apis, rng: apis["photos"].get_photos_by_album(rng.randint(1, 100)),
+    "create_post": lambda apis, rng: apis["posts"].create_post({"userId": 1, "title": "bench", "body": "bench"}),
+    "update_post": lambda apis, rng: apis["posts"].update_post(rng.randint(1, 100), {"title": "bench"}),
+    "delete_post": lambda apis, rng: apis["posts"].delete_post(rng.randint(1, 100)),
+}
+
+# Built-in scenarios; every field can be overridden from the command line
+SCENARIOS = {
+    "read-mix": {
+        "mode": "closed", "concurrency": 20, "duration": 10, "rate": None,
+        "mix": {"get_post": 5, "get_comments_by_post": 3, "get_posts_by_user": 1, "get_user": 1},
+    },
+    "crud": {
+        "mode": "closed", "concurrency": 10, "duration": 10, "rate": None,
+        "mix": {"get_post": 4, "create_post": 2, "update_post": 2, "delete_post": 1},
+    },
+    "collections": {
+        "mode": "closed", "concurrency": 4, "duration": 10, "rate": None,
+        "mix": {"get_users": 1, "get_posts": 1, "get_comments": 1, "get_photos_by_album": 2},
+    },
+    "steady": {
+        "mode": "open", "concurrency": 50, "duration": 10, "rate": 100,
+        "mix": {"get_post": 5, "get_comments_by_post": 3, "get_albums_by_user": 1, "get_todos_by_user": 1},
+    },
+}
+
+class OpStats:
+    __slots__ = ("histogram", "requests", "errors")
+
+    def __init__(self):
+        self.histogram = LatencyHistogram()
+        self.requests = 0
+        self.errors = 0
+
+class LoadRun:
+    """Drives the resource clients with a weighted request mix and collects per-operation stats.
+
+    ``closed`` keeps ``concurrency`` workers busy back to back, so throughput
+    is whatever the client and server sustain. ``open`` issues requests on a
+    fixed schedule of ``rate`` per second regardless of completions, with up
+    to ``concurrency`` in flight; latency is measured from the scheduled start,
+    so queueing behind a slow server is counted rather than hidden
+    (coordinated omission). A response with status >= 400 or an exception
+    counts as an error.
+    """
+
+    def __init__(self, base_url: str, mix: dict, concurrency: int = 10, duration: float = 10, mode: str = "closed",
+                 rate: float = None, seed: int = 0, cassette=None):
+        unknown = set(mix) - set(OPERATIONS)
+        if unknown:
+            raise ValueError(f"Unknown operations: {', '.join(sorted(unknown))}")
+        if mode not in ("closed", "open"):
+            raise ValueError(f"Unknown mode: {mode}")
+        if mode == "open" and not rate:
+            raise ValueError("Open-loop runs need a rate")
+        self.ops = list(mix)
+        self.weights = [mix[op] for op in self.ops]
+        self.concurrency = concurrency
+        self.duration = duration
+        self.mode = mode
+        self.rate = rate
+        self.seed = seed
+        kwargs = {"cassette": cassette} if cassette is not None else {}
+        self.apis = {
+            "users": UsersAPI(base_url, **kwargs), "posts": PostsAPI(base_url, **kwargs),
+            "comments": CommentsAPI(base_url, **kwargs), "albums": AlbumsAPI(base_url, **kwargs),
+            "todos": TodosAPI(base_url, **kwargs), "photos": PhotosAPI(base_url, **kwargs),
+        }
+        self.stats = {op: OpStats() for op in self.ops}
+        self._lock = threading.Lock()
+        self.elapsed = 0.0
+
+    def _call(self, op, rng, started):
+        try:
+            failed = OPERATIONS[op](self.apis, rng).status_code >= 400
+        except Exception:
+            failed = True
+        latency = time.perf_counter() - started
+        with self._lock:
+            stats = self.stats[op]
+            stats.requests += 1
+            stats.errors += failed
+            stats.histogram.record(latency)
+
+    def _closed_worker(self, worker, deadline):
+        rng = random.Random(self.seed * 1000 + worker)
+        while time.perf_counter() < deadline:
+            op = rng.choices(self.ops, self.weights)[0]
+            self._call(op, rng, time.perf_counter())
+
+    def _run_closed(self, deadline):
+        threads = [threading.Thread(target=self._closed_worker, args=(i, deadline), name=f"bench-{i}")
+                   for i in range(self.concurrency)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    def _run_open(self, start):
+        rng = random.Random(self.seed)
+        interval = 1 / self.rate
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="bench") as executor:
+            # Arrival i is at start + i * interval; summing the intervals drifts and can add one past the deadline
+            for i in range(math.ceil(round(self.duration * self.rate, 9))):
+                scheduled = start + i * interval
+                delay = scheduled - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                op = rng.choices(self.ops, self.weights)[0]
+                executor.submit(self._call, op, random.Random(rng.random()), scheduled)
+
+    def run(self) -> dict:
+        start = time.perf_counter()
+        deadline = start + self.duration
+        if self.mode == "closed":
+            self._run_closed(deadline)
+        else:
+            self._run_open(start)
+        self.elapsed = time.perf_counter() - start
+        return self.report()
+
+    def report(self) -> dict:
+        overall = OpStats()
+        operations = {}
+        for op, stats in self.stats.items():
+            operations[op] = self._summarize(stats)
+            overall.histogram.merge(stats.histogram)
+            overall.requests += stats.requests
+            overall.errors += stats.errors
+        return {
+            "mode": self.mode, "concurrency": self.concurrency, "rate": self.rate,
+            "duration": self.elapsed, "overall": self._summarize(overall), "operations": operations,
+        }
+
+    def _summarize(self, stats: OpStats) -> dict:
+        summary = {
+            "requests": stats.requests,
+            "throughput": stats.requests / self.elapsed if self.elapsed else 0.0,
+            "error_rate": stats.errors / stats.requests if stats.requests else 0.0,
+        }
+        summary.update((f"p{q}", stats.histogram.percentile(q)) for q in PERCENTILES)
+        summary["max"] = stats.histogram.max / 1_000_000
+        return summary
+
+def format_report(report: dict) -> str:
+    header = f"{'operation':<22}{'requests':>9}{'req/s':>9}{'errors':>8}" + "".join(
+        f"{f'p{q} ms':>10}" for q in PERCENTILES) + f"{'max ms':>10}"
+    lines = [f"{report['mode']}-loop, concurrency {report['concurrency']}"
+             + (f", {report['rate']} req/s offered" if report["rate"] else "")
+             + f", {report['duration']:.1f}s", header]
+    rows = sorted(report["operations"].items()) + [("overall", report["overall"])]
+    for name, s in rows:
+        lines.append(f"{name:<22}{s['requests']:>9}{s['throughput']:>9.1f}{s['error_rate']:>8.1%}"
+                     + "".join(f"{s[f'p{q}'] * 1000:>10.1f}" for q in PERCENTILES) + f"{s['max'] * 1000:>10.1f}")
+    return "\n".join(lines)
+
+def parse_mix(text: str) -> dict:
+    """``"get_post=5,create_post=1"`` -> ``{"get_post": 5.0, "create_post": 1.0}``."""
+    mix = {}
+    for part in filter(None, text.split(",")):
+        op, _, weight = part.partition("=")
+        mix[op.strip()] = float(weight or 1)
+    return mix
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load and throughput benchmark over the resource clients.")
+    parser.add_argument("scenario", nargs="?", default="read-mix", choices=sorted(SCENARIOS))
+    parser.add_argument("--base-url", help="target API (default: base_url from config.yaml)")
+    parser.add_argument("--mock-server", action="store_true", help="start the local stand-in server and target it")
+    parser.add_argument("--mock-latency", type=float, default=0, help="seconds the stand-in adds to each response")
+    parser.add_argument("--replay", metavar="CASSETTE", help="serve every request from a recorded cassette")
+    parser.add_argument("--mode", choices=("closed", "open"))
+    parser.add_argument("--concurrency", type=int)
+    parser.add_argument("--duration", type=float)
+    parser.add_argument("--rate", type=float, help="offered requests/second (open loop)")
+    parser.add_argument("--mix", type=parse_mix, help="weighted operations, e.g. get_post=5,create_post=1")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", metavar="PATH", help="also write the report as JSON")
+    parser.add_argument("--verbose", action="store_true", help="keep per-request INFO logging (slows the client)")
+    args = parser.parse_args(argv)
+    if not args.verbose:
+        logging.disable(logging.INFO)
+
+    scenario = dict(SCENARIOS[args.scenario])
+    for name in ("mode", "concurrency", "duration", "rate", "mix"):
+        if getattr(args, name) is not None:
+            scenario[name] = getattr(args, name)
+    cassette = Cassette(args.replay, "replay") if args.replay else None
+    server = MockServer(latency=args.mock_latency).start() if args.mock_server else None
+    try:
+        base_url = server.url if server else args.base_url or load_config()["base_url"]
+        report = LoadRun(base_url, seed=args.seed, cassette=cassette, **scenario).run()
+    finally:
+        if server:
+            server.stop()
+        if cassette:
+            cassette.close()
+    report["scenario"] = args.scenario
+    print(format_report(report))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=1)
+
+if __name__ == "__main__":
+    main()
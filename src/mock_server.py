@@ -0,0 +1,265 @@
+import argparse
+import hashlib
+import json
+import os
+import threading
+import time
+from email.utils import formatdate
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+from src.utils.config import PROJECT_ROOT
+
+FIXTURE_DIR = os.path.join(PROJECT_ROOT, "data", "fixtures")
+RESOURCES = ("users", "posts", "comments", "albums", "todos", "photos")
+PAGING = ("_page", "_limit", "_start", "_end")
+# Nested routes such as /posts/1/comments, resolved to a foreign key filter on the child
+NESTED = {
+    ("users", "posts"): "userId",
+    ("users", "albums"): "userId",
+    ("users", "todos"): "userId",
+    ("posts", "comments"): "postId",
+    ("albums", "photos"): "albumId",
+}
+
+def _slice(items, options):
+    """JSON-server paging: ``_page``/``_limit`` (10 per page by default) or ``_start`` with ``_end``/``_limit``."""
+    try:
+        options = {key: int(value) for key, value in options.items()}
+    except ValueError:
+        return items
+    if "_page" in options:
+        limit = options.get("_limit", 10)
+        start = (max(options["_page"], 1) - 1) * limit
+        return items[start:start + limit]
+    start = options.get("_start", 0)
+    if "_end" in options:
+        return items[start:options["_end"]]
+    if "_limit" in options:
+        return items[start:start + options["_limit"]]
+    return items[start:]
+
+def _text(value):
+    # Query strings only carry text; compare the way JSONPlaceholder does
+    return json.dumps(value) if isinstance(value, bool) or value is None else str(value)
+
+class FixtureStore:
+    """Read-only collections loaded from ``data/fixtures`` with pre-encoded GET bodies.
+
+    Writes are faked like JSONPlaceholder does: the response echoes the
+    request, but nothing is stored.
+    """
+
+    def __init__(self, directory: str = FIXTURE_DIR):
+        self.collections = {}
+        for name in RESOURCES:
+            with open(os.path.join(directory, f"{name}.json")) as f:
+                self.collections[name] = json.load(f)
+        self.by_id = {name: {item["id"]: item for item in items} for name, items in self.collections.items()}
+        self.last_modified = formatdate(time.time(), usegmt=True)
+        # Per-instance memo, so a discarded store is not pinned by a class-level cache
+        self.body = lru_cache(maxsize=4096)(self._body)
+
+    def item(self, name, item_id):
+        try:
+            return self.by_id[name].get(int(item_id))
+        except ValueError:
+            return None
+
+    def _body(self, name, filters=(), item_id=None):
+        """``(body, ETag, total matches or None when unpaged)`` for a GET, or None when the item does not exist."""
+        total = None
+        if item_id is not None:
+            payload = self.item(name, item_id)
+            if payload is None:
+                return None
+        else:
+            wanted, paging = {}, {}
+            for key, value in filters:
+                if key in PAGING:
+                    paging[key] = value
+                elif not key.startswith("_"):
+                    wanted.setdefault(key, set()).add(value)
+            payload = [item for item in self.collections[name]
+                       if all(_text(item.get(key)) in values for key, values in wanted.items())]
+            if paging:
+                total = len(payload)
+                payload = _slice(payload, paging)
+        body = json.dumps(payload, separators=(",", ":")).encode()
+        return body, f'W/"{hashlib.sha1(body).hexdigest()}"', total
+
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, so pooled client connections are reused
+    # Headers and body go out in separate writes; with Nagle on, each response waits ~40ms for a delayed ACK
+    disable_nagle_algorithm = True
+    server_version = "MockJSONPlaceholder"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _route(self):
+        url = urlsplit(self.path)
+        parts = [part for part in url.path.split("/") if part]
+        filters = tuple(sorted(parse_qsl(url.query)))
+        if not parts or parts[0] not in RESOURCES or len(parts) > 3:
+            return None
+        if len(parts) == 3:
+            fk = NESTED.get((parts[0], parts[2]))
+            if fk is None:
+                return None
+            return parts[2], None, tuple(sorted(filters + ((fk, parts[1]),)))
+        return parts[0], parts[1] if len(parts) == 2 else None, filters
+
+    def _read_json(self):
+        """The request body as JSON; None (answered with 400) when Content-Length is not a valid size."""
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            # The body cannot be framed, so the connection cannot be reused
+            self.close_connection = True
+            return None
+        if not length:
+            return {}
+        return json.loads(self.rfile.read(length))
+
+    def _send(self, status, body, headers=None):
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        if not isinstance(body, bytes):
+            body = json.dumps(body, separators=(",", ":")).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        if self.close_connection:
+            self.send_header("Connection", "close")
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def do_GET(self):
+        route = self._route()
+        if route is None:
+            return self._send(404, {})
+        name, item_id, filters = route
+        found = self.server.store.body(name, filters, item_id)
+        if found is None:
+            return self._send(404, {})
+        body, etag, total = found
+        headers = {"ETag": etag, "Last-Modified": self.server.store.last_modified, "Cache-Control": "max-age=43200"}
+        if total is not None:
+            headers["X-Total-Count"] = str(total)
+        if self.headers.get("If-None-Match") == etag:
+            return self._send(304, b"", headers)
+        self._send(200, body, headers)
+
+    do_HEAD = do_GET
+
+    def do_POST(self):
+        route = self._route()
+        if route is None or route[1] is not None:
+            return self._send(404, {})
+        try:
+            data = self._read_json()
+        except ValueError:
+            return self._send(500, {})
+        if not isinstance(data, dict):
+            return self._send(400, {})
+        name = route[0]
+        self._send(201, {**data, "id": len(self.server.store.collections[name]) + 1})
+
+    def do_PUT(self):
+        route = self._route()
+        if route is None or route[1] is None:
+            return self._send(404, {})
+        name, item_id, _ = route
+        try:
+            data = self._read_json()
+        except ValueError:
+            return self._send(500, {})
+        if not isinstance(data, dict):
+            return self._send(400, {})
+        # JSONPlaceholder answers a PUT on an unknown id with a 500
+        if self.server.store.item(name, item_id) is None:
+            return self._send(500, {})
+        self._send(200, {**data, "id": int(item_id)})
+
+    def do_PATCH(self):
+        route = self._route()
+        if route is None or route[1] is None:
+            return self._send(404, {})
+        name, item_id, _ = route
+        try:
+            data = self._read_json()
+        except ValueError:
+            return self._send(500, {})
+        if not isinstance(data, dict):
+            return self._send(400, {})
+        item = self.server.store.item(name, item_id)
+        if item is None:
+            return self._send(404, {})
+        self._send(200, {**item, **data})
+
+    def do_DELETE(self):
+        route = self._route()
+        if route is None or route[1] is None:
+            return self._send(404, {})
+        self._send(200, {})
+
+class MockServer:
+    """Threaded local JSONPlaceholder stand-in, e.g. ``with MockServer() as server: server.url``.
+
+    ``port=0`` picks a free port; ``latency`` adds a fixed delay (seconds) to
+    every response to mimic a remote host.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: float = 0, store: FixtureStore = None):
+        self.httpd = ThreadingHTTPServer((host, port), MockHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.store = store or FixtureStore()
+        self.httpd.latency = latency
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="mock-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._thread is not None:
+            self.httpd.shutdown()
+            self._thread.join()
+            self._thread = None
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the JSONPlaceholder fixtures locally.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency", type=float, default=0, help="seconds added to every response")
+    args = parser.parse_args(argv)
+    server = MockServer(args.host, args.port, args.latency)
+    print(f"Serving {', '.join(RESOURCES)} on {server.url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+if __name__ == "__main__":
+    main()
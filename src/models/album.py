@@ -0,0 +1,17 @@
+from typing import NamedTuple
+
+class Album(NamedTuple):
+    """An /albums item; fields line up with the ``albums`` table columns."""
+
+    id: int
+    userId: int
+    title: str
+
+    COLUMNS = ("id", "userId", "title")
+
+    @classmethod
+    def from_json(cls, item: dict) -> "Album":
+        return cls._make((item["id"], item["userId"], item["title"]))
+
+    def as_row(self) -> tuple:
+        return self
@@ -0,0 +1,19 @@
+from typing import NamedTuple
+
+class Comment(NamedTuple):
+    """A /comments item; fields line up with the ``comments`` table columns."""
+
+    id: int
+    postId: int
+    name: str
+    email: str
+    body: str
+
+    COLUMNS = ("id", "postId", "name", "email", "body")
+
+    @classmethod
+    def from_json(cls, item: dict) -> "Comment":
+        return cls._make((item["id"], item["postId"], item["name"], item["email"], item["body"]))
+
+    def as_row(self) -> tuple:
+        return self
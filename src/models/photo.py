@@ -0,0 +1,19 @@
+from typing import NamedTuple
+
+class Photo(NamedTuple):
+    """A /photos item; fields line up with the ``photos`` table columns."""
+
+    id: int
+    albumId: int
+    title: str
+    url: str
+    thumbnailUrl: str
+
+    COLUMNS = ("id", "albumId", "title", "url", "thumbnailUrl")
+
+    @classmethod
+    def from_json(cls, item: dict) -> "Photo":
+        return cls._make((item["id"], item["albumId"], item["title"], item["url"], item["thumbnailUrl"]))
+
+    def as_row(self) -> tuple:
+        return self
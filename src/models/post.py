@@ -0,0 +1,18 @@
+from typing import NamedTuple
+
+class Post(NamedTuple):
+    """A /posts item; fields line up with the ``posts`` table columns."""
+
+    id: int
+    userId: int
+    title: str
+    body: str
+
+    COLUMNS = ("id", "userId", "title", "body")
+
+    @classmethod
+    def from_json(cls, item: dict) -> "Post":
+        return cls._make((item["id"], item["userId"], item["title"], item["body"]))
+
+    def as_row(self) -> tuple:
+        return self
@@ -0,0 +1,18 @@
+from typing import NamedTuple
+
+class Todo(NamedTuple):
+    """A /todos item; fields line up with the ``todos`` table columns."""
+
+    id: int
+    userId: int
+    title: str
+    completed: bool
+
+    COLUMNS = ("id", "userId", "title", "completed")
+
+    @classmethod
+    def from_json(cls, item: dict) -> "Todo":
+        return cls._make((item["id"], item["userId"], item["title"], item["completed"]))
+
+    def as_row(self) -> tuple:
+        return self
@@ -0,0 +1,24 @@
+from typing import NamedTuple
+
+class User(NamedTuple):
+    """A /users item; the first four fields are the ``users`` table columns, in order."""
+
+    id: int
+    name: str
+    username: str
+    email: str
+    address: dict = None
+    phone: str = None
+    website: str = None
+    company: dict = None
+
+    COLUMNS = ("id", "name", "username", "email")
+
+    @classmethod
+    def from_json(cls, item: dict) -> "User":
+        get = item.get
+        return cls._make((item["id"], item["name"], item["username"], item["email"],
+                          get("address"), get("phone"), get("website"), get("company")))
+
+    def as_row(self) -> tuple:
+        return self[:4]
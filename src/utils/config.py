@@ -0,0 +1,18 @@
+import os
+import yaml
+from functools import lru_cache
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+CONFIG_PATH = os.path.join(PROJECT_ROOT, "config", "config.yaml")
+
+@lru_cache(maxsize=None)
+def load_config(path: str = CONFIG_PATH) -> dict:
+    with open(path) as f:
+        return yaml.safe_load(f) or {}
+
+# Endpoints carry ids, so per-endpoint settings lookups keep only the most recent ones
+RESOLVED_MAX = 1024
+
+def endpoint_memo(resolver):
+    """Bounded LRU memo for a per-endpoint settings resolver; wrap a bound method to keep it per instance."""
+    return lru_cache(maxsize=RESOLVED_MAX)(resolver)
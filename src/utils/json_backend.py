@@ -0,0 +1,28 @@
+import json
+from src.utils.config import load_config
+
+# Fastest installed decoder first; stdlib json is always available
+_BACKENDS = ("orjson", "ujson", "json")
+
+def _load(name: str):
+    if name == "orjson":
+        import orjson
+        return orjson.loads
+    if name == "ujson":
+        import ujson
+        return ujson.loads
+    if name == "json":
+        return json.loads
+    raise ValueError(f"Unknown json_backend: {name}")
+
+def select_backend(preferred: str = "auto"):
+    """Return ``(name, loads)`` for the preferred backend, or the fastest installed one for ``auto``."""
+    candidates = _BACKENDS if preferred == "auto" else (preferred,)
+    for name in candidates:
+        try:
+            return name, _load(name)
+        except ImportError:
+            continue
+    raise ImportError(f"json_backend {preferred!r} is not installed")
+
+BACKEND, loads = select_backend(load_config().get("json_backend", "auto"))
@@ -0,0 +1,74 @@
+import codecs
+import json
+
+_WHITESPACE = " \t\r\n"
+_DELIMITERS = _WHITESPACE + ",]"
+_decoder = json.JSONDecoder()
+
+def iter_json_array(chunks):
+    """Yield the elements of a top-level JSON array from an iterable of byte chunks.
+
+    Only the unparsed tail of the document is buffered, so memory stays
+    proportional to the largest single element rather than the whole array.
+    """
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    chunks = iter(chunks)
+    buf = ""
+    pos = 0
+    eof = False
+
+    def fill():
+        nonlocal buf, pos, eof
+        for chunk in chunks:
+            text = utf8.decode(chunk)
+            if text:
+                buf = buf[pos:] + text
+                pos = 0
+                return True
+        buf = buf[pos:] + utf8.decode(b"", final=True)
+        pos = 0
+        eof = True
+        return False
+
+    def skip_whitespace():
+        nonlocal pos
+        while True:
+            while pos < len(buf) and buf[pos] in _WHITESPACE:
+                pos += 1
+            if pos < len(buf) or eof or not fill():
+                return
+
+    skip_whitespace()
+    if pos >= len(buf) or buf[pos] != "[":
+        raise ValueError("Expected a JSON array")
+    pos += 1
+    first = True
+    need_value = False  # a ',' has been consumed and its element not parsed yet
+    while True:
+        skip_whitespace()
+        if pos >= len(buf):
+            raise ValueError("Unterminated JSON array")
+        if not need_value:
+            if buf[pos] == "]":
+                return
+            if not first:
+                if buf[pos] != ",":
+                    raise ValueError(f"Expected ',' or ']' at offset {pos}")
+                pos += 1
+                need_value = True
+                continue
+        try:
+            item, end = _decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            fill()
+            continue
+        # A value not followed by a delimiter yet (e.g. "12." of "12.5") may continue in the next chunk
+        if not eof and (end >= len(buf) or buf[end] not in _DELIMITERS):
+            fill()
+            continue
+        first = False
+        need_value = False
+        pos = end
+        yield item
@@ -1,4 +1,6 @@
 import logging
+import random
+from src.utils.config import endpoint_memo
 
 def get_logger(name: str = "api_framework"):
     logger = logging.getLogger(name)
@@ -9,3 +11,58 @@ def get_logger(name: str = "api_framework"):
         logger.addHandler(handler)
     logger.setLevel(logging.INFO)
     return logger
+
+class Truncated:
+    """Defers ``str(value)`` and truncation until a handler actually formats the record."""
+
+    __slots__ = ("value", "limit")
+
+    def __init__(self, value, limit: int):
+        self.value = value
+        self.limit = limit
+
+    @property
+    def truncated(self) -> bool:
+        return bool(self.limit) and isinstance(self.value, (str, bytes)) and len(self.value) > self.limit
+
+    def __str__(self):
+        if isinstance(self.value, bytes):
+            # Cut before decoding, so a large body is never decoded whole
+            text = self.value[:self.limit or None].decode("utf-8", errors="replace")
+            return f"{text}... [{len(self.value) - self.limit} more bytes]" if self.truncated else text
+        if isinstance(self.value, dict):
+            text = " | ".join(f"{k}={v}" for k, v in self.value.items())
+        else:
+            text = self.value if isinstance(self.value, str) else str(self.value)
+        if self.limit and len(text) > self.limit:
+            return f"{text[:self.limit]}... [{len(text) - self.limit} more chars]"
+        return text
+
+DEFAULT_BODY_LOGGING = {"log_bodies": True, "attach_bodies": True, "body_max_chars": 2000, "sample_rate": 1.0}
+
+class BodyLogPolicy:
+    """Decides whether a request/response body is logged or attached, and how much of it.
+
+    ``verbs`` and ``endpoints`` hold overrides of the base settings; endpoint keys
+    are path prefixes and the longest matching prefix wins.
+    """
+
+    def __init__(self, settings: dict = None):
+        settings = dict(settings or {})
+        self.verbs = {k.upper(): v for k, v in (settings.pop("verbs", None) or {}).items()}
+        self.endpoints = sorted((settings.pop("endpoints", None) or {}).items(), key=lambda kv: -len(kv[0]))
+        self.base = {**DEFAULT_BODY_LOGGING, **settings}
+        # Per policy, so a replaced policy and everything it resolved can be collected
+        self.resolve = endpoint_memo(self._resolve)
+
+    def _resolve(self, verb: str, endpoint: str) -> dict:
+        settings = {**self.base, **(self.verbs.get(verb) or {})}
+        for prefix, overrides in self.endpoints:
+            if endpoint.startswith(prefix):
+                settings.update(overrides or {})
+                break
+        return settings
+
+    def sampled(self, settings: dict) -> bool:
+        rate = settings["sample_rate"]
+        return rate >= 1 or (rate > 0 and random.random() < rate)
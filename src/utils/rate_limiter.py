@@ -0,0 +1,123 @@
+import time
+from threading import Lock
+from urllib.parse import urlsplit
+from src.utils.config import endpoint_memo
+
+DEFAULT_RATE_LIMIT = {
+    "rate": None,          # requests per second; None = unlimited
+    "burst": 10,
+    "adaptive": True,
+    "min_rate": 1.0,
+    "increase": 0.1,       # requests/second added per successful response
+    "decrease": 0.5,       # rate multiplier on a 429
+}
+
+class TokenBucket:
+    """Thread-safe token bucket refilled at ``rate`` tokens per second, holding at most ``burst``.
+
+    ``acquire`` reserves a token immediately (the balance may go negative) and
+    sleeps off the debt outside the lock, so waiting callers are served in
+    arrival order. With ``adaptive`` on, the rate follows AIMD: halved on a 429,
+    raised by ``increase`` per success, never above the configured rate.
+    """
+
+    def __init__(self, rate: float, burst: int = 10, adaptive: bool = True, min_rate: float = 1.0,
+                 increase: float = 0.1, decrease: float = 0.5):
+        self.max_rate = float(rate)
+        self.rate = float(rate)
+        self.burst = max(1, burst)
+        self.adaptive = adaptive
+        self.min_rate = min(min_rate, self.max_rate)
+        self.increase = increase
+        self.decrease = decrease
+        self.throttled = 0
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = Lock()
+
+    def _refill(self, now):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self) -> float:
+        """Take a token and return how long the caller must wait before using it."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens -= 1
+            return -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+    def acquire(self) -> float:
+        wait = self.reserve()
+        if wait:
+            time.sleep(wait)
+        return wait
+
+    def observe(self, status: int, retry_after: float = None):
+        if status == 429:
+            with self._lock:
+                self.throttled += 1
+                self._refill(time.monotonic())
+                if self.adaptive:
+                    self.rate = max(self.min_rate, self.rate * self.decrease)
+                # Hold everyone off for the server's requested pause, or at least drain the burst
+                self._tokens = min(self._tokens, -(retry_after or 0) * self.rate)
+        elif self.adaptive and self.rate < self.max_rate and status < 400:
+            with self._lock:
+                self._refill(time.monotonic())
+                self.rate = min(self.max_rate, self.rate + self.increase)
+
+class RateLimiter:
+    """Token buckets per host and per endpoint prefix, shared by every client and thread.
+
+    ``hosts`` and ``endpoints`` override the base settings; endpoint keys are
+    path prefixes (longest wins) and get their own bucket per host, on top of
+    the host bucket. Asyncio clients run requests on worker threads, so they
+    block there rather than on the event loop.
+    """
+
+    def __init__(self, settings: dict = None):
+        settings = dict(settings or {})
+        settings.pop("enabled", None)
+        self.hosts = settings.pop("hosts", None) or {}
+        self.endpoints = sorted((settings.pop("endpoints", None) or {}).items(), key=lambda kv: -len(kv[0]))
+        self.base = {**DEFAULT_RATE_LIMIT, **settings}
+        self._buckets = {}
+        self._lock = Lock()
+        # Only a lookup memo; the buckets themselves live in _buckets
+        self.buckets = endpoint_memo(self._resolve)
+
+    def _bucket(self, key, settings):
+        if not settings.get("rate"):
+            return None
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = TokenBucket(**settings)
+        return bucket
+
+    def _resolve(self, base_url: str, endpoint: str) -> tuple:
+        """Buckets a request to ``endpoint`` must pass, most specific last (memoised as ``buckets``)."""
+        host = urlsplit(base_url).netloc
+        host_settings = {**self.base, **(self.hosts.get(host) or self.hosts.get(host.split(":")[0]) or {})}
+        with self._lock:
+            found = [self._bucket(host, host_settings)]
+            for prefix, overrides in self.endpoints:
+                if endpoint.startswith(prefix):
+                    found.append(self._bucket((host, prefix), {**host_settings, **(overrides or {})}))
+                    break
+        return tuple(bucket for bucket in found if bucket is not None)
+
+    def acquire(self, base_url: str, endpoint: str) -> tuple:
+        buckets = self.buckets(base_url, endpoint)
+        for bucket in buckets:
+            bucket.acquire()
+        return buckets
+
+    @staticmethod
+    def observe(buckets, status: int, retry_after: float = None):
+        for bucket in buckets:
+            bucket.observe(status, retry_after)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {key if isinstance(key, str) else "".join(key): {"rate": bucket.rate, "throttled": bucket.throttled}
+                    for key, bucket in self._buckets.items()}
@@ -1,8 +1,14 @@
 import time
 import functools
 from src.utils.logger import get_logger
+from src.utils.retry_policy import TRANSIENT_ERRORS, backoff_delay
 
-def retry(max_retries=3, delay=2):
+def retry(max_retries=3, delay=2, max_delay=30, jitter=True, exceptions=TRANSIENT_ERRORS):
+    """Retry ``func`` on ``exceptions`` with exponential backoff starting at ``delay`` seconds.
+
+    HTTP calls made through BaseClient are retried by its RetryPolicy instead;
+    this is for other flaky operations.
+    """
     def decorator(func):
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
@@ -10,10 +16,10 @@ def retry(max_retries=3, delay=2):
             for attempt in range(1, max_retries + 1):
                 try:
                     return func(*args, **kwargs)
-                except Exception as e:
+                except exceptions as e:
                     logger.warning(f"Attempt {attempt} failed: {e}")
                     if attempt == max_retries:
                         raise
-                    time.sleep(delay)
+                    time.sleep(backoff_delay(attempt, delay, max_delay, jitter))
         return wrapper
     return decorator
@@ -0,0 +1,204 @@
+import random
+import time
+from collections import namedtuple
+from email.utils import parsedate_to_datetime
+from threading import Lock
+import requests
+from src.utils.logger import get_logger
+
+IDEMPOTENT_VERBS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+# Transport failures worth retrying for idempotent verbs; only a connect timeout
+# proves the request never reached the server, so only that is safe for POST/PATCH
+TRANSIENT_ERRORS = (requests.exceptions.ConnectionError, requests.exceptions.Timeout)
+UNSENT_ERRORS = (requests.exceptions.ConnectTimeout,)
+
+DEFAULT_RETRY = {
+    "max_attempts": 3,
+    "backoff_base": 0.2,
+    "backoff_max": 5.0,
+    "jitter": True,
+    "retry_statuses": [429, 502, 503, 504],
+    "retry_after_max": 10.0,
+    "retry_non_idempotent": False,
+    "budget_ratio": 0.2,
+    "budget_min": 10,
+    "breaker_failures": 5,
+    "breaker_reset": 30.0,
+}
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """The host's circuit breaker is open; the request was not sent."""
+
+def backoff_delay(attempt: int, base: float, cap: float, jitter: bool = True) -> float:
+    """Exponential backoff for retry number ``attempt`` (1-based), with full jitter."""
+    delay = min(cap, base * 2 ** (attempt - 1))
+    return random.uniform(0, delay) if jitter else delay
+
+def retry_after_seconds(response):
+    """``Retry-After`` as seconds (delta or HTTP date), or None when absent/unparseable."""
+    value = response.headers.get("Retry-After") if response is not None else None
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+class RetryBudget:
+    """Caps retries at ``ratio`` of requests once ``minimum`` retries of headroom are spent.
+
+    Every request deposits ``ratio`` tokens (up to ``minimum``) and every retry
+    withdraws one, so during an outage retries stop multiplying traffic once
+    the budget runs dry.
+    """
+
+    def __init__(self, ratio: float, minimum: int):
+        self.ratio = ratio
+        self.minimum = minimum
+        self._tokens = float(minimum)
+        self._lock = Lock()
+
+    def deposit(self):
+        with self._lock:
+            self._tokens = min(self._tokens + self.ratio, self.minimum)
+
+    def withdraw(self) -> bool:
+        with self._lock:
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+class CircuitBreaker:
+    """Opens after ``failures`` consecutive retryable failures; after ``reset`` seconds
+    one probe request is let through (half-open) and its outcome closes or reopens it."""
+
+    def __init__(self, failures: int, reset: float):
+        self.failures = failures
+        self.reset = reset
+        self._consecutive = 0
+        self._opened_at = None
+        self._probing = False
+        self._lock = Lock()
+
+    @property
+    def is_open(self) -> bool:
+        return self._opened_at is not None
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if self._probing or time.monotonic() - self._opened_at < self.reset:
+                return False
+            self._probing = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self._consecutive = 0
+            self._opened_at = None
+            self._probing = False
+
+    def release(self):
+        """Give back a probe slot taken by ``allow`` when the outcome says nothing about the host."""
+        with self._lock:
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self._consecutive += 1
+            if self._probing or (self.failures and self._consecutive >= self.failures):
+                self._opened_at = time.monotonic()
+            self._probing = False
+
+HostGuard = namedtuple("HostGuard", "budget breaker")
+
+class RetryPolicy:
+    """Status- and idempotency-aware retries with backoff, a retry budget and a circuit breaker.
+
+    ``call(verb, send, host)`` runs ``send()`` until it returns a response whose
+    status is not retryable, raises a non-retryable error, or attempts, budget
+    or breaker run out. Idempotent verbs retry on ``retry_statuses`` and
+    transport errors; POST/PATCH only when the request provably was not
+    processed (connect timeout, 429) unless ``retry_non_idempotent`` is set.
+    ``Retry-After`` overrides the backoff, capped at ``retry_after_max``.
+    """
+
+    def __init__(self, settings: dict = None):
+        self.settings = {**DEFAULT_RETRY, **(settings or {})}
+        self.retry_statuses = frozenset(self.settings["retry_statuses"])
+        self.logger = get_logger()
+        self._guards = {}
+        self._lock = Lock()
+
+    def guard(self, host: str) -> HostGuard:
+        """Budget and breaker shared by every client of ``host`` (one per pooled session)."""
+        with self._lock:
+            guard = self._guards.get(host)
+            if guard is None:
+                s = self.settings
+                guard = self._guards[host] = HostGuard(
+                    RetryBudget(s["budget_ratio"], s["budget_min"]),
+                    CircuitBreaker(s["breaker_failures"], s["breaker_reset"]),
+                )
+            return guard
+
+    def _idempotent(self, verb: str) -> bool:
+        return verb in IDEMPOTENT_VERBS or self.settings["retry_non_idempotent"]
+
+    def retryable_status(self, verb: str, status: int) -> bool:
+        if status not in self.retry_statuses:
+            return False
+        return status == 429 or self._idempotent(verb)
+
+    def retryable_error(self, verb: str, error: Exception) -> bool:
+        if isinstance(error, CircuitOpenError):
+            return False
+        return isinstance(error, TRANSIENT_ERRORS if self._idempotent(verb) else UNSENT_ERRORS)
+
+    def delay(self, attempt: int, response=None) -> float:
+        retry_after = retry_after_seconds(response)
+        if retry_after is not None:
+            return min(retry_after, self.settings["retry_after_max"])
+        s = self.settings
+        return backoff_delay(attempt, s["backoff_base"], s["backoff_max"], s["jitter"])
+
+    def call(self, verb: str, send, host: str):
+        budget, breaker = self.guard(host)
+        budget.deposit()
+        attempt = 1
+        while True:
+            if not breaker.allow():
+                raise CircuitOpenError(f"Circuit open for {host}; {verb} not sent")
+            response = error = None
+            try:
+                response = send()
+            except Exception as e:
+                if not isinstance(e, TRANSIENT_ERRORS):
+                    breaker.release()
+                    raise
+                error = e
+            failed = error is not None or response.status_code in self.retry_statuses
+            if not failed:
+                breaker.record_success()
+                return response
+            breaker.record_failure()
+            retryable = (self.retryable_error(verb, error) if error is not None
+                         else self.retryable_status(verb, response.status_code))
+            if not retryable or attempt >= self.settings["max_attempts"] or not budget.withdraw():
+                if error is not None:
+                    raise error
+                return response
+            wait = self.delay(attempt, response)
+            if response is not None and response.raw is not None:
+                # Hand a streamed response's connection back before it is dropped
+                response.close()
+            self.logger.warning("%s %s: attempt %d failed (%s), retrying in %.2fs", verb, host, attempt,
+                                error if error is not None else response.status_code, wait)
+            time.sleep(wait)
+            attempt += 1
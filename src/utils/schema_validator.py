@@ -1,11 +1,67 @@
 import json
-from jsonschema import validate, ValidationError
+import os
+import time
+from functools import lru_cache
+from jsonschema import Draft7Validator, ValidationError
+from jsonschema.validators import validator_for
+from src.utils.config import PROJECT_ROOT
+from src.utils.timing import get_timings
 
-def validate_schema(data, schema_path):
+SCHEMA_DIR = os.path.join(PROJECT_ROOT, "data", "schemas")
+
+@lru_cache(maxsize=None)
+def _compile(schema_path: str):
     with open(schema_path) as f:
         schema = json.load(f)
+    cls = validator_for(schema, default=Draft7Validator)
+    cls.check_schema(schema)
+    return cls(schema)
+
+def get_validator(schema):
+    """Compiled validator for a schema file, loaded and checked once per process.
+
+    ``schema`` is a path (``data/schemas/post_schema.json``) or a bare name (``post``).
+    """
+    path = schema if schema.endswith(".json") else os.path.join(SCHEMA_DIR, f"{schema}_schema.json")
+    return _compile(os.path.abspath(path))
+
+def load_schemas():
+    """Warm the registry with every schema in ``data/schemas``."""
+    return {name[:-len("_schema.json")]: get_validator(os.path.join(SCHEMA_DIR, name))
+            for name in sorted(os.listdir(SCHEMA_DIR)) if name.endswith("_schema.json")}
+
+def _record(schema, start):
+    timings = get_timings()
+    if timings is not None:
+        name = os.path.basename(schema)[:-len("_schema.json")] if schema.endswith(".json") else schema
+        timings.record(f"schema {name}", "validate", time.perf_counter() - start)
+
+def validate_schema(data, schema_path):
+    start = time.perf_counter()
     try:
-        validate(instance=data, schema=schema)
+        get_validator(schema_path).validate(data)
     except ValidationError as e:
         raise AssertionError(f"Schema validation error: {e.message}")
-    
\ No newline at end of file
+    _record(schema_path, start)
+
+def validate_many(items, schema_path):
+    """Validate a whole list in one call and report every failing item with its index."""
+    start = time.perf_counter()
+    validator = get_validator(schema_path)
+    failures = []
+    for index, item in enumerate(items):
+        if not validator.is_valid(item):
+            messages = "; ".join(sorted(e.message for e in validator.iter_errors(item)))
+            failures.append(f"[{index}] {messages}")
+    if failures:
+        raise AssertionError(f"Schema validation errors ({len(failures)}/{len(items)} items):\n" + "\n".join(failures))
+    _record(schema_path, start)
+
+def iter_validated(items, schema_path):
+    """Pass items through one at a time, failing on the first invalid one (for streamed collections)."""
+    validator = get_validator(schema_path)
+    for index, item in enumerate(items):
+        if not validator.is_valid(item):
+            messages = "; ".join(sorted(e.message for e in validator.iter_errors(item)))
+            raise AssertionError(f"Schema validation error at item {index}: {messages}")
+        yield item
@@ -0,0 +1,197 @@
+import json
+import os
+import re
+import time
+from functools import lru_cache
+from threading import Lock
+from src.utils.config import PROJECT_ROOT, load_config
+
+PERCENTILES = (50, 95, 99)
+SUB_BUCKET_BITS = 7  # 64 linear sub-buckets per power of two: values within ~1.6%
+
+class LatencyHistogram:
+    """HDR-style log-linear histogram of durations, stored in integer microseconds.
+
+    Values below 128us are exact; above that every power-of-two range is split
+    into 64 sub-buckets, so any percentile is within ~1.6% of the true value
+    while memory stays a few hundred sparse counters however many samples
+    arrive. Histograms serialize to plain dicts and merge by adding counts.
+    """
+
+    __slots__ = ("counts", "count", "total", "min", "max")
+
+    def __init__(self):
+        self.counts = {}
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = 0
+
+    @staticmethod
+    def bucket(value: int) -> int:
+        shift = value.bit_length() - SUB_BUCKET_BITS
+        if shift <= 0:
+            return value
+        return (shift << (SUB_BUCKET_BITS - 1)) + (value >> shift)
+
+    @staticmethod
+    def bucket_value(index: int) -> int:
+        """Midpoint of a bucket, in microseconds."""
+        half = 1 << (SUB_BUCKET_BITS - 1)
+        if index < 2 * half:
+            return index
+        shift = index // half - 1
+        return ((index - shift * half) << shift) + (1 << shift) // 2
+
+    def record(self, seconds: float):
+        value = max(0, int(seconds * 1_000_000))
+        index = self.bucket(value)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = max(self.max, value)
+
+    def percentile(self, q: float) -> float:
+        """Value at percentile ``q`` (0-100), in seconds."""
+        if not self.count:
+            return 0.0
+        rank = max(1, -(-self.count * q // 100))
+        if rank >= self.count:
+            return self.max / 1_000_000
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                value = min(max(self.bucket_value(index), self.min), self.max)
+                return value / 1_000_000
+        return self.max / 1_000_000
+
+    def summary(self) -> dict:
+        result = {"count": self.count, "mean": self.total / self.count / 1_000_000 if self.count else 0.0}
+        result.update((f"p{q}", self.percentile(q)) for q in PERCENTILES)
+        result["max"] = self.max / 1_000_000
+        return result
+
+    def merge(self, other: "LatencyHistogram"):
+        for index, n in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + n
+        self.count += other.count
+        self.total += other.total
+        if other.min is not None:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def to_dict(self) -> dict:
+        return {"counts": self.counts, "count": self.count, "total": self.total, "min": self.min, "max": self.max}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "LatencyHistogram":
+        histogram = cls()
+        histogram.counts = {int(k): v for k, v in data["counts"].items()}
+        histogram.count, histogram.total = data["count"], data["total"]
+        histogram.min, histogram.max = data["min"], data["max"]
+        return histogram
+
+_ID_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
+@lru_cache(maxsize=1024)
+def _route(endpoint: str) -> str:
+    return _ID_SEGMENT.sub("/{id}", endpoint)
+
+def endpoint_key(verb: str, endpoint: str, params=None) -> str:
+    """Histogram key with ids folded, e.g. ``GET /posts/{id}`` or ``GET /comments?postId``."""
+    key = f"{verb} {_route(endpoint)}"
+    if params:
+        key += "?" + "&".join(sorted(str(name) for name, value in dict(params).items() if value is not None))
+    return key
+
+class Timings:
+    """Thread-safe ``{key: {phase: LatencyHistogram}}`` registry."""
+
+    def __init__(self):
+        self.histograms = {}
+        self._lock = Lock()
+
+    def record(self, key: str, phase: str, seconds: float):
+        with self._lock:
+            phases = self.histograms.get(key)
+            if phases is None:
+                phases = self.histograms[key] = {}
+            histogram = phases.get(phase)
+            if histogram is None:
+                histogram = phases[phase] = LatencyHistogram()
+            histogram.record(seconds)
+
+    def merge(self, data: dict):
+        with self._lock:
+            for key, phases in data.items():
+                for phase, raw in phases.items():
+                    incoming = raw if isinstance(raw, LatencyHistogram) else LatencyHistogram.from_dict(raw)
+                    current = self.histograms.setdefault(key, {}).get(phase)
+                    if current is None:
+                        self.histograms[key][phase] = current = LatencyHistogram()
+                    current.merge(incoming)
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            return {key: {phase: h.to_dict() for phase, h in phases.items()} for key, phases in self.histograms.items()}
+
+    def summary(self) -> dict:
+        with self._lock:
+            return {key: {phase: h.summary() for phase, h in sorted(phases.items())}
+                    for key, phases in sorted(self.histograms.items())}
+
+DEFAULT_TIMING = {
+    "enabled": True, "output": ".cache/timings.json", "history": ".cache/timings-history.jsonl", "history_max_runs": 500,
+    "summary_top": 10,
+}
+
+def timing_settings() -> dict:
+    settings = {**DEFAULT_TIMING, **(load_config().get("timing") or {})}
+    for name in ("output", "history"):
+        if settings[name]:
+            settings[name] = os.path.join(PROJECT_ROOT, settings[name])
+    return settings
+
+def write_report(timings: Timings, settings: dict = None) -> dict:
+    """Write this run's summary and raw histograms, and append the summary to the history file.
+
+    The history keeps the latest ``history_max_runs`` runs (0 = unbounded).
+    """
+    settings = settings or timing_settings()
+    report = {"created": time.time(), "summary": timings.summary(), "histograms": timings.to_dict()}
+    os.makedirs(os.path.dirname(settings["output"]), exist_ok=True)
+    with open(settings["output"], "w") as f:
+        json.dump(report, f, indent=1)
+    if settings["history"]:
+        _append_history(settings["history"], {"created": report["created"], "summary": report["summary"]},
+                        settings.get("history_max_runs"))
+    return report
+
+def _append_history(path: str, entry: dict, max_runs: int = None):
+    with open(path, "a+") as f:
+        f.write(json.dumps(entry) + "\n")
+        if not max_runs:
+            return
+        f.seek(0)
+        lines = f.readlines()
+    if len(lines) > max_runs:
+        # Rewrite beside the file and swap it in, so a crash never leaves a half-written history
+        partial = path + ".tmp"
+        with open(partial, "w") as f:
+            f.writelines(lines[-max_runs:])
+        os.replace(partial, path)
+
+_timings = None
+_timings_lock = Lock()
+
+def get_timings():
+    """Process-wide Timings, or None when disabled in the ``timing`` config section."""
+    global _timings
+    with _timings_lock:
+        if _timings is None:
+            if not timing_settings()["enabled"]:
+                return None
+            _timings = Timings()
+        return _timings
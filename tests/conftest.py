@@ -1,21 +1,107 @@
+import os
 import pytest
 from db.sqlite_client import SQLiteClient
-from src.api.base_client import BaseClient
-import yaml
+from db.integrity import RELATIONS, check_relations, collections_for
+from src.api.base_client import BaseClient, close_sessions
+from src.api.cache import get_cache
+from src.api.cassette import Cassette, set_cassette
+from src.api.snapshot import COLLECTIONS, DataSnapshot
+from src.mock_server import MockServer
+from src.utils.config import PROJECT_ROOT, load_config
+from src.utils.timing import get_timings, timing_settings, write_report
+
+def pytest_addoption(parser):
+    parser.addoption("--mock-server", action="store_true", default=False,
+                     help="run against a local JSONPlaceholder stand-in seeded from data/fixtures")
+    parser.addoption("--cassette", choices=("record", "replay"), default=None,
+                     help="record HTTP traffic to, or replay it from, the cassette in config.yaml")
+    parser.addoption("--cassette-path", default=None, help="cassette path without extension")
+
+def pytest_configure(config):
+    mode = config.getoption("--cassette")
+    if mode:
+        path = config.getoption("--cassette-path") or load_config()["cassette"]["path"]
+        set_cassette(Cassette(os.path.join(PROJECT_ROOT, path), mode))
+
+def pytest_unconfigure(config):
+    if config.getoption("--cassette"):
+        set_cassette(None)
 
 @pytest.fixture(scope="session")
 def config():
-    with open("config/config.yaml") as f:
-        return yaml.safe_load(f)
+    return load_config()
 
 @pytest.fixture(scope="session")
 def db():
-    return SQLiteClient()
+    client = SQLiteClient()
+    yield client
+    client.close()
 
 @pytest.fixture(scope="session")
-def base_url(config):
-    return config["base_url"]
+def base_url(request, config):
+    if not request.config.getoption("--mock-server"):
+        yield config["base_url"]
+        return
+    with MockServer() as server:
+        yield server.url
 
 @pytest.fixture(scope="session")
 def api_client(base_url):
-    return BaseClient(base_url)
+    yield BaseClient(base_url)
+    close_sessions()
+
+# Relations among the snapshot collections; photos.albumId needs the 5000 /photos rows and is checked apart
+SNAPSHOT_RELATIONS = tuple(r for r in RELATIONS if r.child in COLLECTIONS and r.parent in COLLECTIONS)
+PHOTO_RELATIONS = tuple(r for r in RELATIONS if r not in SNAPSHOT_RELATIONS)
+
+@pytest.fixture(scope="session")
+def snapshot(base_url):
+    """Every collection but /photos fetched and validated once per run, shared by xdist workers, as model records."""
+    return DataSnapshot.load_shared(base_url, COLLECTIONS, typed=True)
+
+@pytest.fixture(scope="session")
+def integrity_reports(snapshot):
+    """The relations between snapshot collections checked once per session."""
+    return check_relations(snapshot.collections, SNAPSHOT_RELATIONS)
+
+@pytest.fixture(scope="session")
+def photo_integrity_reports(base_url):
+    """The /photos relations, so only the tests that ask for them download the photos."""
+    photos = DataSnapshot.load_shared(base_url, collections_for(PHOTO_RELATIONS), typed=True)
+    return check_relations(photos.collections, PHOTO_RELATIONS)
+
+def pytest_sessionfinish(session):
+    # xdist workers hand their histograms to the controller, which reports for the whole run
+    timings = get_timings()
+    workeroutput = getattr(session.config, "workeroutput", None)
+    if timings is not None and workeroutput is not None:
+        workeroutput["timings"] = timings.to_dict()
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    timings = get_timings()
+    data = getattr(node, "workeroutput", {}).get("timings")
+    if timings is not None and data:
+        timings.merge(data)
+
+def pytest_terminal_summary(terminalreporter):
+    cache = get_cache()
+    if cache is not None:
+        stats = cache.stats()
+        terminalreporter.write_line(
+            f"response cache: {stats['hits']} hits, {stats['misses']} misses, "
+            f"{stats['revalidated']} revalidated (304), "
+            f"{stats['size']} entries, hit ratio {stats['hit_ratio']:.0%}"
+        )
+    timings = get_timings()
+    if timings is not None and timings.histograms:
+        settings = timing_settings()
+        summary = write_report(timings, settings)["summary"]
+        slowest = sorted(((key, phases["total"]) for key, phases in summary.items() if "total" in phases),
+                         key=lambda item: -item[1]["p95"])[:settings["summary_top"]]
+        terminalreporter.write_line(f"request latency, p50 / p95 / p99 total (full report: {settings['output']}):")
+        for key, stats in slowest:
+            terminalreporter.write_line(
+                f"  {key:<40} {stats['p50'] * 1000:8.1f} / {stats['p95'] * 1000:8.1f} / "
+                f"{stats['p99'] * 1000:8.1f} ms  (n={stats['count']})"
+            )
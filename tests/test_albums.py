@@ -1,7 +1,7 @@
 import pytest
 from src.api.albums_api import AlbumsAPI
-from src.api.users_api import UsersAPI
-from src.utils.schema_validator import validate_schema
+from src.utils.schema_validator import validate_schema, validate_many
+from src.models.album import Album
 
 @pytest.mark.contract
 def test_get_albums_contract(api_client, db):
@@ -13,31 +13,25 @@ def test_get_albums_contract(api_client, db):
     albums = resp.json()
     for album in albums:
         validate_schema(album, "data/schemas/album_schema.json")
-        db.insert("albums", {k: album[k] for k in ("id", "userId", "title")})
+    db.insert_many("albums", [Album.from_json(album) for album in albums], upsert=True)
     db_albums = db.fetchall("albums")
     assert len(db_albums) == len(albums)
 
 @pytest.mark.contract
-def test_get_albums_by_userid_validations(api_client, db):
+def test_get_albums_by_userid_validations(api_client, db, snapshot):
     albums_api = AlbumsAPI(api_client.base_url)
-    users_api = UsersAPI(api_client.base_url)
-    users = users_api.get_users().json()
-    for user in users:
-        user_id = user["id"]
-        resp = albums_api.get_albums_by_user(user_id)
+    users = snapshot.users
+    responses = albums_api.get_albums_by_users([user.id for user in users])
+    for user, resp in zip(users, responses):
+        user_id = user.id
         assert resp.status_code == 200
         assert resp.elapsed.total_seconds() < 16
         albums = resp.json()
+        validate_many(albums, "data/schemas/album_schema.json")
         for album in albums:
-            validate_schema(album, "data/schemas/album_schema.json")
             assert album["userId"] == user_id
 
 @pytest.mark.crossapi
-def test_album_user_relationship(api_client):
-    users_api = UsersAPI(api_client.base_url)
-    albums_api = AlbumsAPI(api_client.base_url)
-    users = users_api.get_users().json()
-    albums = albums_api.get_albums().json()
-    user_ids = {u["id"] for u in users}
-    for album in albums:
-        assert album["userId"] in user_ids
+def test_album_user_relationship(integrity_reports):
+    report = integrity_reports["albums.userId"]
+    assert not report.orphans, f"Albums with unknown userId: {report.orphans}"
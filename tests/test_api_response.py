@@ -0,0 +1,36 @@
+import pytest
+import requests
+from src.api.response import ApiResponse
+from src.utils import json_backend
+
+def make_raw(body: bytes, status_code=200):
+    raw = requests.Response()
+    raw.status_code = status_code
+    raw._content = body
+    return raw
+
+def test_json_is_decoded_once(monkeypatch):
+    calls = []
+    real_loads = json_backend.loads
+    monkeypatch.setattr(json_backend, "loads", lambda content: calls.append(content) or real_loads(content))
+    resp = ApiResponse(make_raw(b'[{"id": 1}, {"id": 2}]'))
+    assert resp.json() == [{"id": 1}, {"id": 2}]
+    assert resp.json() is resp.json()
+    assert len(calls) == 1
+    assert resp.status_code == 200
+
+def test_invalid_json_raises_requests_error():
+    resp = ApiResponse(make_raw(b"<html>", status_code=404))
+    with pytest.raises(requests.exceptions.JSONDecodeError):
+        resp.json()
+    assert not resp
+
+def test_special_methods_follow_the_wrapped_response():
+    raw = make_raw(b'[{"id": 1}]')
+    raw._content_consumed = True
+    resp = ApiResponse(raw)
+    assert resp and not ApiResponse(make_raw(b"", status_code=500))
+    assert b"".join(resp) == b'[{"id": 1}]'
+    with resp as entered:
+        assert entered is resp
+    assert not isinstance(resp, requests.Response) and isinstance(resp.raw, requests.Response)
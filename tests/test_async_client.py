@@ -0,0 +1,82 @@
+import asyncio
+import threading
+import time
+from datetime import timedelta
+import pytest
+import requests
+from requests.adapters import BaseAdapter
+from src.api.async_client import AsyncBaseClient, async_api
+from src.api.cache import MemoryBackend, ResponseCache
+from src.api.posts_api import PostsAPI
+from src.mock_server import MockServer
+from src.utils.retry_policy import RetryPolicy
+
+class SlowAdapter(BaseAdapter):
+    """Holds every request for ``delay`` seconds and tracks how many are in flight at once."""
+
+    def __init__(self, delay=0.05):
+        super().__init__()
+        self.delay = delay
+        self.in_flight = self.peak = 0
+        self._lock = threading.Lock()
+
+    def send(self, request, **kwargs):
+        with self._lock:
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        time.sleep(self.delay)
+        with self._lock:
+            self.in_flight -= 1
+        response = requests.Response()
+        response.status_code = 200
+        response._content = b"{}"
+        response.url = request.url
+        response.elapsed = timedelta(seconds=self.delay)
+        return response
+
+    def close(self):
+        pass
+
+@pytest.fixture
+def slow_client():
+    client = AsyncBaseClient("http://slow.invalid", concurrency=4)
+    adapter = SlowAdapter()
+    client.session.mount("http://slow.invalid", adapter)
+    yield client, adapter
+    client.close()
+
+@pytest.mark.parametrize("concurrency, peak", [(None, 4), (2, 2)])
+def test_gather_many_bounds_requests_in_flight(slow_client, concurrency, peak):
+    client, adapter = slow_client
+    responses = asyncio.run(client.gather_many([f"/posts/{i}" for i in range(12)], concurrency))
+    assert len(responses) == 12
+    assert adapter.peak == peak
+
+def test_concurrency_above_the_worker_pool_is_rejected(slow_client):
+    client, _ = slow_client
+    with pytest.raises(ValueError):
+        asyncio.run(client.gather_many(["/posts/1"], concurrency=8))
+
+def test_paging_and_streaming_are_async_iterators():
+    async def collect(iterator):
+        return [item async for item in iterator]
+
+    with MockServer() as server:
+        api = async_api(PostsAPI)(server.url)
+        try:
+            assert len(asyncio.run(collect(api.iter_posts(page_size=30)))) == 100
+            assert asyncio.run(collect(api.stream_posts())) == asyncio.run(api.get_posts()).json()
+        finally:
+            api.close()
+
+def test_transport_options_reach_the_base_client():
+    cache, policy = ResponseCache(MemoryBackend(16)), RetryPolicy()
+    with MockServer() as server:
+        api = async_api(PostsAPI)(server.url, cache=cache, retry_policy=policy, concurrency=2)
+        try:
+            assert api.cache is cache and api.retry_policy is policy and api.concurrency == 2
+            asyncio.run(api.get_posts())
+            asyncio.run(api.get_posts())
+            assert cache.stats()["hits"] == 1
+        finally:
+            api.close()
@@ -0,0 +1,36 @@
+import pytest
+from src.bench import LoadRun, format_report, parse_mix
+from src.mock_server import MockServer
+
+@pytest.fixture(scope="module")
+def server():
+    with MockServer() as server:
+        yield server
+
+def test_closed_loop_reports_throughput_and_percentiles(server):
+    report = LoadRun(server.url, {"get_post": 3, "create_post": 1}, concurrency=4, duration=0.5).run()
+    overall = report["overall"]
+    assert overall["requests"] > 0
+    assert overall["error_rate"] == 0
+    assert 0 < overall["p50"] <= overall["p95"] <= overall["p99"] <= overall["max"]
+    assert sum(op["requests"] for op in report["operations"].values()) == overall["requests"]
+    assert "overall" in format_report(report)
+
+def test_open_loop_issues_the_offered_rate(server):
+    report = LoadRun(server.url, {"get_user": 1}, concurrency=4, duration=0.5, mode="open", rate=40).run()
+    assert report["operations"]["get_user"]["requests"] == 20
+
+def test_successful_writes_report_no_errors(server):
+    report = LoadRun(server.url, {"update_post": 1}, concurrency=1, duration=0.2, seed=1).run()
+    assert report["overall"]["error_rate"] == 0
+
+def test_errors_are_counted():
+    report = LoadRun("http://127.0.0.1:9", {"get_user": 1}, concurrency=1, duration=0.2).run()
+    assert report["overall"]["error_rate"] == 1
+
+def test_scenario_validation():
+    assert parse_mix("get_post=5,create_post") == {"get_post": 5.0, "create_post": 1.0}
+    with pytest.raises(ValueError):
+        LoadRun("http://unused", {"get_everything": 1})
+    with pytest.raises(ValueError):
+        LoadRun("http://unused", {"get_post": 1}, mode="open")
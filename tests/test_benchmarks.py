@@ -0,0 +1,91 @@
+import json
+import threading
+import pytest
+from benchmarks import harness
+from benchmarks.harness import compare, load_baselines, load_cases, main, measure, save_baselines
+
+BENCHMARKS = load_cases()
+
+def test_measure_reports_per_operation_time():
+    result = measure(lambda: sum(range(100)), per=100, rounds=3, min_time=0.001)
+    assert result["loops"] >= 1 and result["rounds"] == 3
+    assert 0 < result["min"] <= result["median"]
+    calls = []
+    result = measure(lambda: calls.append(1), setup=calls.clear, rounds=4)
+    assert result["loops"] == 1 and calls == [1]
+
+def test_record_derives_threshold_from_spread(monkeypatch):
+    medians = iter([10e-6, 5e-6, 10e-6, 20e-6, 5.2e-6, 10.5e-6, 30e-6, 5.1e-6, 11.5e-6])
+    monkeypatch.setattr(harness, "run_isolated", lambda names, *args: {
+        name: {"median": next(medians), "min": 4e-6, "reference": 1.0} for name in names})
+    entries = harness.record(["noisy", "quiet", "middling"], runs=3)
+    # Runs are drawn one process at a time: noisy gets 10, 20, 30; quiet 5, 5.2, 5.1; middling 10, 10.5, 11.5
+    assert entries["noisy"]["median_us"] == 20.0 and entries["noisy"]["min_us"] == 4.0
+    assert entries["middling"]["threshold"] == round(2 * (11.5 / 10 - 1), 4)
+    assert entries["quiet"]["threshold"] == harness.MIN_THRESHOLD
+    # A noisy recording cannot widen the gate into uselessness
+    assert entries["noisy"]["spread"] == 2.0 and entries["noisy"]["threshold"] == harness.MAX_THRESHOLD
+    # From five runs on, one outlying process is left out of the spread
+    medians = iter([10e-6, 10.5e-6, 30e-6, 10.2e-6, 10.4e-6])
+    assert harness.record(["quiet"], runs=5)["quiet"]["spread"] == round(10.5 / 10.2 - 1, 4)
+
+def test_compare_gates_on_recorded_threshold(tmp_path):
+    path = str(tmp_path / "baselines.json")
+    save_baselines({"a": {"median_us": 10.0, "min_us": 9.0, "spread": 0.01, "threshold": 0.25},
+                    "b": {"median_us": 10.0, "min_us": 9.0, "spread": 0.5, "threshold": 1.0}}, path)
+    baselines = load_baselines(path)
+    verdicts = compare({"a": {"median": 13e-6}, "b": {"median": 13e-6}, "c": {"median": 1e-6}}, baselines)
+    assert verdicts["a"][2] == "REGRESSED"
+    assert verdicts["b"][2] == "ok"
+    assert verdicts["c"] == (None, None, "new")
+    assert compare({"a": {"median": 7e-6}}, baselines)["a"][2] == "faster"
+    assert compare({"a": {"median": 13e-6}}, baselines, min_threshold=0.5)["a"][2] == "ok"
+    # b was recorded with +100% allowed; the cap still holds it to +50%
+    assert compare({"b": {"median": 16e-6}}, baselines)["b"][2] == "REGRESSED"
+
+def test_compare_cancels_machine_wide_slowdowns():
+    baselines = {"benchmarks": {"a": {"median_us": 10.0, "relative": 5.0, "threshold": 0.25}}}
+    # Twice as slow, but so was the reference workload timed alongside it
+    assert compare({"a": {"median": 20e-6, "reference": 4e-6}}, baselines)["a"][2] == "ok"
+    assert compare({"a": {"median": 20e-6, "reference": 2e-6}}, baselines)["a"][2] == "REGRESSED"
+    assert 0 < harness.reference() < 0.01
+
+@pytest.mark.parametrize("name", sorted(BENCHMARKS))
+def test_benchmark_cases_run(name):
+    threads = threading.active_count()
+    with harness.prepared(name) as (func, setup):
+        if setup is not None:
+            setup()
+        func()
+    # Whatever a case opened (a private SQLite writer thread) is released again
+    assert threading.active_count() == threads
+
+def _skewed_baselines(path, factor):
+    baselines = load_baselines(path)
+    entry = baselines["benchmarks"]["retry.wrapped_call"]
+    # Recording under a loaded test run can see any spread; pin the threshold so only the skew decides
+    entry["median_us"] /= factor
+    entry["relative"] /= factor
+    entry["threshold"] = 0.25
+    with open(path, "w") as f:
+        json.dump(baselines, f)
+
+def test_main_fails_on_reproduced_regression(tmp_path, capsys):
+    path = str(tmp_path / "baselines.json")
+    args = ["-k", "retry", "--rounds", "2", "--min-time", "0.001", "--baselines", path]
+    assert main(args + ["--save", "--record-runs", "2"]) == 0
+    assert set(load_baselines(path)["benchmarks"]["retry.wrapped_call"]) == {"median_us", "relative", "min_us", "spread", "threshold"}
+    _skewed_baselines(path, 100)
+    assert main(args + ["--confirm-runs", "1"]) == 1
+    assert "regressed beyond their threshold on every run" in capsys.readouterr().out
+
+def test_main_passes_when_regression_does_not_reproduce(tmp_path, monkeypatch, capsys):
+    path = str(tmp_path / "baselines.json")
+    save_baselines({"retry.wrapped_call": {"median_us": 1.0, "min_us": 1.0, "spread": 0.0, "threshold": 0.25}}, path)
+    reruns = []
+    monkeypatch.setattr(harness, "run", lambda names, *args: {name: {"median": 5e-6, "min": 5e-6} for name in names})
+    monkeypatch.setattr(harness, "run_isolated", lambda names, *args: reruns.append(names) or {
+        name: {"median": 1e-6, "min": 1e-6} for name in names})
+    assert main(["-k", "retry", "--baselines", path]) == 0
+    assert reruns == [["retry.wrapped_call"]]
+    assert "Re-running 1 regressed" in capsys.readouterr().out
@@ -0,0 +1,50 @@
+import os
+import pytest
+from src.api.base_client import BaseClient
+from src.api.cassette import Cassette, CassetteMiss, fingerprint
+from src.api.posts_api import PostsAPI
+from src.mock_server import MockServer
+
+def test_fingerprint_ignores_param_order_and_host():
+    assert fingerprint("GET", "/comments", {"postId": 1, "_limit": 5}) == \
+        fingerprint("GET", "/comments", {"_limit": 5, "postId": 1}) == "GET /comments?_limit=5&postId=1"
+    assert fingerprint("POST", "/posts", json_body={"a": 1, "b": 2}) == fingerprint("POST", "/posts", json_body={"b": 2, "a": 1})
+    assert fingerprint("POST", "/posts", json_body={"a": 1}) != fingerprint("POST", "/posts", json_body={"a": 2})
+
+def record(path):
+    cassette = Cassette(path, "record")
+    with MockServer() as server:
+        posts_api = PostsAPI(server.url, cassette=cassette)
+        live = [posts_api.get_posts_by_user(1).json(), posts_api.create_post({"title": "t"}).json(),
+                list(posts_api.stream_posts())]
+    cassette.close()
+    return live
+
+def test_replay_serves_recorded_traffic_without_network(tmp_path):
+    path = str(tmp_path / "posts")
+    live = record(path)
+    cassette = Cassette(path, "replay")
+    # Nothing listens on this host; every response must come from the cassette
+    posts_api = PostsAPI("http://127.0.0.1:9", cassette=cassette)
+    resp = posts_api.get_posts_by_user(1)
+    assert resp.status_code == 200
+    assert resp.json() == live[0]
+    assert posts_api.create_post({"title": "t"}).json() == live[1]
+    assert list(posts_api.stream_posts()) == live[2]
+    with pytest.raises(CassetteMiss):
+        cassette.play(fingerprint("GET", "/posts/1"))
+    # Even with the host's circuit open, replay is served
+    breaker = posts_api.retry_policy.guard(posts_api.base_url).breaker
+    for _ in range(breaker.failures):
+        breaker.record_failure()
+    assert posts_api.get_posts_by_user(1).json() == live[0]
+    cassette.close()
+
+def test_replay_rebuilds_missing_index(tmp_path):
+    path = str(tmp_path / "posts")
+    live = record(path)
+    os.remove(f"{path}.idx.json")
+    cassette = Cassette(path, "replay")
+    assert len(cassette) == 3
+    assert BaseClient("http://127.0.0.1:9", cassette=cassette).get("/posts", params={"userId": 1}).json() == live[0]
+    cassette.close()
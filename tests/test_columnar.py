@@ -0,0 +1,46 @@
+import pytest
+from db.columnar import ArrayBackend, ColumnarTable, select_backend
+
+USERS = [{"id": 1, "name": "a", "address": {"city": "x"}}, {"id": 2, "name": "b", "address": {"city": "y"}}]
+TODOS = [
+    {"id": 1, "userId": 1, "title": "t", "completed": True},
+    {"id": 2, "userId": 1, "title": "t", "completed": False},
+    {"id": 3, "userId": 2, "title": "u", "completed": True},
+    {"id": 4, "userId": 9, "title": "u", "completed": True},
+]
+
+@pytest.fixture(params=["array", "numpy"])
+def backend(request):
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    return select_backend(request.param)
+
+def test_columns_are_packed_and_strings_shared(backend):
+    # Equal titles decoded as separate objects, like a JSON body yields them
+    items = [dict(todo, title=" ".join(["task", todo["title"]])) for todo in TODOS]
+    assert items[0]["title"] is not items[1]["title"]
+    todos = ColumnarTable.from_items("todos", items, backend=backend)
+    assert len(todos) == 4
+    assert todos.tolist("id") == [1, 2, 3, 4]
+    assert todos["title"][0] is todos["title"][1]
+    if isinstance(backend, ArrayBackend):
+        assert todos["id"].typecode == "q" and todos["completed"].typecode == "b"
+    users = ColumnarTable.from_items("users", USERS, backend=backend)
+    assert set(users.columns) == {"id", "name"}
+
+def test_group_counts_filters_and_joins(backend):
+    todos = ColumnarTable.from_items("todos", TODOS, backend=backend)
+    users = ColumnarTable.from_items("users", USERS, backend=backend)
+    assert todos.count_by("completed") == {True: 3, False: 1}
+    assert todos.count_by("userId") == {1: 2, 2: 1, 9: 1}
+    assert todos.where(completed=True, userId=1).tolist("id") == [1]
+    assert todos.where(completed=True).count_by("userId") == {1: 1, 2: 1, 9: 1}
+    assert todos.anti_join(users, "userId").tolist("id") == [4]
+    assert todos.semi_join(users, "userId").tolist("id") == [1, 2, 3]
+    joined = todos.join(users, "userId")
+    assert joined.rows("id", "users.name") == [(1, "a"), (2, "a"), (3, "b")]
+    assert len(todos.where(userId=42)) == 0
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        select_backend("pandas")
@@ -1,9 +1,11 @@
 import pytest
 import json
+import asyncio
+from src.api.async_client import async_api
 from src.api.comments_api import CommentsAPI
-from src.api.posts_api import PostsAPI
-from src.utils.schema_validator import validate_schema
+from src.utils.schema_validator import validate_schema, validate_many
 from src.utils.email_validator import is_valid_email
+from src.models.comment import Comment
 
 def load_comment_crud_data():
     with open("data/testdata/comment_crud.json") as f:
@@ -24,42 +26,42 @@ def test_get_comments_contract(api_client, db):
     for comment in comments:
         validate_schema(comment, "data/schemas/comment_schema.json")
         assert is_valid_email(comment["email"])
-        db.insert("comments", {k: comment[k] for k in ("id", "postId", "name", "email", "body")})
+    db.insert_many("comments", [Comment.from_json(comment) for comment in comments], upsert=True)
     db_comments = db.fetchall("comments")
     assert len(db_comments) == len(comments)
 
 @pytest.mark.contract
-def test_get_comments_by_postid_validations(api_client, db):
-    posts_api = PostsAPI(api_client.base_url)
-    comments_api = CommentsAPI(api_client.base_url)
-    posts = posts_api.get_posts().json()
-    for post in posts:
-        post_id = post["id"]
-        resp = comments_api.get_comments_by_post(post_id)
+def test_get_comments_by_postid_validations(api_client, db, snapshot):
+    posts = snapshot.posts
+    # Seed the (possibly worker-shared) DB once instead of relying on the contract test running first
+    db.populate_once("comments", lambda: snapshot.comments)
+    # Fan out the per-post calls on the async transport instead of 100 serial round trips
+    async_comments_api = async_api(CommentsAPI)(api_client.base_url)
+    try:
+        responses = asyncio.run(async_comments_api.gather_many([("/comments", {"postId": post.id}) for post in posts]))
+    finally:
+        async_comments_api.close()
+    for post, resp in zip(posts, responses):
+        post_id = post.id
         assert resp.status_code == 200
         assert resp.elapsed.total_seconds() < 12
         comments = resp.json()
+        validate_many(comments, "data/schemas/comment_schema.json")
+        db_comments = {row[0]: row for row in db.fetch_where("comments", postId=post_id)}
         for comment in comments:
-            validate_schema(comment, "data/schemas/comment_schema.json")
             assert is_valid_email(comment["email"])
             assert comment["postId"] == post_id
-            # DB validation (if already inserted)
-            db_comment = [row for row in db.fetchall("comments") if row[0] == comment["id"]]
-            if db_comment:
-                db_comment = db_comment[0]
-                assert comment["id"] == db_comment[0]
-                assert comment["postId"] == db_comment[1]
-                assert comment["email"] == db_comment[3]
+            # DB validation
+            db_comment = db_comments.get(comment["id"])
+            assert db_comment, f"Comment {comment['id']} not found in DB"
+            assert comment["id"] == db_comment[0]
+            assert comment["postId"] == db_comment[1]
+            assert comment["email"] == db_comment[3]
 
 @pytest.mark.crossapi
-def test_comment_post_relationship(api_client):
-    posts_api = PostsAPI(api_client.base_url)
-    comments_api = CommentsAPI(api_client.base_url)
-    posts = posts_api.get_posts().json()
-    comments = comments_api.get_comments().json()
-    post_ids = {p["id"] for p in posts}
-    for comment in comments:
-        assert comment["postId"] in post_ids
+def test_comment_post_relationship(integrity_reports):
+    report = integrity_reports["comments.postId"]
+    assert not report.orphans, f"Comments with unknown postId: {report.orphans}"
 
 @pytest.mark.contract
 def test_create_comment(api_client):
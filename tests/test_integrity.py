@@ -0,0 +1,38 @@
+import pytest
+from db.integrity import RELATIONS, check_relations
+from src.api.snapshot import DataSnapshot
+
+COLLECTIONS = {
+    "users": [{"id": 1}, {"id": 2}, {"id": 3}],
+    "posts": [{"id": 10, "userId": 1}, {"id": 11, "userId": 1}, {"id": 12, "userId": 9}],
+    "comments": [{"id": 100, "postId": 10}, {"id": 101, "postId": 99}],
+    "albums": [{"id": 7, "userId": 2}],
+    "todos": [],
+    "photos": [{"id": 1000, "albumId": 7}],
+}
+
+@pytest.mark.crossapi
+@pytest.mark.parametrize("engine", ["python", "sqlite"])
+def test_integrity_engines_report_orphans_and_counts(engine):
+    reports = check_relations(COLLECTIONS, RELATIONS, engine=engine)
+    assert reports["posts.userId"].orphans == [12]
+    assert reports["posts.userId"].counts == {1: 2, 2: 0, 3: 0}
+    assert reports["comments.postId"].orphans == [101]
+    assert reports["comments.postId"].counts == {10: 1, 11: 0, 12: 0}
+    assert reports["albums.userId"].counts == {1: 0, 2: 1, 3: 0}
+    assert reports["todos.userId"].orphans == []
+    assert reports["photos.albumId"].orphans == []
+
+def test_unknown_engine():
+    with pytest.raises(ValueError):
+        check_relations(COLLECTIONS, engine="pandas")
+
+def test_engines_accept_model_records():
+    typed = DataSnapshot({"users": [{"id": 1, "name": "a", "username": "a", "email": "a@x.io"}],
+                          "posts": [{"id": 10, "userId": 1, "title": "t", "body": "b"},
+                                    {"id": 11, "userId": 5, "title": "t", "body": "b"}]}, typed=True)
+    relation = RELATIONS[:1]
+    for engine in ("python", "sqlite"):
+        report = check_relations(typed.collections, relation, engine=engine)["posts.userId"]
+        assert report.orphans == [11]
+        assert report.counts == {1: 1}
@@ -0,0 +1,27 @@
+import json
+import pytest
+from src.utils.json_stream import iter_json_array
+
+def chunked(raw: bytes, size: int):
+    return [raw[i:i + size] for i in range(0, len(raw), size)]
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 64, 1 << 20])
+def test_elements_survive_any_chunk_boundary(size):
+    document = [{"id": 1, "name": "Zoë", "tags": ["a,]", "b"]}, 12.5, -3e-2, True, None, "x", [], {}]
+    for indent in (None, 2):
+        raw = json.dumps(document, ensure_ascii=False, indent=indent).encode()
+        assert list(iter_json_array(chunked(raw, size))) == document
+
+def test_empty_array():
+    assert list(iter_json_array([b"  [ ", b"]  "])) == []
+
+@pytest.mark.parametrize("raw", [b"{}", b"[1 2]", b"[1,", b"[1", b""])
+def test_malformed_documents_raise(raw):
+    with pytest.raises(ValueError):
+        list(iter_json_array(chunked(raw, 1)))
+
+def test_items_are_yielded_before_the_document_ends():
+    def chunks():
+        yield b'[{"id": 1}, '
+        raise AssertionError("read past the first element")
+    assert next(iter_json_array(chunks())) == {"id": 1}
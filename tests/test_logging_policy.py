@@ -0,0 +1,52 @@
+import allure
+import pytest
+from src.api import base_client
+from src.api.base_client import BaseClient
+from src.mock_server import MockServer
+from src.utils.config import RESOLVED_MAX
+from src.utils.logger import BodyLogPolicy, Truncated
+
+def test_truncated_is_lazy_and_bounded():
+    assert str(Truncated("x" * 10, 4)) == "xxxx... [6 more chars]"
+    assert str(Truncated("short", 0)) == "short"
+    assert str(Truncated({"params": {"userId": 1}, "json": None}, 0)) == "params={'userId': 1} | json=None"
+
+def test_body_log_policy_overrides():
+    policy = BodyLogPolicy({
+        "body_max_chars": 100,
+        "verbs": {"post": {"attach_bodies": False}},
+        "endpoints": {"/comments": {"log_bodies": False}, "/comments/1": {"body_max_chars": 5}},
+    })
+    assert policy.resolve("GET", "/users")["log_bodies"] is True
+    assert policy.resolve("POST", "/posts")["attach_bodies"] is False
+    assert policy.resolve("GET", "/comments")["log_bodies"] is False
+    assert policy.resolve("GET", "/comments/1")["body_max_chars"] == 5
+    assert policy.sampled({"sample_rate": 1.0})
+    assert not policy.sampled({"sample_rate": 0})
+
+def test_truncated_cuts_bytes_before_decoding():
+    body = Truncated('{"title": "café"}'.encode() * 1000, 10)
+    assert body.truncated
+    assert str(body) == '{"title": ... [' + str(18 * 1000 - 10) + " more bytes]"
+    assert not Truncated(b"[]", 10).truncated and str(Truncated(b"[]", 10)) == "[]"
+
+def test_resolve_is_memoised_per_policy():
+    quiet, loud = BodyLogPolicy({"log_bodies": False}), BodyLogPolicy()
+    assert quiet.resolve("GET", "/posts") is quiet.resolve("GET", "/posts")
+    assert loud.resolve("GET", "/posts")["log_bodies"] is True
+    for post_id in range(RESOLVED_MAX + 10):
+        quiet.resolve("GET", f"/posts/{post_id}")
+    assert quiet.resolve.cache_info().currsize == RESOLVED_MAX
+
+@pytest.mark.parametrize("limit, attachment_type", [(0, allure.attachment_type.JSON), (10, allure.attachment_type.TEXT)])
+def test_truncated_json_bodies_are_attached_as_text(monkeypatch, limit, attachment_type):
+    attached = []
+    monkeypatch.setattr(base_client.allure, "attach", lambda body, name, attachment_type: attached.append(
+        (body, attachment_type)))
+    with MockServer() as server:
+        client = BaseClient(server.url)
+        client.log_policy = BodyLogPolicy({"body_max_chars": limit, "log_bodies": False})
+        client.get("/posts/1")
+    body, attached_as = attached[-1]
+    assert attached_as == attachment_type
+    assert body.startswith("{") and body.endswith("more bytes]" if limit else "}")
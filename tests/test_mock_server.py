@@ -0,0 +1,81 @@
+import http.client
+import json
+import pytest
+import requests
+from src.mock_server import FixtureStore, MockServer
+
+@pytest.fixture(scope="module")
+def server():
+    with MockServer() as server:
+        yield server
+
+def test_filters_and_nested_routes(server):
+    by_query = requests.get(f"{server.url}/comments", params={"postId": 3}).json()
+    by_route = requests.get(f"{server.url}/posts/3/comments").json()
+    assert by_query == by_route
+    assert by_query and all(comment["postId"] == 3 for comment in by_query)
+    todos = requests.get(f"{server.url}/todos", params={"userId": 1, "completed": "true"}).json()
+    assert todos and all(todo["userId"] == 1 and todo["completed"] is True for todo in todos)
+
+def test_paging_and_ranges(server):
+    posts = requests.get(f"{server.url}/posts").json()
+    page = requests.get(f"{server.url}/posts", params={"_page": 2})
+    assert page.json() == posts[10:20]
+    assert page.headers["X-Total-Count"] == "100"
+    assert requests.get(f"{server.url}/posts", params={"_page": 3, "_limit": 25}).json() == posts[50:75]
+    assert requests.get(f"{server.url}/posts", params={"_start": 95, "_limit": 10}).json() == posts[95:]
+    assert requests.get(f"{server.url}/posts", params={"_start": 5, "_end": 8}).json() == posts[5:8]
+    by_user = requests.get(f"{server.url}/posts", params={"userId": 2, "_limit": 3})
+    assert [post["id"] for post in by_user.json()] == [11, 12, 13]
+    assert by_user.headers["X-Total-Count"] == "10"
+
+def test_missing_items_and_routes(server):
+    assert requests.get(f"{server.url}/users/9999").status_code == 404
+    assert requests.get(f"{server.url}/users/abc").json() == {}
+    assert requests.get(f"{server.url}/unknown").status_code == 404
+
+def test_etag_revalidation(server):
+    resp = requests.get(f"{server.url}/users/1")
+    assert resp.headers["Last-Modified"]
+    revalidated = requests.get(f"{server.url}/users/1", headers={"If-None-Match": resp.headers["ETag"]})
+    assert revalidated.status_code == 304
+    assert revalidated.content == b""
+
+def test_fake_crud(server):
+    created = requests.post(f"{server.url}/posts", json={"userId": 1, "title": "t", "body": "b"})
+    assert created.status_code == 201
+    assert created.json()["id"] == 101
+    assert requests.put(f"{server.url}/posts/1", json={"title": "u"}).json() == {"title": "u", "id": 1}
+    assert requests.put(f"{server.url}/posts/99999", json={}).status_code == 500
+    patched = requests.patch(f"{server.url}/posts/1", json={"title": "p"}).json()
+    assert patched["title"] == "p" and patched["userId"] == 1
+    assert requests.delete(f"{server.url}/posts/1").json() == {}
+    # Writes are faked: the collection is unchanged
+    assert len(requests.get(f"{server.url}/posts").json()) == 100
+
+@pytest.mark.parametrize("verb, path", [("post", "/posts"), ("put", "/posts/1"), ("patch", "/posts/1")])
+@pytest.mark.parametrize("body", [[1, 2], "text", 3, None])
+def test_writes_reject_non_object_bodies(server, verb, path, body):
+    # None is sent as the JSON literal null, not as an empty body
+    response = requests.request(verb.upper(), f"{server.url}{path}", data=json.dumps(body),
+                                headers={"Content-Type": "application/json"})
+    assert response.status_code == 400
+
+@pytest.mark.parametrize("length", ["abc", "-5"])
+def test_invalid_content_length_is_a_bad_request(server, length):
+    host, port = server.httpd.server_address[:2]
+    conn = http.client.HTTPConnection(host, port, timeout=5)
+    try:
+        conn.putrequest("POST", "/posts")
+        conn.putheader("Content-Length", length)
+        conn.endheaders()
+        response = conn.getresponse()
+        assert response.status == 400
+        assert response.getheader("Connection") == "close"
+    finally:
+        conn.close()
+
+def test_get_bodies_are_memoised_per_store():
+    first, second = FixtureStore(), FixtureStore()
+    assert first.body("posts", (), "1") is first.body("posts", (), "1")
+    assert first.body.cache_info().hits == 1 and second.body.cache_info().currsize == 0
@@ -0,0 +1,31 @@
+import json
+import os
+import sqlite3
+import sys
+import pytest
+from db.sqlite_client import SQLiteClient
+from src.api.snapshot import MODELS
+from src.mock_server import FIXTURE_DIR
+
+def fixture(name):
+    with open(os.path.join(FIXTURE_DIR, f"{name}.json")) as f:
+        return json.load(f)
+
+@pytest.fixture(scope="module")
+def table_columns():
+    conn = sqlite3.connect(":memory:")
+    SQLiteClient._create_tables(conn)
+    yield lambda table: tuple(row[1] for row in conn.execute(f"PRAGMA table_info({table})"))
+    conn.close()
+
+@pytest.mark.parametrize("name", sorted(MODELS))
+def test_models_round_trip_fixtures_and_line_up_with_tables(name, table_columns):
+    model = MODELS[name]
+    item = fixture(name)[0]
+    record = model.from_json(item)
+    assert record._asdict() == {field: item.get(field) for field in model._fields}
+    assert model.COLUMNS == table_columns(name)
+    assert record.as_row() == tuple(item[column] for column in model.COLUMNS)
+    assert sys.getsizeof(record) < sys.getsizeof(item)
+    with pytest.raises(AttributeError):
+        record.id = 2
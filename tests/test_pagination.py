@@ -0,0 +1,86 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from src.api import base_client
+from src.api.base_client import BaseClient
+from src.api.comments_api import CommentsAPI
+from src.api.photos_api import PhotosAPI
+from src.api.posts_api import PostsAPI
+from src.mock_server import MockServer
+
+@pytest.fixture(scope="module")
+def server():
+    with MockServer() as server:
+        yield server
+
+def test_iterators_page_through_whole_collections(server):
+    posts_api = PostsAPI(server.url)
+    assert list(posts_api.iter_posts(page_size=30)) == posts_api.get_posts().json()
+    pages = list(posts_api.iter_pages("/posts", page_size=25))
+    assert [len(page) for page in pages] == [25, 25, 25, 25]
+    photos = list(PhotosAPI(server.url).iter_photos(album_id=3, page_size=20))
+    assert len(photos) == 50 and all(photo["albumId"] == 3 for photo in photos)
+    assert list(CommentsAPI(server.url).iter_comments(post_id=4, page_size=2)) == \
+        CommentsAPI(server.url).get_comments_by_post(4).json()
+
+class RecordingClient(BaseClient):
+    def __init__(self, base_url):
+        super().__init__(base_url)
+        self.starts = []
+
+    def get(self, endpoint, params=None):
+        self.starts.append(params["_start"])
+        return super().get(endpoint, params)
+
+def test_next_page_is_prefetched_while_the_current_one_is_consumed(server):
+    client = RecordingClient(server.url)
+    pages = client.iter_pages("/comments", page_size=100)
+    next(pages)
+    deadline = time.monotonic() + 5
+    while 100 not in client.starts and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert client.starts == [0, 100]
+    # Closing early cancels or discards the pending page; nothing further is requested
+    pages.close()
+    time.sleep(0.05)
+    assert client.starts == [0, 100]
+
+def test_without_prefetch_pages_are_fetched_on_demand(server):
+    client = RecordingClient(server.url)
+    pages = client.iter_pages("/comments", page_size=100, prefetch=False)
+    next(pages)
+    assert client.starts == [0]
+    assert sum(map(len, pages)) == 400
+    # 500 comments fill five pages exactly; X-Total-Count saves asking for an empty sixth
+    assert client.starts == [0, 100, 200, 300, 400]
+
+class UnpagedClient(RecordingClient):
+    """A server that ignores the paging parameters and always answers with the whole collection."""
+
+    def get(self, endpoint, params=None):
+        self.starts.append(params["_start"])
+        return BaseClient.get(self, endpoint)
+
+@pytest.mark.parametrize("prefetch", [False, True])
+@pytest.mark.parametrize("page_size, starts", [(1, [0]), (1000, [0]), (100, [0, 100])])
+def test_server_ignoring_paging_params_does_not_loop(server, page_size, starts, prefetch):
+    client = UnpagedClient(server.url)
+    pages = list(client.iter_pages("/posts", page_size=page_size, prefetch=prefetch))
+    # A full page with no total needs a second request, which repeats the first page and ends it
+    assert client.starts == starts
+    assert len(pages) == 1 and len(pages[0]) == 100
+
+def test_page_size_must_be_positive(server):
+    with pytest.raises(ValueError):
+        BaseClient(server.url).iter_pages("/posts", page_size=0)
+
+def test_map_ids_runs_inline_on_a_pool_worker(server, monkeypatch):
+    # One worker: a nested map_ids that queued on the pool would wait on itself forever
+    pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix=base_client.EXECUTOR_PREFIX)
+    monkeypatch.setattr(base_client, "_executor", pool)
+    client = BaseClient(server.url)
+    try:
+        responses = pool.submit(client.get_many, [f"/users/{i}" for i in range(1, 4)]).result(timeout=10)
+        assert [resp.json()["id"] for resp in responses] == [1, 2, 3]
+    finally:
+        pool.shutdown(wait=False)
@@ -0,0 +1,36 @@
+import pytest
+from src.api.albums_api import AlbumsAPI
+from src.api.photos_api import PhotosAPI
+from src.utils.schema_validator import iter_validated, validate_many
+
+@pytest.mark.contract
+@pytest.mark.db
+def test_stream_photos_into_db(api_client, db):
+    photos_api = PhotosAPI(api_client.base_url)
+    # Parsed, validated and inserted batch by batch; the 5000-item array is never loaded at once
+    inserted = db.ingest("photos", iter_validated(photos_api.stream_photos(), "data/schemas/photo_schema.json"))
+    assert inserted > 0
+    assert len(db.fetchall("photos")) == inserted
+
+@pytest.mark.contract
+def test_get_photos_by_album_validations(api_client):
+    photos_api = PhotosAPI(api_client.base_url)
+    albums_api = AlbumsAPI(api_client.base_url)
+    album_ids = [album["id"] for album in albums_api.get_albums().json()][:10]
+    for album_id, resp in zip(album_ids, photos_api.get_photos_by_albums(album_ids)):
+        assert resp.status_code == 200
+        photos = resp.json()
+        validate_many(photos, "data/schemas/photo_schema.json")
+        for photo in photos:
+            assert photo["albumId"] == album_id
+
+@pytest.mark.contract
+def test_stream_matches_full_download(api_client):
+    photos_api = PhotosAPI(api_client.base_url)
+    streamed = list(photos_api.stream_photos(album_id=1))
+    assert streamed == photos_api.get_photos_by_album(1).json()
+
+@pytest.mark.crossapi
+def test_photo_album_relationship(photo_integrity_reports):
+    report = photo_integrity_reports["photos.albumId"]
+    assert not report.orphans, f"Photos with unknown albumId: {report.orphans}"
@@ -1,8 +1,11 @@
 import pytest
 import json
+import asyncio
+from db.columnar import ColumnarTable
+from src.api.async_client import async_api
 from src.api.posts_api import PostsAPI
-from src.api.users_api import UsersAPI
-from src.utils.schema_validator import validate_schema
+from src.utils.schema_validator import validate_schema, validate_many
+from src.models.post import Post
 
 def load_post_crud_data():
     with open("data/testdata/post_crud.json") as f:
@@ -22,17 +25,23 @@ def test_get_posts_contract(api_client, db):
     posts = resp.json()
     for post in posts:
         validate_schema(post, "data/schemas/post_schema.json")
-        db.insert("posts", {k: post[k] for k in ("id", "userId", "title", "body")})
+    db.insert_many("posts", [Post.from_json(post) for post in posts], upsert=True)
     db_posts = db.fetchall("posts")
     assert len(db_posts) == len(posts)
 
 @pytest.mark.contract
-def test_get_post_by_id_validations(api_client, db):
-    posts_api = PostsAPI(api_client.base_url)
-    all_posts = posts_api.get_posts().json()
-    for post in all_posts:
-        post_id = post["id"]
-        resp = posts_api.get_post_by_id(post_id)
+def test_get_post_by_id_validations(api_client, db, snapshot):
+    all_posts = snapshot.posts
+    # Seed the (possibly worker-shared) DB once instead of relying on the contract test running first
+    db.populate_once("posts", lambda: all_posts)
+    # Fan out the per-ID calls on the async transport instead of 100 serial round trips
+    async_posts_api = async_api(PostsAPI)(api_client.base_url)
+    try:
+        responses = asyncio.run(async_posts_api.gather_many([f"/posts/{post.id}" for post in all_posts]))
+    finally:
+        async_posts_api.close()
+    for post, resp in zip(all_posts, responses):
+        post_id = post.id
         assert resp.status_code == 200
         assert resp.elapsed.total_seconds() < 12
         post_data = resp.json()
@@ -40,9 +49,8 @@ def test_get_post_by_id_validations(api_client, db):
         for field in ["id", "userId", "title", "body"]:
             assert field in post_data
         # DB validation
-        db_post = [row for row in db.fetchall("posts") if row[0] == post_id]
+        db_post = db.get_by_id("posts", post_id)
         assert db_post, f"Post {post_id} not found in DB"
-        db_post = db_post[0]
         assert post_data["id"] == db_post[0]
         assert post_data["userId"] == db_post[1]
         assert post_data["title"] == db_post[2]
@@ -58,66 +66,51 @@ def test_get_post_by_id_parametrized(api_client, db, post_id):
     validate_schema(post_data, "data/schemas/post_schema.json")
     for field in ["id", "userId", "title", "body"]:
         assert field in post_data
-    # Insert post into DB for this test only if not already present
-    db_posts = db.fetchall("posts")
-    if not any(row[0] == post_id for row in db_posts):
-        db.insert("posts", {k: post_data[k] for k in ("id", "userId", "title", "body")})
-    db_post = [row for row in db.fetchall("posts") if row[0] == post_id]
+    # Upsert: another xdist worker sharing the DB may insert the same post concurrently
+    db.insert("posts", Post.from_json(post_data), upsert=True)
+    db_post = db.get_by_id("posts", post_id)
     assert db_post, f"Post {post_id} not found in DB"
-    db_post = db_post[0]
     assert post_data["id"] == db_post[0]
     assert post_data["userId"] == db_post[1]
     assert post_data["title"] == db_post[2]
     assert post_data["body"] == db_post[3]
 
 @pytest.mark.contract
-def test_get_posts_by_userid_validations(api_client, db):
+def test_get_posts_by_userid_validations(api_client, db, snapshot):
     posts_api = PostsAPI(api_client.base_url)
-    users_api = UsersAPI(api_client.base_url)
-    users = users_api.get_users().json()
-    for user in users:
-        user_id = user["id"]
-        resp = posts_api.get_posts_by_user(user_id)
+    users = snapshot.users
+    responses = posts_api.get_posts_by_users([user.id for user in users])
+    for user, resp in zip(users, responses):
+        user_id = user.id
         assert resp.status_code == 200
         assert resp.elapsed.total_seconds() < 12
         posts = resp.json()
+        validate_many(posts, "data/schemas/post_schema.json")
         for post in posts:
-            validate_schema(post, "data/schemas/post_schema.json")
             assert post["userId"] == user_id
 
 @pytest.mark.db
-def test_post_count_per_user_and_orphan_posts(api_client, db):
-    users_api = UsersAPI(api_client.base_url)
-    posts_api = PostsAPI(api_client.base_url)
-    users = users_api.get_users().json()
-    posts = posts_api.get_posts().json()
-    user_ids = {u["id"] for u in users}
-    # Insert all posts into DB for this test only if not already present
-    db_posts = db.fetchall("posts")
-    existing_ids = {row[0] for row in db_posts}
-    for post in posts:
-        if post["id"] not in existing_ids:
-            db.insert("posts", {k: post[k] for k in ("id", "userId", "title", "body")})
+def test_post_count_per_user_and_orphan_posts(db, snapshot, integrity_reports):
+    users = ColumnarTable.from_items("users", snapshot.users, columns=("id",))
+    posts = ColumnarTable.from_items("posts", snapshot.posts, columns=("id", "userId"))
+    # Upsert: another xdist worker may insert the same posts between any check and our insert
+    db.insert_many("posts", snapshot.posts, upsert=True)
     # Validate post count per user
-    from collections import Counter
-    api_counts = Counter([p["userId"] for p in posts])
-    db_posts = db.fetchall("posts")
-    db_counts = Counter([p[1] for p in db_posts])
-    for user_id in user_ids:
-        assert api_counts[user_id] == db_counts[user_id]
+    api_counts = posts.count_by("userId")
+    db_counts = db.count_by("posts", "userId")
+    report = integrity_reports["posts.userId"]
+    for user_id in users.tolist("id"):
+        assert api_counts.get(user_id, 0) == db_counts.get(user_id, 0)
+        assert report.counts[user_id] == api_counts.get(user_id, 0)
     # Identify orphan posts
-    orphan_posts = [p for p in posts if p["userId"] not in user_ids]
-    assert not orphan_posts, f"Orphan posts found: {orphan_posts}"
+    orphans = posts.anti_join(users, "userId").tolist("id")
+    assert not orphans, f"Orphan posts found: {orphans}"
+    assert orphans == report.orphans
 
 @pytest.mark.crossapi
-def test_post_user_relationship(api_client):
-    users_api = UsersAPI(api_client.base_url)
-    posts_api = PostsAPI(api_client.base_url)
-    users = users_api.get_users().json()
-    posts = posts_api.get_posts().json()
-    user_ids = {u["id"] for u in users}
-    for post in posts:
-        assert post["userId"] in user_ids
+def test_post_user_relationship(integrity_reports):
+    report = integrity_reports["posts.userId"]
+    assert not report.orphans, f"Posts with unknown userId: {report.orphans}"
 
 @pytest.mark.contract
 def test_create_post(api_client):
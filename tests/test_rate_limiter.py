@@ -0,0 +1,60 @@
+import time
+from src.api.base_client import BaseClient
+from src.mock_server import MockServer
+from src.utils.config import RESOLVED_MAX
+from src.utils.rate_limiter import RateLimiter, TokenBucket
+
+def test_bucket_allows_burst_then_paces():
+    bucket = TokenBucket(rate=100, burst=5, adaptive=False)
+    waits = [bucket.reserve() for _ in range(10)]
+    assert waits[:5] == [0.0] * 5
+    assert all(0 < wait <= 0.06 for wait in waits[5:])
+    assert waits[5:] == sorted(waits[5:])
+
+def test_bucket_adapts_to_429():
+    bucket = TokenBucket(rate=40, burst=5, min_rate=4, increase=5, decrease=0.5)
+    bucket.observe(429)
+    assert bucket.rate == 20
+    assert bucket.reserve() > 0  # the burst is drained after a 429
+    for _ in range(3):
+        bucket.observe(429)
+    assert bucket.rate == 4
+    for _ in range(20):
+        bucket.observe(200)
+    assert bucket.rate == 40
+    bucket.observe(429, retry_after=2)
+    assert bucket.reserve() >= 2
+    assert bucket.throttled == 5
+
+def test_limiter_resolves_host_and_endpoint_buckets():
+    limiter = RateLimiter({
+        "rate": None,
+        "hosts": {"api.example.com": {"rate": 10}},
+        "endpoints": {"/photos": {"rate": 2, "burst": 1}},
+    })
+    assert limiter.buckets("http://127.0.0.1:8000", "/posts") == ()
+    host_only = limiter.buckets("https://api.example.com", "/posts/1")
+    photos = limiter.buckets("https://api.example.com", "/photos")
+    assert len(host_only) == 1 and len(photos) == 2
+    assert photos[0] is host_only[0]
+    assert photos[1].rate == 2 and photos[1].burst == 1
+    assert limiter.buckets("http://127.0.0.1:8000", "/photos")[0] is not photos[1]
+    # Resolved once per limiter; another limiter with the same settings has buckets of its own
+    assert limiter.buckets("https://api.example.com", "/photos") is photos
+    other = RateLimiter({"hosts": {"api.example.com": {"rate": 10}}})
+    assert other.buckets("https://api.example.com", "/photos")[0] is not photos[0]
+    for photo_id in range(RESOLVED_MAX + 10):
+        limiter.buckets("https://api.example.com", f"/photos/{photo_id}")
+    assert limiter.buckets.cache_info().currsize == RESOLVED_MAX
+    assert limiter.buckets("https://api.example.com", "/photos/1")[1] is photos[1]
+
+def test_client_requests_share_the_host_bucket():
+    with MockServer() as server:
+        limiter = RateLimiter({"rate": 50, "burst": 1, "adaptive": False})
+        client = BaseClient(server.url, rate_limiter=limiter)
+        start = time.monotonic()
+        responses = client.get_many([f"/users/{i}" for i in range(1, 11)] * 2)
+        elapsed = time.monotonic() - start
+    assert all(resp.status_code == 200 for resp in responses)
+    # 20 requests, one up front, then 50/s across every worker thread
+    assert elapsed >= 19 / 50 * 0.9
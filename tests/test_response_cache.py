@@ -0,0 +1,131 @@
+import time
+import pytest
+from datetime import timedelta
+import requests
+from src.api import cache as cache_module
+from src.api.base_client import BaseClient
+from src.api.cache import ResponseCache, MemoryBackend, DiskBackend, cache_key, get_cache
+from src.mock_server import MockServer
+
+def make_response(body: bytes, url="https://example.test/posts"):
+    response = requests.Response()
+    response.status_code = 200
+    response._content = body
+    response.url = url
+    response.headers["Content-Type"] = "application/json"
+    response.elapsed = timedelta(milliseconds=120)
+    return response
+
+def test_cache_key_normalizes_params():
+    assert cache_key("/posts", {"userId": 1, "b": "x"}) == cache_key("/posts", {"b": "x", "userId": "1"})
+    assert cache_key("/posts", {"userId": None}) == "/posts"
+    assert cache_key("/posts", None) == "/posts"
+
+def test_memory_cache_hits_and_misses():
+    cache = ResponseCache(MemoryBackend(maxsize=8), ttl=60)
+    assert cache.get("/posts", {"userId": 1}) is None
+    cache.put("/posts", {"userId": 1}, make_response(b'[{"id": 1}]'))
+    cached = cache.get("/posts", {"userId": 1})
+    assert cached.json() == [{"id": 1}]
+    assert cached.status_code == 200
+    assert cached.elapsed.total_seconds() == 0.12
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+def test_memory_cache_lru_eviction():
+    cache = ResponseCache(MemoryBackend(maxsize=2), ttl=60)
+    cache.put("/a", None, make_response(b"1"))
+    cache.put("/b", None, make_response(b"2"))
+    cache.get("/a")
+    cache.put("/c", None, make_response(b"3"))
+    assert cache.get("/b") is None
+    assert cache.get("/a") is not None
+    assert cache.get("/c") is not None
+
+def test_cache_ttl_expiry():
+    cache = ResponseCache(MemoryBackend(maxsize=2), ttl=0.05)
+    cache.put("/a", None, make_response(b"1"))
+    time.sleep(0.1)
+    assert cache.get("/a") is None
+    assert cache.stats()["size"] == 0
+
+def test_disk_cache_shared_between_instances(tmp_path):
+    path = str(tmp_path / "http_cache.sqlite")
+    ResponseCache(DiskBackend(path, maxsize=8), ttl=60).put("/users", None, make_response(b'[{"id": 1}]'))
+    other_worker = ResponseCache(DiskBackend(path, maxsize=8), ttl=60)
+    cached = other_worker.get("/users")
+    assert cached.json() == [{"id": 1}]
+    assert cached.headers["content-type"] == "application/json"
+
+def test_conditional_cache_revalidates_stale_entries():
+    cache = ResponseCache(MemoryBackend(maxsize=8), ttl=0, conditional=True)
+    response = make_response(b'[{"id": 1}]')
+    response.headers["ETag"] = 'W/"abc"'
+    response.headers["Last-Modified"] = "Mon, 01 Jan 2024 00:00:00 GMT"
+    cache.put("/comments", None, response)
+    assert cache.get("/comments") is None
+    assert cache.validators("/comments") == {
+        "If-None-Match": 'W/"abc"',
+        "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT",
+    }
+    not_modified = make_response(b"")
+    not_modified.status_code = 304
+    served = cache.not_modified("/comments", None, not_modified)
+    assert served.status_code == 200
+    assert served.json() == [{"id": 1}]
+    assert cache.stats()["revalidated"] == 1
+
+def test_validator_only_cache_skips_responses_without_validators():
+    cache = ResponseCache(MemoryBackend(maxsize=8), ttl=0, conditional=True)
+    cache.put("/users", None, make_response(b"[]"))
+    assert cache.validators("/users") == {}
+    assert cache.stats()["size"] == 0
+
+def test_conditional_alone_does_not_enable_the_cache(monkeypatch):
+    monkeypatch.setattr(cache_module, "_cache", None)
+    monkeypatch.setattr(cache_module, "load_config",
+                        lambda: {"response_cache": {"enabled": False, "conditional": True}})
+    assert get_cache() is None
+
+class EvictingCache(ResponseCache):
+    """Loses every entry between handing out validators and the 304 arriving."""
+
+    def validators(self, url, params=None):
+        headers = super().validators(url, params)
+        self.clear()
+        return headers
+
+def test_304_after_eviction_refetches_the_body():
+    with MockServer() as server:
+        client = BaseClient(server.url, cache=EvictingCache(MemoryBackend(maxsize=8), ttl=0, conditional=True))
+        first = client.get("/posts/1")
+        again = client.get("/posts/1")
+    assert again.status_code == 200
+    assert again.json() == first.json()
+    assert client.cache.stats()["revalidated"] == 0
+
+def test_invalidate_drops_resource_and_collection(tmp_path):
+    for backend in (MemoryBackend(maxsize=16), DiskBackend(str(tmp_path / "http_cache.sqlite"), maxsize=16)):
+        cache = ResponseCache(backend, ttl=60)
+        for url, params in [("http://h/posts/1", None), ("http://h/posts", None), ("http://h/posts", {"userId": 1}),
+                            ("http://h/posts/10", None), ("http://h/comments", None)]:
+            cache.put(url, params, make_response(b"[]", url))
+        cache.invalidate("http://h/posts/1")
+        assert cache.get("http://h/posts/1") is None
+        assert cache.get("http://h/posts") is None
+        assert cache.get("http://h/posts", {"userId": 1}) is None
+        assert cache.get("http://h/posts/10") is not None
+        assert cache.get("http://h/comments") is not None
+
+@pytest.mark.parametrize("verb, endpoint, item_evicted", [
+    ("post", "/posts", False), ("put", "/posts/1", True), ("patch", "/posts/1", True), ("delete", "/posts/1", True)])
+def test_writes_evict_cached_reads(verb, endpoint, item_evicted):
+    with MockServer() as server:
+        cache = ResponseCache(MemoryBackend(maxsize=16), ttl=300)
+        client = BaseClient(server.url, cache=cache)
+        reads = ["/posts/1", "/posts", "/users/1"]
+        for read in reads:
+            client.get(read)
+        getattr(client, verb)(endpoint, **({} if verb == "delete" else {"json": {"title": "t"}}))
+        cached = [cache.get(f"{server.url}{read}") is not None for read in reads]
+    assert cached == [not item_evicted, False, True]
@@ -0,0 +1,114 @@
+from datetime import timedelta
+import pytest
+import requests
+from requests.adapters import BaseAdapter
+from src.api.base_client import BaseClient
+from src.utils import retry_policy
+from src.utils.retry_policy import CircuitOpenError, RetryPolicy, retry_after_seconds
+
+def make_response(status, headers=None):
+    response = requests.Response()
+    response.status_code = status
+    response.headers.update(headers or {})
+    return response
+
+def scripted(*outcomes):
+    calls = []
+
+    def send():
+        outcome = outcomes[min(len(calls), len(outcomes) - 1)]
+        calls.append(outcome)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return make_response(*outcome) if isinstance(outcome, tuple) else make_response(outcome)
+    return send, calls
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    waits = []
+    monkeypatch.setattr(retry_policy.time, "sleep", waits.append)
+    return waits
+
+def test_idempotent_verbs_retry_transient_statuses(sleeps):
+    send, calls = scripted(503, 502, 200)
+    assert RetryPolicy({"jitter": False}).call("GET", send, "h").status_code == 200
+    assert len(calls) == 3
+    assert sleeps == [0.2, 0.4]
+
+def test_non_idempotent_verbs_are_not_retried_on_5xx(sleeps):
+    send, calls = scripted(503, 201)
+    assert RetryPolicy().call("POST", send, "h").status_code == 503
+    assert len(calls) == 1
+    send, calls = scripted(requests.exceptions.ReadTimeout(), 201)
+    with pytest.raises(requests.exceptions.ReadTimeout):
+        RetryPolicy().call("PATCH", send, "h")
+    send, calls = scripted(requests.exceptions.ConnectTimeout(), 201)
+    assert RetryPolicy().call("POST", send, "h").status_code == 201
+
+def test_retry_after_is_honoured_and_capped(sleeps):
+    send, _ = scripted((429, {"Retry-After": "3"}), (429, {"Retry-After": "120"}), 200)
+    assert RetryPolicy({"retry_after_max": 10}).call("POST", send, "h").status_code == 200
+    assert sleeps == [3.0, 10]
+    assert retry_after_seconds(make_response(429, {"Retry-After": "soon"})) is None
+
+def test_500_and_other_errors_are_not_retried(sleeps):
+    send, calls = scripted(500, 200)
+    assert RetryPolicy().call("PUT", send, "h").status_code == 500
+    send, calls = scripted(ValueError("bug"), 200)
+    with pytest.raises(ValueError):
+        RetryPolicy().call("GET", send, "h")
+    assert len(calls) == 1 and not sleeps
+
+def test_retry_budget_limits_retries(sleeps):
+    policy = RetryPolicy({"budget_min": 2, "budget_ratio": 0, "max_attempts": 5, "breaker_failures": 0})
+    send, calls = scripted(503)
+    assert policy.call("GET", send, "h").status_code == 503
+    assert len(calls) == 3
+    calls.clear()
+    policy.call("GET", send, "h")
+    assert len(calls) == 1
+
+def test_circuit_breaker_fails_fast_then_probes(sleeps, monkeypatch):
+    policy = RetryPolicy({"breaker_failures": 2, "breaker_reset": 30, "max_attempts": 1})
+    send, calls = scripted(requests.exceptions.ConnectionError())
+    for _ in range(2):
+        with pytest.raises(requests.exceptions.ConnectionError):
+            policy.call("GET", send, "h")
+    with pytest.raises(CircuitOpenError):
+        policy.call("GET", send, "h")
+    assert len(calls) == 2
+    # Other hosts keep their own breaker
+    assert policy.call("GET", scripted(200)[0], "other").status_code == 200
+    now = retry_policy.time.monotonic()
+    monkeypatch.setattr(retry_policy.time, "monotonic", lambda: now + 31)
+    assert policy.call("GET", scripted(200)[0], "h").status_code == 200
+    assert not policy.guard("h").breaker.is_open
+
+class ScriptedAdapter(BaseAdapter):
+    """Answers with the given statuses in turn; 200s carry ``body``."""
+
+    def __init__(self, statuses, body=b'[{"id": 1}, {"id": 2}]'):
+        super().__init__()
+        self.statuses = list(statuses)
+        self.body = body
+        self.sent = []
+
+    def send(self, request, **kwargs):
+        response = make_response(self.statuses.pop(0) if len(self.statuses) > 1 else self.statuses[0])
+        response._content = self.body if response.status_code == 200 else b""
+        response._content_consumed = True
+        response.url = request.url
+        response.elapsed = timedelta(milliseconds=1)
+        self.sent.append((request.method, kwargs.get("stream")))
+        return response
+
+    def close(self):
+        pass
+
+def test_get_stream_retries_the_request_before_streaming(sleeps):
+    client = BaseClient("http://stream.invalid", retry_policy=RetryPolicy({"jitter": False}))
+    adapter = ScriptedAdapter([503, 200])
+    client.session.mount("http://stream.invalid", adapter)
+    assert list(client.get_stream("/posts")) == [{"id": 1}, {"id": 2}]
+    assert adapter.sent == [("GET", True), ("GET", True)]
+    assert sleeps == [0.2]
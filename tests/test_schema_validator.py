@@ -0,0 +1,23 @@
+import pytest
+from src.utils.schema_validator import get_validator, load_schemas, validate_schema, validate_many
+
+POST_SCHEMA = "data/schemas/post_schema.json"
+
+def test_validators_are_compiled_once():
+    assert get_validator(POST_SCHEMA) is get_validator(POST_SCHEMA)
+    assert get_validator("post") is get_validator(POST_SCHEMA)
+    assert set(load_schemas()) >= {"album", "comment", "post", "todo", "user"}
+
+def test_validate_schema_reports_first_error():
+    with pytest.raises(AssertionError, match="Schema validation error"):
+        validate_schema({"id": "1", "userId": 1, "title": "t", "body": "b"}, POST_SCHEMA)
+
+def test_validate_many_reports_all_failures_with_indexes():
+    good = {"id": 1, "userId": 1, "title": "t", "body": "b"}
+    validate_many([good, good], POST_SCHEMA)
+    with pytest.raises(AssertionError) as excinfo:
+        validate_many([good, {"id": 2}, good, {**good, "title": 3}], POST_SCHEMA)
+    message = str(excinfo.value)
+    assert "(2/4 items)" in message
+    assert "[1] " in message and "[3] " in message
+    assert "[0] " not in message
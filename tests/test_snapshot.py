@@ -0,0 +1,59 @@
+import pytest
+from src.api.snapshot import DataSnapshot
+
+COLLECTIONS = {
+    "users": [{"id": 1, "name": "a"}, {"id": 2, "name": "b"}],
+    "posts": [{"id": 10, "userId": 1}, {"id": 11, "userId": 1}, {"id": 12, "userId": 2}],
+}
+
+def test_snapshot_views_are_indexed_and_read_only():
+    snapshot = DataSnapshot(COLLECTIONS)
+    assert len(snapshot.users) == 2
+    assert snapshot.users.ids == (1, 2)
+    assert snapshot.posts.by_id[12]["userId"] == 2
+    assert [p["id"] for p in snapshot.posts.group_by("userId")[1]] == [10, 11]
+    assert snapshot.posts.group_by("userId") is snapshot.posts.group_by("userId")
+    assert snapshot["posts"][0]["id"] == 10
+    with pytest.raises(TypeError):
+        snapshot.users[0]["name"] = "changed"
+    with pytest.raises(AttributeError):
+        snapshot.photos
+
+def test_load_shared_fetches_once_per_run(monkeypatch, tmp_path):
+    calls = []
+
+    def fake_fetch(base_url, names):
+        calls.append(list(names))
+        return {name: COLLECTIONS[name] for name in names}
+
+    monkeypatch.setattr(DataSnapshot, "fetch", staticmethod(fake_fetch))
+    first = DataSnapshot.load_shared("http://unused", ["users"], directory=str(tmp_path))
+    second = DataSnapshot.load_shared("http://unused", ["users", "posts"], directory=str(tmp_path))
+    third = DataSnapshot.load_shared("http://unused", ["posts", "users"], directory=str(tmp_path))
+    assert calls == [["users"], ["posts"]]
+    assert first.users.ids == second.users.ids == third.users.ids == (1, 2)
+    assert len(third.posts) == 3
+
+def test_typed_snapshot_holds_model_records():
+    users = [{"id": i, "name": f"n{i}", "username": f"u{i}", "email": f"u{i}@x.io"} for i in (1, 2)]
+    posts = [{"id": 10 + i, "userId": i % 2 + 1, "title": "t", "body": "b"} for i in range(3)]
+    snapshot = DataSnapshot({"users": users, "posts": posts}, typed=True)
+    assert snapshot.users[0].username == "u1"
+    assert snapshot.posts.by_id[11].userId == 2
+    assert [p.id for p in snapshot.posts.group_by("userId")[1]] == [10, 12]
+    assert snapshot.posts[0].as_row() == (10, 1, "t", "b")
+
+def test_nested_objects_are_frozen():
+    user = {"id": 1, "name": "n", "username": "u", "email": "e@x.io",
+            "address": {"city": "c", "geo": {"lat": "1"}}, "company": {"name": "co"}, "tags": ["a"]}
+    typed = DataSnapshot({"users": [user]}, typed=True).users[0]
+    plain = DataSnapshot({"users": [user]}).users[0]
+    for address in (typed.address, plain["address"]):
+        with pytest.raises(TypeError):
+            address["city"] = "changed"
+        with pytest.raises(TypeError):
+            address["geo"]["lat"] = "2"
+    with pytest.raises(TypeError):
+        typed.company["name"] = "changed"
+    assert plain["tags"] == ("a",)
+    assert typed.address == {"city": "c", "geo": {"lat": "1"}}
@@ -0,0 +1,155 @@
+import os
+import pytest
+import sqlite3
+import threading
+from db import sqlite_client
+from db.sqlite_client import SQLiteClient
+from src.models.post import Post
+from src.models.user import User
+
+@pytest.fixture
+def fresh_db(monkeypatch):
+    # A private per-process instance so these checks never touch the session-wide DB the API tests fill
+    monkeypatch.setattr(SQLiteClient, "_instance", None)
+    monkeypatch.setattr(sqlite_client, "database_settings", lambda: {"mode": "memory"})
+    client = SQLiteClient()
+    yield client
+    client.close()
+
+@pytest.fixture
+def shared_settings(monkeypatch, tmp_path):
+    monkeypatch.setattr(SQLiteClient, "_instance", None)
+    monkeypatch.setenv("PYTEST_XDIST_TESTRUNUID", "unit")
+    monkeypatch.setattr(sqlite_client, "database_settings", lambda: {"mode": "shared", "dir": str(tmp_path)})
+
+def make_posts(count, title="title"):
+    return [{"id": i, "userId": i % 10 + 1, "title": f"{title} {i}", "body": "body"} for i in range(1, count + 1)]
+
+@pytest.mark.db
+def test_insert_many_single_transaction(fresh_db):
+    assert fresh_db.insert_many("posts", make_posts(250)) == 250
+    assert fresh_db.insert_many("posts", []) == 0
+    rows = fresh_db.fetchall("posts")
+    assert len(rows) == 250
+    assert rows[0] == (1, 2, "title 1", "body")
+
+@pytest.mark.db
+def test_insert_many_upsert_replaces_existing_rows(fresh_db):
+    fresh_db.insert_many("posts", make_posts(5))
+    with pytest.raises(Exception):
+        fresh_db.insert_many("posts", make_posts(5))
+    fresh_db.insert_many("posts", make_posts(8, title="updated"), upsert=True)
+    rows = fresh_db.fetchall("posts")
+    assert len(rows) == 8
+    assert all(row[2].startswith("updated") for row in rows)
+    fresh_db.insert("posts", {"id": 1, "userId": 3, "title": "single", "body": "b"}, upsert=True)
+    assert fresh_db.fetchall("posts")[0] == (1, 3, "single", "b")
+
+@pytest.mark.db
+def test_model_records_insert_as_rows(fresh_db):
+    assert fresh_db.insert_many("posts", [Post.from_json(post) for post in make_posts(5)]) == 5
+    fresh_db.insert("posts", Post(2, 7, "record", "b"), upsert=True)
+    assert fresh_db.get_by_id("posts", 2) == (2, 7, "record", "b")
+    user = User.from_json({"id": 1, "name": "n", "username": "u", "email": "e@x.io", "phone": "1"})
+    fresh_db.insert_many("users", [user])
+    assert fresh_db.fetchall("users") == [(1, "n", "u", "e@x.io")]
+    assert fresh_db.ingest("posts", [Post(9, 1, "t", "b")]) == 1
+
+@pytest.mark.db
+def test_indexed_lookups(fresh_db):
+    fresh_db.insert_many("posts", make_posts(30))
+    assert fresh_db.get_by_id("posts", 7) == (7, 8, "title 7", "body")
+    assert fresh_db.get_by_id("posts", 999) is None
+    assert [row[0] for row in fresh_db.fetch_where("posts", userId=2)] == [1, 11, 21]
+    assert fresh_db.fetch_where("posts", userId=2, id=11) == [(11, 2, "title 11", "body")]
+    assert fresh_db.count_by("posts", "userId") == {user_id: 3 for user_id in range(1, 11)}
+    plan = fresh_db.conn.execute("EXPLAIN QUERY PLAN SELECT * FROM posts WHERE userId = 2").fetchall()
+    assert "idx_posts_userId" in str(plan)
+
+@pytest.mark.db
+def test_lookups_reject_unknown_identifiers(fresh_db):
+    with pytest.raises(ValueError):
+        fresh_db.fetch_where("posts", owner=1)
+    with pytest.raises(ValueError):
+        fresh_db.count_by("nope", "userId")
+
+@pytest.mark.db
+def test_populate_once_seeds_a_table_once(fresh_db):
+    calls = []
+    loader = lambda: calls.append(1) or make_posts(10)
+    assert fresh_db.populate_once("posts", loader) is True
+    assert fresh_db.populate_once("posts", loader) is False
+    assert len(calls) == 1
+    assert len(fresh_db.fetchall("posts")) == 10
+
+@pytest.mark.db
+def test_shared_mode_workers_see_one_database(shared_settings, request):
+    worker_a = SQLiteClient()
+    SQLiteClient._instance = None
+    worker_b = SQLiteClient()
+    request.addfinalizer(worker_a.close)
+    request.addfinalizer(worker_b.close)
+    assert worker_a is not worker_b and worker_a.path == worker_b.path
+    assert worker_a.populate_once("posts", lambda: make_posts(20)) is True
+    assert worker_b.populate_once("posts", lambda: pytest.fail("seeded twice")) is False
+    assert worker_b.count_by("posts", "userId")[1] == 2
+    assert worker_a.conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+@pytest.mark.db
+def test_concurrent_writers_and_readers(fresh_db):
+    errors = []
+
+    def write_and_read(worker):
+        try:
+            for i in range(1, 26):
+                post_id = worker * 100 + i
+                fresh_db.insert("posts", {"id": post_id, "userId": worker, "title": "t", "body": "b"})
+                assert fresh_db.get_by_id("posts", post_id) is not None
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=write_and_read, args=(worker,)) for worker in range(1, 9)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors
+    assert fresh_db.count_by("posts", "userId") == {worker: 25 for worker in range(1, 9)}
+
+@pytest.mark.db
+def test_memory_mode_readers_never_see_uncommitted_rows(monkeypatch):
+    monkeypatch.setattr(SQLiteClient, "_instance", None)
+    monkeypatch.setattr(sqlite_client, "database_settings", lambda: {"mode": "memory"})
+    db = SQLiteClient()
+    path = db._private_path
+    other = sqlite3.connect(path, isolation_level=None)
+    try:
+        other.execute("BEGIN IMMEDIATE")
+        other.execute("INSERT INTO posts VALUES (1, 1, 'dirty', 'b')")
+        assert db.get_by_id("posts", 1) is None
+        other.execute("ROLLBACK")
+        db.insert("posts", {"id": 2, "userId": 1, "title": "t", "body": "b"})
+        assert [row[0] for row in db.fetchall("posts")] == [2]
+    finally:
+        other.close()
+        db.close()
+    assert not os.path.exists(path)
+
+@pytest.mark.db
+def test_failed_write_does_not_poison_its_batch(fresh_db):
+    fresh_db.insert("posts", {"id": 1, "userId": 1, "title": "t", "body": "b"})
+    with pytest.raises(Exception):
+        fresh_db.insert("posts", {"id": 1, "userId": 1, "title": "dup", "body": "b"})
+    fresh_db.insert("posts", {"id": 2, "userId": 1, "title": "t", "body": "b"})
+    assert [row[0] for row in fresh_db.fetchall("posts")] == [1, 2]
+
+@pytest.mark.db
+def test_ingest_streams_in_batches(fresh_db, monkeypatch):
+    batches = []
+    real_write = fresh_db._db.write
+    monkeypatch.setattr(fresh_db._db, "write", lambda sql, params=(), many=False: batches.append(len(params)) or real_write(sql, params, many))
+    photos = ({"id": i, "albumId": i // 50 + 1, "title": "t", "url": "u", "thumbnailUrl": "th", "extra": 1}
+              for i in range(1, 1201))
+    assert fresh_db.ingest("photos", photos, batch_size=500) == 1200
+    assert batches == [500, 500, 200]
+    assert fresh_db.count_by("photos", "albumId")[1] == 49
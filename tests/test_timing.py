@@ -0,0 +1,56 @@
+import json
+import random
+import pytest
+from src.api.base_client import BaseClient
+from src.mock_server import MockServer
+from src.utils.timing import LatencyHistogram, Timings, endpoint_key, write_report
+
+def test_histogram_percentiles_within_precision():
+    rng = random.Random(7)
+    samples = sorted(rng.lognormvariate(-4, 1) for _ in range(5000))
+    histogram = LatencyHistogram()
+    for sample in samples:
+        histogram.record(sample)
+    for q in (50, 95, 99):
+        exact = samples[int(len(samples) * q / 100) - 1]
+        assert histogram.percentile(q) == pytest.approx(exact, rel=0.02)
+    assert histogram.percentile(100) == pytest.approx(samples[-1], abs=1e-6)
+    assert len(histogram.counts) < 600
+
+def test_histograms_merge_like_one():
+    left, right, both = LatencyHistogram(), LatencyHistogram(), LatencyHistogram()
+    for i in range(1, 200):
+        (left if i % 2 else right).record(i / 1000)
+        both.record(i / 1000)
+    left.merge(LatencyHistogram.from_dict(right.to_dict()))
+    assert left.summary() == both.summary()
+
+def test_endpoint_key_folds_ids():
+    assert endpoint_key("GET", "/posts/17") == "GET /posts/{id}"
+    assert endpoint_key("GET", "/posts/1/comments") == "GET /posts/{id}/comments"
+    assert endpoint_key("GET", "/comments", {"postId": 3, "_limit": None}) == "GET /comments?postId"
+
+def test_client_records_request_phases():
+    with MockServer() as server:
+        client = BaseClient(server.url)
+        client.timings = Timings()
+        for post_id in (1, 2, 3):
+            client.get(f"/posts/{post_id}").json()
+        list(client.get_stream("/users"))
+    summary = client.timings.summary()
+    phases = summary["GET /posts/{id}"]
+    assert set(phases) == {"ttfb", "download", "total", "decode"}
+    assert phases["total"]["count"] == 3
+    assert phases["ttfb"]["p50"] <= phases["total"]["p50"]
+    assert summary["GET /users [stream]"]["total"]["count"] == 1
+
+def test_history_keeps_only_the_latest_runs(tmp_path):
+    settings = {"output": str(tmp_path / "timings.json"), "history": str(tmp_path / "history.jsonl"),
+                "history_max_runs": 3}
+    timings = Timings()
+    timings.record("GET /posts", "total", 0.01)
+    created = [write_report(timings, settings)["created"] for _ in range(5)]
+    with open(settings["history"]) as f:
+        runs = [json.loads(line) for line in f]
+    assert [run["created"] for run in runs] == created[-3:]
+    assert runs[-1]["summary"]["GET /posts"]["total"]["count"] == 1
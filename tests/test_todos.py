@@ -1,7 +1,8 @@
 import pytest
+from db.columnar import ColumnarTable
 from src.api.todos_api import TodosAPI
-from src.api.users_api import UsersAPI
-from src.utils.schema_validator import validate_schema
+from src.utils.schema_validator import validate_schema, validate_many
+from src.models.todo import Todo
 import json
 
 def load_todo_crud_data():
@@ -19,54 +20,52 @@ def test_get_todos_contract(api_client, db):
     for todo in todos:
         validate_schema(todo, "data/schemas/todo_schema.json")
         assert isinstance(todo["completed"], bool)
-        db.insert("todos", {k: todo[k] for k in ("id", "userId", "title", "completed")})
+    db.insert_many("todos", [Todo.from_json(todo) for todo in todos], upsert=True)
     db_todos = db.fetchall("todos")
     assert len(db_todos) == len(todos)
 
 @pytest.mark.crossapi
-def test_todo_user_relationship(api_client):
-    users_api = UsersAPI(api_client.base_url)
-    todos_api = TodosAPI(api_client.base_url)
-    users = users_api.get_users().json()
-    todos = todos_api.get_todos().json()
-    user_ids = {u["id"] for u in users}
-    for todo in todos:
-        assert todo["userId"] in user_ids
+def test_todo_user_relationship(integrity_reports):
+    report = integrity_reports["todos.userId"]
+    assert not report.orphans, f"Todos with unknown userId: {report.orphans}"
 
 @pytest.mark.contract
-def test_get_todos_by_userid_validations(api_client, db):
+def test_get_todos_by_userid_validations(api_client, db, snapshot):
     todos_api = TodosAPI(api_client.base_url)
-    users_api = UsersAPI(api_client.base_url)
-    users = users_api.get_users().json()
-    for user in users:
-        user_id = user["id"]
-        resp = todos_api.get_todos_by_user(user_id)
+    users = snapshot.users
+    responses = todos_api.get_todos_by_users([user.id for user in users])
+    for user, resp in zip(users, responses):
+        user_id = user.id
         assert resp.status_code == 200
         assert resp.elapsed.total_seconds() < 4
         todos = resp.json()
+        validate_many(todos, "data/schemas/todo_schema.json")
         for todo in todos:
-            validate_schema(todo, "data/schemas/todo_schema.json")
             assert todo["userId"] == user_id
             assert isinstance(todo["completed"], bool)
 
 @pytest.mark.db
 def test_completed_vs_pending_task_analysis(api_client, db):
     todos_api = TodosAPI(api_client.base_url)
-    todos = todos_api.get_todos().json()
-    completed = [t for t in todos if t["completed"]]
-    pending = [t for t in todos if not t["completed"]]
+    todos = ColumnarTable.from_items("todos", todos_api.get_todos().json())
+    counts = todos.count_by("completed")
+    completed, pending = counts.get(True, 0), counts.get(False, 0)
     # At least one completed and one pending task should exist
     assert completed, "No completed tasks found"
     assert pending, "No pending tasks found"
+    assert completed + pending == len(todos)
+    # Per-user breakdown of the same column
+    per_user = todos.where(completed=True).count_by("userId")
+    assert sum(per_user.values()) == completed
     # Optionally, print or log the counts
-    print(f"Completed: {len(completed)}, Pending: {len(pending)}")
+    print(f"Completed: {completed}, Pending: {pending}")
 
 @pytest.mark.contract
 def test_create_todo(api_client):
     todos_api = TodosAPI(api_client.base_url)
     data = load_todo_crud_data()
     new_todo = data["create"]
-    resp = todos_api.session.post(f"{todos_api.base_url}/todos", json=new_todo, timeout=todos_api.timeout)
+    resp = todos_api.create_todo(new_todo)
     assert resp.status_code == 201
     todo = resp.json()
     for field in ["userId", "title", "completed"]:
@@ -78,7 +77,7 @@ def test_update_todo(api_client):
     data = load_todo_crud_data()
     todo_id = 1
     updated_data = data["update"]
-    resp = todos_api.session.put(f"{todos_api.base_url}/todos/{todo_id}", json=updated_data, timeout=todos_api.timeout)
+    resp = todos_api.update_todo(todo_id, updated_data)
     assert resp.status_code in [200, 201]
     todo = resp.json()
     for field in updated_data:
@@ -90,7 +89,7 @@ def test_patch_todo(api_client):
     data = load_todo_crud_data()
     todo_id = 1
     patch_data = data["patch"]
-    resp = todos_api.session.patch(f"{todos_api.base_url}/todos/{todo_id}", json=patch_data, timeout=todos_api.timeout)
+    resp = todos_api.patch_todo(todo_id, patch_data)
     assert resp.status_code in [200, 201]
     todo = resp.json()
     for field in patch_data:
@@ -101,14 +100,14 @@ def test_delete_todo(api_client):
     todos_api = TodosAPI(api_client.base_url)
     data = load_todo_crud_data()
     todo_id = data["delete_id"]
-    resp = todos_api.session.delete(f"{todos_api.base_url}/todos/{todo_id}", timeout=todos_api.timeout)
+    resp = todos_api.delete_todo(todo_id)
     assert resp.status_code in [200, 204]
 
 @pytest.mark.negative
 def test_create_todo_missing_fields(api_client):
     todos_api = TodosAPI(api_client.base_url)
     incomplete_todo = {"title": "No UserId"}
-    resp = todos_api.session.post(f"{todos_api.base_url}/todos", json=incomplete_todo, timeout=todos_api.timeout)
+    resp = todos_api.create_todo(incomplete_todo)
     assert resp.status_code in [400, 422, 201]
 
 @pytest.mark.negative
@@ -117,7 +116,7 @@ def test_update_todo_invalid_id(api_client):
     data = load_todo_crud_data()
     invalid_id = data["invalid_id"]
     updated_data = data["update"]
-    resp = todos_api.session.put(f"{todos_api.base_url}/todos/{invalid_id}", json=updated_data, timeout=todos_api.timeout)
+    resp = todos_api.update_todo(invalid_id, updated_data)
     assert resp.status_code in [404, 400, 201, 200, 500]
 
 @pytest.mark.negative
@@ -126,7 +125,7 @@ def test_patch_todo_invalid_id(api_client):
     data = load_todo_crud_data()
     invalid_id = data["invalid_id"]
     patch_data = data["patch"]
-    resp = todos_api.session.patch(f"{todos_api.base_url}/todos/{invalid_id}", json=patch_data, timeout=todos_api.timeout)
+    resp = todos_api.patch_todo(invalid_id, patch_data)
     assert resp.status_code in [404, 400, 201, 200]
 
 @pytest.mark.negative
@@ -134,5 +133,5 @@ def test_delete_todo_invalid_id(api_client):
     todos_api = TodosAPI(api_client.base_url)
     data = load_todo_crud_data()
     invalid_id = data["invalid_id"]
-    resp = todos_api.session.delete(f"{todos_api.base_url}/todos/{invalid_id}", timeout=todos_api.timeout)
+    resp = todos_api.delete_todo(invalid_id)
     assert resp.status_code in [404, 400, 204, 200]
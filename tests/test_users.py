@@ -3,6 +3,7 @@ import json
 from src.api.users_api import UsersAPI
 from src.utils.schema_validator import validate_schema
 from src.utils.email_validator import is_valid_email
+from src.models.user import User
 
 def load_user_crud_data():
     with open("data/testdata/user_crud.json") as f:
@@ -31,8 +32,8 @@ def test_get_users_contract(api_client, db):
             assert field in user
         # Email format validation
         assert is_valid_email(user["email"])
-        # Store all users in fake DB
-        db.insert("users", {k: user[k] for k in ("id", "name", "username", "email")})
+    # Store all users in fake DB (one transaction)
+    db.insert_many("users", [User.from_json(user) for user in users], upsert=True)
     # Unique ID validation
     ids = [u["id"] for u in users]
     assert len(ids) == len(set(ids))
@@ -55,10 +56,10 @@ def test_get_user_by_id_validations(api_client, db):
     all_users_resp = users_api.get_users()
     assert all_users_resp.status_code == 200
     all_users = all_users_resp.json()
-    # For each user, call /users/{id} and validate
-    for user in all_users:
+    # For each user, call /users/{id} (in parallel) and validate
+    responses = users_api.get_users_by_ids([user["id"] for user in all_users])
+    for user, resp in zip(all_users, responses):
         user_id = user["id"]
-        resp = users_api.get_user_by_id(user_id)
         # Response time validation
         assert resp.elapsed.total_seconds() < 4, f"Response time too high: {resp.elapsed.total_seconds()}s for user {user_id}"
         assert resp.status_code == 200
@@ -75,11 +76,10 @@ def test_get_user_by_id_validations(api_client, db):
         assert user_data["name"] == user["name"]
         assert user_data["username"] == user["username"]
         assert user_data["email"] == user["email"]
-        # Insert user into DB for this test
-        db.insert("users", {k: user_data[k] for k in ("id", "name", "username", "email")})
-        db_user = [row for row in db.fetchall("users") if row[0] == user_id]
+        # Insert (or refresh) user in DB for this test
+        db.insert("users", User.from_json(user_data), upsert=True)
+        db_user = db.get_by_id("users", user_id)
         assert db_user, f"User {user_id} not found in DB"
-        db_user = db_user[0]
         assert user_data["id"] == db_user[0]
         assert user_data["name"] == db_user[1]
         assert user_data["username"] == db_user[2]
@@ -96,13 +96,10 @@ def test_get_user_by_id_parametrized(api_client, db, user_id):
     for field in ["id", "name", "username", "email"]:
         assert field in user_data
     assert is_valid_email(user_data["email"])
-    # Insert user into DB for this test only if not already present
-    db_users = db.fetchall("users")
-    if not any(row[0] == user_id for row in db_users):
-        db.insert("users", {k: user_data[k] for k in ("id", "name", "username", "email")})
-    db_user = [row for row in db.fetchall("users") if row[0] == user_id]
+    # Upsert: another xdist worker sharing the DB may insert the same user concurrently
+    db.insert("users", User.from_json(user_data), upsert=True)
+    db_user = db.get_by_id("users", user_id)
     assert db_user, f"User {user_id} not found in DB"
-    db_user = db_user[0]
     assert user_data["id"] == db_user[0]
     assert user_data["name"] == db_user[1]
     assert user_data["username"] == db_user[2]